@@ -0,0 +1,179 @@
+"""Toy motion model for the animated pages (Collider Run and Collision Lab).
+
+Both pages move their particles by a fixed step per frame, and the step only
+depends on the energy slider. So a whole run can be worked out in one go:
+every frame position, the frame where the particle finishes (or the beams
+collide) and the outcome. The browser player and the frame renderers all read
+their numbers from here so they always agree with each other.
+"""
+
+from dataclasses import dataclass
+
+from catalog import catalog
+
+
+COLLIDER_RUN = "collider_run"
+COLLISION_LAB = "collision_lab"
+
+# Matplotlib's default subplot box (left, bottom, right, top) as a fraction
+# of the figure. The pages draw into a plain ``plt.subplots()`` axes, so the
+# 0..1 data range maps onto this box.
+AXES_BOX = (0.125, 0.11, 0.9, 0.88)
+
+# st.pyplot saves with bbox_inches="tight", which crops the figure down to
+# the axes box plus this much padding (inches). Renderers size their canvas
+# to that crop directly instead of cropping every frame.
+PAD_INCHES = 0.1
+
+# What each page draws. Positions and radii are in data units (0..1 on both
+# axes), line widths are in points, like in matplotlib.
+SCENES = {
+    COLLIDER_RUN: {
+        "figsize": (7, 1.8),
+        "beam": {"x": (0.02, 0.98), "y": 0.5, "width": 5, "color": "gray", "alpha": 0.5},
+        "particles": [
+            {"y": 0.5, "radius": 0.05, "color": "deepskyblue"},
+        ],
+        "flash": {"x": 0.95, "y": 0.5, "radius": 0.07, "color": "gold", "alpha": 0.8},
+    },
+    COLLISION_LAB: {
+        "figsize": (7.5, 2.4),
+        # "#1f77b4" is matplotlib's default first line color ("C0")
+        "beam": {"x": (0.05, 0.95), "y": 0.5, "width": 4, "color": "#1f77b4", "alpha": 1.0},
+        "particles": [
+            {"y": 0.5, "radius": 0.04, "color": "deepskyblue"},
+            {"y": 0.5, "radius": 0.04, "color": "orange"},
+        ],
+        "flash": {"x": 0.5, "y": 0.5, "radius": 0.065, "color": "gold", "alpha": 0.9},
+    },
+}
+
+# Time per frame in the server-side loops (seconds); the speeds are per frame
+# at this rate, whatever rate the scheduler actually manages
+FRAME_DELAY = {
+    COLLIDER_RUN: 0.03,
+    COLLISION_LAB: 0.025,
+}
+
+# How a page can animate: the whole run in the browser, a precomputed clip,
+# or the classic server loop that reruns the script every frame
+MODES = {
+    "browser": "🌐 Smooth (in my browser)",
+    "clip": "🎞️ Movie clip",
+    "live": "🐢 Classic",
+}
+
+# Start positions and finish lines
+COLLIDER_RUN_START = 0.05
+COLLIDER_RUN_END = 0.95
+COLLISION_LAB_START = (0.1, 0.9)
+COLLISION_LAB_HIT = (0.47, 0.53)
+
+# What the result box says after a run. The collision outcomes and their
+# energy bands live in the particle catalog.
+OUTCOMES = {
+    "finish": {
+        "style": "success",
+        "title": "🎉 Particle reached the end! Well done!",
+        "text": "",
+    },
+    **catalog().outcomes,
+}
+
+
+@dataclass(frozen=True)
+class Trajectory:
+    """A complete precomputed run.
+
+    ``frames`` holds the particle x positions for every frame (one tuple per
+    frame, one value per particle). ``hit_frame`` is the first frame where
+    the run is over and the gold flash is drawn.
+    """
+
+    page: str
+    energy: int
+    speed: float
+    frames: tuple
+    hit_frame: int
+    outcome: str
+
+    @property
+    def frame_delay(self):
+        return FRAME_DELAY[self.page]
+
+
+def canvas_geometry(page):
+    """Size of the visible canvas and where the axes sit inside it.
+
+    Returns ``((width, height), (left, bottom, right, top))`` with the size
+    in inches and the axes box as fractions of the canvas.
+    """
+    fig_w, fig_h = SCENES[page]["figsize"]
+    left, bottom, right, top = AXES_BOX
+    axes_w = (right - left) * fig_w
+    axes_h = (top - bottom) * fig_h
+    width = axes_w + 2 * PAD_INCHES
+    height = axes_h + 2 * PAD_INCHES
+    pad_x = PAD_INCHES / width
+    pad_y = PAD_INCHES / height
+    return (width, height), (pad_x, pad_y, 1 - pad_x, 1 - pad_y)
+
+
+def collider_run_speed(energy):
+    return 0.005 + (energy / 100) * 0.03
+
+
+def collision_lab_speed(energy):
+    return 0.002 + (energy / 100) * 0.015
+
+
+def collision_outcome(energy):
+    return catalog().collision_outcome(energy)["id"]
+
+
+def step_collider_run(x_pos, speed):
+    """One frame of the Collider Run loop. Returns ``(x_pos, completed)``."""
+    x_pos += speed
+    if x_pos >= COLLIDER_RUN_END:
+        return COLLIDER_RUN_END, True
+    return x_pos, False
+
+
+def step_collision_lab(x_left, x_right, speed):
+    """One frame of the Collision Lab loop. Returns ``(x_left, x_right, collided)``."""
+    # never past the middle, however big a step the frame scheduler asks for
+    x_left = min(x_left + speed, 0.5)
+    x_right = max(x_right - speed, 0.5)
+    return x_left, x_right, beams_collided(x_left, x_right)
+
+
+def beams_collided(x_left, x_right):
+    return x_left >= COLLISION_LAB_HIT[0] and x_right <= COLLISION_LAB_HIT[1]
+
+
+def collider_run_trajectory(energy, x_pos=COLLIDER_RUN_START):
+    speed = collider_run_speed(energy)
+    frames = [(x_pos,)]
+    completed = False
+    while not completed:
+        x_pos, completed = step_collider_run(x_pos, speed)
+        frames.append((x_pos,))
+    return Trajectory(COLLIDER_RUN, energy, speed, tuple(frames), len(frames) - 1, "finish")
+
+
+def collision_lab_trajectory(energy, x_left=COLLISION_LAB_START[0], x_right=COLLISION_LAB_START[1]):
+    speed = collision_lab_speed(energy)
+    frames = [(x_left, x_right)]
+    collided = beams_collided(x_left, x_right)
+    while not collided:
+        x_left, x_right, collided = step_collision_lab(x_left, x_right, speed)
+        frames.append((x_left, x_right))
+    return Trajectory(
+        COLLISION_LAB, energy, speed, tuple(frames), len(frames) - 1, collision_outcome(energy)
+    )
+
+
+def trajectory(page, energy):
+    if page == COLLIDER_RUN:
+        return collider_run_trajectory(energy)
+    return collision_lab_trajectory(energy)
@@ -0,0 +1,220 @@
+"""Build step for the images in ``assets/``.
+
+The source PNGs are big (the electron picture alone is 1.6 MB) but they are
+shown in narrow columns. This makes resized copies for a few width buckets in
+WebP, AVIF (when Pillow has it), JPEG and optimized PNG, names each one after
+a hash of its bytes, and writes a manifest. The pages then ask
+``best_variant()`` for the smallest file that still fills the column.
+
+``st.image`` passes JPEG and PNG through untouched but re-encodes anything
+else to JPEG on every call, so ``best_variant()`` only picks from those two
+by default. The WebP/AVIF copies are for pages that write their own
+``<img>``/``<picture>`` tags.
+
+The build is incremental: a source whose hash matches the manifest is
+skipped. ``start_build()`` runs it in the background when the server starts;
+``python asset_pipeline.py`` runs it up front. Until a variant exists the
+pages just get the original file.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).parent
+ASSET_DIR = ROOT / "assets"
+BUILD_DIR = ASSET_DIR / "build"
+MANIFEST_PATH = BUILD_DIR / "manifest.json"
+
+# Bump when the variant settings change so everything gets rebuilt
+PIPELINE_VERSION = 1
+
+# Widths (px) we make copies at. Sources are never scaled up.
+WIDTH_BUCKETS = (160, 320, 480, 640, 960, 1280)
+
+# Format -> (file extension, Pillow save options)
+FORMATS = {
+    "avif": ("avif", {"quality": 60}),
+    "webp": ("webp", {"quality": 80, "method": 6}),
+    "jpeg": ("jpg", {"quality": 82, "optimize": True, "progressive": True}),
+    "png": ("png", {"optimize": True}),
+}
+
+# What st.image sends as-is
+ST_IMAGE_FORMATS = ("jpeg", "png")
+
+# Columns are laid out in CSS pixels; most school laptops and tablets have
+# 1.5-2x screens, so we ask for this many image pixels per CSS pixel.
+PIXEL_RATIO = 2
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg")
+
+
+def _sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def available_formats():
+    from PIL import features
+
+    return [fmt for fmt in FORMATS if fmt in ST_IMAGE_FORMATS or features.check(fmt)]
+
+
+def source_images():
+    return sorted(p for p in ASSET_DIR.iterdir() if p.is_file() and p.suffix.lower() in IMAGE_SUFFIXES)
+
+
+def _stem(path):
+    # "electron.png.png" -> "electron"
+    return path.name.split(".")[0]
+
+
+def build_variants(source, formats=None):
+    """Encode every width/format variant of ``source``. Returns the manifest entry."""
+    from PIL import Image
+
+    formats = formats or available_formats()
+    data = source.read_bytes()
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        width, height = image.size
+
+        widths = [w for w in WIDTH_BUCKETS if w < width] + [width]
+        variants = []
+        for w in widths:
+            h = max(1, round(height * w / width))
+            resized = image if w == width else image.resize((w, h), Image.LANCZOS)
+            for fmt in formats:
+                if fmt == "jpeg" and resized.mode == "RGBA":
+                    continue
+                ext, options = FORMATS[fmt]
+                out = io.BytesIO()
+                resized.save(out, format=fmt.upper(), **options)
+                blob = out.getvalue()
+                target = BUILD_DIR / f"{_stem(source)}-{w}w-{_sha(blob)[:10]}.{ext}"
+                if not target.exists():
+                    target.write_bytes(blob)
+                variants.append({
+                    "width": w,
+                    "height": h,
+                    "format": fmt,
+                    "path": target.relative_to(ROOT).as_posix(),
+                    "bytes": len(blob),
+                })
+
+    return {
+        "sha256": _sha(data),
+        "bytes": len(data),
+        "width": width,
+        "height": height,
+        "variants": variants,
+    }
+
+
+def read_manifest(path=MANIFEST_PATH):
+    try:
+        manifest = json.loads(Path(path).read_text())
+    except (FileNotFoundError, ValueError):
+        return {"version": PIPELINE_VERSION, "sources": {}}
+    if manifest.get("version") != PIPELINE_VERSION:
+        return {"version": PIPELINE_VERSION, "sources": {}}
+    return manifest
+
+
+def build(log=None):
+    """Bring ``assets/build`` and the manifest up to date. Returns the manifest."""
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    formats = available_formats()
+    manifest = read_manifest()
+    if manifest.get("formats") != formats:
+        # e.g. Pillow gained AVIF support since the last build
+        manifest["sources"] = {}
+    sources = {}
+    for source in source_images():
+        key = source.relative_to(ROOT).as_posix()
+        entry = manifest["sources"].get(key)
+        if (
+            entry
+            and entry["sha256"] == _sha(source.read_bytes())
+            and all((ROOT / v["path"]).exists() for v in entry["variants"])
+        ):
+            sources[key] = entry
+            continue
+        started = time.perf_counter()
+        sources[key] = build_variants(source, formats)
+        if log:
+            best = min(v["bytes"] for v in sources[key]["variants"])
+            log(f"{key}: {sources[key]['bytes']:,} B -> {len(sources[key]['variants'])} variants "
+                f"(smallest {best:,} B) in {time.perf_counter() - started:.1f}s")
+
+    manifest = {"version": PIPELINE_VERSION, "formats": formats, "sources": sources}
+    tmp = MANIFEST_PATH.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(manifest, indent=1))
+    os.replace(tmp, MANIFEST_PATH)
+    _manifest_cache.clear()
+
+    # Variants of older versions of a source are never referenced again
+    keep = {v["path"] for e in sources.values() for v in e["variants"]}
+    keep.add(MANIFEST_PATH.relative_to(ROOT).as_posix())
+    for path in BUILD_DIR.iterdir():
+        if path.is_file() and path.relative_to(ROOT).as_posix() not in keep and not path.name.endswith(".tmp"):
+            path.unlink()
+    return manifest
+
+
+_manifest_cache = {}
+_build_lock = threading.Lock()
+_build_thread = None
+
+
+def manifest():
+    """The current manifest, read once and then kept in memory."""
+    if "manifest" not in _manifest_cache:
+        _manifest_cache["manifest"] = read_manifest()
+    return _manifest_cache["manifest"]
+
+
+def start_build():
+    """Build missing variants in the background (once per process)."""
+    global _build_thread
+    with _build_lock:
+        if _build_thread is None:
+            _build_thread = threading.Thread(target=build, name="asset-build", daemon=True)
+            _build_thread.start()
+
+
+def best_variant(path_str, display_width, formats=ST_IMAGE_FORMATS):
+    """The smallest built file that fills ``display_width`` CSS pixels.
+
+    Falls back to ``path_str`` itself when there is nothing built for it.
+    """
+    entry = manifest()["sources"].get(Path(path_str).as_posix())
+    if not entry:
+        return path_str
+
+    wanted = display_width * PIXEL_RATIO
+    candidates = [v for v in entry["variants"] if v["format"] in formats]
+    if not candidates:
+        return path_str
+    # the narrowest bucket that is wide enough, or the widest we have
+    wide_enough = [v for v in candidates if v["width"] >= wanted]
+    width = min(v["width"] for v in wide_enough) if wide_enough else max(v["width"] for v in candidates)
+    best = min((v for v in candidates if v["width"] == width), key=lambda v: v["bytes"])
+    if best["bytes"] >= entry["bytes"] or not (ROOT / best["path"]).exists():
+        return path_str
+    return best["path"]
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    result = build(log=print)
+    before = sum(e["bytes"] for e in result["sources"].values())
+    print(f"{len(result['sources'])} images, {before:,} B of sources, "
+          f"done in {time.perf_counter() - start:.1f}s -> {MANIFEST_PATH.relative_to(ROOT)}")
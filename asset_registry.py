@@ -0,0 +1,140 @@
+"""One in-memory registry for the images the pages show.
+
+``assets/`` is scanned once when the server starts and every image the pages
+reference is checked right then, so a missing file shows up in the server log
+at boot instead of as a warning in the middle of a lesson. After that the
+pages never touch the filesystem on a rerun: existence checks are dictionary
+lookups and the encoded bytes come from a size-bounded cache shared by all
+sessions. Which variant to send for a column is worked out once per
+manifest too, including the static URL in serve.py mode.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from asset_pipeline import ASSET_DIR, ROOT, ST_IMAGE_FORMATS, best_variant, manifest
+from catalog import catalog
+from static_assets import URL_FORMATS, static_url
+
+
+logger = logging.getLogger(__name__)
+
+# Images the pages use, on top of the ones in the particle catalog.
+# Checked at startup.
+REFERENCED_ASSETS = (
+    "assets/lhs1.png",
+    "assets/lhs2.png",
+    "assets/lhs3.png",
+    "assets/lhs5.png",
+)
+
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class AssetRegistry:
+    def __init__(self, asset_dir=ASSET_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sizes = {}
+        self._cache = OrderedDict()
+        self._cached_bytes = 0
+        self._resolved = {}
+        self.loads = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.scan(asset_dir)
+
+    def scan(self, asset_dir):
+        """Index every file under ``asset_dir`` (including built variants)."""
+        for dirpath, _, filenames in os.walk(asset_dir):
+            for name in filenames:
+                path = Path(dirpath) / name
+                self._sizes[path.relative_to(ROOT).as_posix()] = path.stat().st_size
+
+    def validate(self, referenced=None):
+        """Referenced images that aren't there. Logged as warnings."""
+        if referenced is None:
+            referenced = sorted(set(REFERENCED_ASSETS) | set(catalog().images()))
+        missing = [p for p in referenced if p not in self._sizes]
+        for path in missing:
+            logger.warning("Asset referenced by a page is missing: %s", path)
+        return missing
+
+    def exists(self, path_str):
+        return Path(path_str).as_posix() in self._sizes
+
+    def _read(self, key):
+        path = ROOT / key
+        if key not in self._sizes:
+            # e.g. a variant built after startup; index it now
+            self._sizes[key] = path.stat().st_size
+        self.loads += 1
+        return path.read_bytes()
+
+    def load(self, path_str):
+        """The file's bytes. Raises ``FileNotFoundError`` for unknown files."""
+        key = Path(path_str).as_posix()
+        with self._lock:
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+
+            data = self._read(key)
+            if len(data) <= self.max_bytes:
+                self._cache[key] = data
+                self._cached_bytes += len(data)
+                while self._cached_bytes > self.max_bytes:
+                    _, dropped = self._cache.popitem(last=False)
+                    self._cached_bytes -= len(dropped)
+                    self.evictions += 1
+            return data
+
+    def resolve(self, path_str, display_width, formats=ST_IMAGE_FORMATS):
+        """Which file to send for ``path_str`` in a column, worked out once per manifest."""
+        current = manifest()
+        key = (path_str, display_width, formats)
+        hit = self._resolved.get(key)
+        if hit is None or hit[0] is not current:
+            hit = (current, best_variant(path_str, display_width, formats=formats))
+            self._resolved[key] = hit
+        return hit[1]
+
+    def image(self, path_str, display_width):
+        """Bytes of the best variant of ``path_str`` for a column, or ``None`` if missing."""
+        if not self.exists(path_str):
+            return None
+        return self.load(self.resolve(path_str, display_width))
+
+    def image_source(self, path_str, display_width):
+        """What to hand ``st.image``: a long-lived URL when the app is run
+        through serve.py, otherwise the cached bytes. ``None`` if missing."""
+        if not self.exists(path_str):
+            return None
+        url = static_url(self.resolve(path_str, display_width, URL_FORMATS))
+        if url is not None:
+            return url
+        return self.load(self.resolve(path_str, display_width))
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "files": len(self._sizes),
+                "loads": self.loads,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "cached_bytes": self._cached_bytes,
+            }
+
+
+registry = AssetRegistry()
+registry.validate()
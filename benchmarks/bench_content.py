@@ -0,0 +1,69 @@
+"""Elements and bytes each page sends to the browser on a rerun.
+
+Opens every page through Streamlit's AppTest, reruns it once more (the
+"pressed the fun fact button" case) and counts the delta messages of that
+rerun and their serialized size. The sidebar is counted separately since
+every page shares it.
+
+Usage (from the repo root):
+
+    python benchmarks/bench_content.py
+"""
+
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from streamlit.runtime.scriptrunner import ScriptRunnerEvent  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1 import local_script_runner  # noqa: E402
+
+
+class DeltaLog:
+    def __init__(self):
+        self.main = []
+        self.sidebar = []
+
+    def clear(self):
+        self.main.clear()
+        self.sidebar.clear()
+
+    def __call__(self, sender, event, **kwargs):
+        if event != ScriptRunnerEvent.ENQUEUE_FORWARD_MSG:
+            return
+        msg = kwargs["forward_msg"]
+        if msg.WhichOneof("type") != "delta":
+            return
+        # delta_path starts with the container: 0 = main, 1 = sidebar
+        container = msg.metadata.delta_path[0] if msg.metadata.delta_path else 0
+        (self.sidebar if container == 1 else self.main).append(msg.ByteSize())
+
+
+def main():
+    log = DeltaLog()
+    original_init = local_script_runner.LocalScriptRunner.__init__
+
+    def init(self, *a, **kw):
+        original_init(self, *a, **kw)
+        self.on_event.connect(log, weak=False)
+
+    local_script_runner.LocalScriptRunner.__init__ = init
+    try:
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+        at.run()
+        pages = at.sidebar.radio[0].options
+        print(f"{'page':<18} {'elements':>9} {'bytes':>8}")
+        for page in pages:
+            at.sidebar.radio[0].set_value(page).run()
+            log.clear()
+            at.run()
+            print(f"{page:<18} {len(log.main):>9} {sum(log.main):>8,}")
+        print(f"{'(sidebar)':<18} {len(log.sidebar):>9} {sum(log.sidebar):>8,}")
+    finally:
+        local_script_runner.LocalScriptRunner.__init__ = original_init
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Throughput of the toy collision event generator (events.py).
+
+Usage (from the repo root):
+
+    python benchmarks/bench_events.py [--events 1000000] [--energy 60]
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import events  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--energy", type=float, default=60)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    events.simulate(args.energy, 1000)  # warm up NumPy
+    for batch_size in (1 << 12, 1 << 14, 1 << 16, 1 << 18):
+        best = min(
+            events.simulate(args.energy, args.events, batch_size=batch_size).seconds
+            for _ in range(args.repeat)
+        )
+        tracemalloc.start()
+        events.simulate(args.energy, args.events, batch_size=batch_size)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"batch {batch_size:>7,}: {args.events:,} events in {best * 1000:6.0f} ms "
+              f"({args.events / best / 1e6:5.1f} M/s), peak {peak / 1e6:5.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""How long a plain rerun of each page takes.
+
+Opens every page through Streamlit's AppTest, then reruns it a number of
+times without touching anything and prints the median script time per
+rerun. That is the fixed cost a student pays on every click, before the page
+does anything interesting.
+
+Usage (from the repo root):
+
+    python benchmarks/bench_pages.py [--reruns 30]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from streamlit.runtime.scriptrunner import ScriptRunnerEvent  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1 import local_script_runner  # noqa: E402
+
+
+class ScriptTimer:
+    def __init__(self):
+        self.runs = []
+        self._started = None
+
+    def __call__(self, sender, event, **kwargs):
+        if event == ScriptRunnerEvent.SCRIPT_STARTED:
+            self._started = time.perf_counter()
+        elif event == ScriptRunnerEvent.SCRIPT_STOPPED_WITH_SUCCESS and self._started is not None:
+            self.runs.append(time.perf_counter() - self._started)
+            self._started = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=30)
+    args = parser.parse_args()
+
+    timer = ScriptTimer()
+    original_init = local_script_runner.LocalScriptRunner.__init__
+
+    def init(self, *a, **kw):
+        original_init(self, *a, **kw)
+        self.on_event.connect(timer, weak=False)
+
+    local_script_runner.LocalScriptRunner.__init__ = init
+    try:
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+        at.run()
+        pages = at.sidebar.radio[0].options
+        print(f"{'page':<18} {'first visit ms':>15} {'rerun ms':>9}")
+        for page in pages:
+            timer.runs.clear()
+            at.sidebar.radio[0].set_value(page).run()
+            for _ in range(args.reruns):
+                at.run()
+            first, reruns = timer.runs[0], timer.runs[1:]
+            print(f"{page:<18} {first * 1000:>15.1f} {statistics.median(reruns) * 1000:>9.2f}")
+    finally:
+        local_script_runner.LocalScriptRunner.__init__ = original_init
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""What the quiz bank costs: loading it, drawing a quiz and grading one.
+
+Loads ``data/quiz_bank.jsonl`` once, then draws and grades many quizzes of
+each length and prints the median time per call.
+
+Usage (from the repo root):
+
+    python benchmarks/bench_quiz.py [--quizzes 2000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from quiz import load_bank  # noqa: E402
+
+
+def timed(call, repeat):
+    times = []
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - begin)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quizzes", type=int, default=2000)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    begin = time.perf_counter()
+    bank = load_bank()
+    seconds = time.perf_counter() - begin
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{len(bank):,} questions loaded in {seconds * 1000:.0f} ms, {memory / 1e6:.1f} MB")
+
+    rng = random.Random(0)
+    print(f"{'questions':>9} {'sample us':>10} {'hard only us':>13} {'grade us':>9}")
+    for k in (5, 7, 10, 15, 50):
+        quiz = bank.sample(k, rng=rng)
+        picks = [rng.randrange(len(bank.options[q])) for q in quiz]
+        sample = timed(lambda: bank.sample(k, rng=rng), args.quizzes)
+        hard = timed(lambda: bank.sample(k, difficulties=[3], rng=rng), args.quizzes)
+        grade = timed(lambda: bank.grade(quiz, picks), args.quizzes)
+        print(f"{k:>9} {sample * 1e6:>10.1f} {hard * 1e6:>13.1f} {grade * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
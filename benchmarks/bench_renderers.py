@@ -0,0 +1,120 @@
+"""Compare the ways of drawing an animation frame.
+
+Runs a full Collider Run and Collision Lab animation through each drawing
+path and prints frames per second and bytes sent to the browser per frame:
+
+* pyplot - what the pages used to do: plt.subplots, draw, st.pyplot's
+           savefig(bbox_inches="tight", dpi=200), close
+* figure - renderer.BeamRenderer, persistent figure with blitting
+* raster - raster.RasterRenderer, NumPy buffer encoded to PNG
+* svg    - svg_renderer.SvgRenderer, SVG markup
+
+The svg numbers only time building the markup string. The browser still has
+to parse and rasterize every frame, which this benchmark can't see, so its
+frames/s is marked with ``*`` and isn't comparable with the PNG backends.
+
+Usage (from the repo root):
+
+    python benchmarks/bench_renderers.py [--energy 50] [--repeat 3]
+"""
+
+import argparse
+import base64
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import animation  # noqa: E402
+from renderer import make_renderer  # noqa: E402
+
+
+class PyplotRenderer:
+    """The original per-frame pyplot code, kept here only for comparison."""
+
+    def __init__(self, page):
+        self.page = page
+        self.scene = animation.SCENES[page]
+
+    def render(self, xs, flash=False):
+        import matplotlib.pyplot as plt
+
+        scene = self.scene
+        fig, ax = plt.subplots(figsize=scene["figsize"])
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.axis("off")
+        beam = scene["beam"]
+        ax.plot(beam["x"], [beam["y"], beam["y"]], linewidth=beam["width"],
+                color=beam["color"], alpha=beam["alpha"])
+        for p, x in zip(scene["particles"], xs):
+            ax.add_patch(plt.Circle((x, p["y"]), p["radius"], color=p["color"]))
+        if flash:
+            f = scene["flash"]
+            ax.add_patch(plt.Circle((f["x"], f["y"]), f["radius"], color=f["color"], alpha=f["alpha"]))
+        out = io.BytesIO()
+        fig.savefig(out, format="png", bbox_inches="tight", dpi=200)
+        plt.close(fig)
+        return out.getvalue()
+
+
+BACKENDS = {
+    "pyplot": PyplotRenderer,
+    "figure": lambda page: make_renderer(page, "figure"),
+    "raster": lambda page: make_renderer(page, "raster"),
+    "svg": lambda page: make_renderer(page, "svg"),
+}
+
+# Backends whose frames/s leaves out the drawing, which happens in the browser
+BROWSER_DRAWN = {"svg"}
+
+
+def wire_size(data):
+    # st.image sends SVG strings as base64 data URIs
+    if isinstance(data, str):
+        return len("data:image/svg+xml;base64,") + len(base64.b64encode(data.encode()))
+    return len(data)
+
+
+def bench(make, run, repeat):
+    renderer = make(run.page)
+    renderer.render(run.frames[0])  # build/warm up outside the timing
+    frames = 0
+    total_bytes = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for i, xs in enumerate(run.frames):
+            data = renderer.render(xs, flash=i >= run.hit_frame)
+            total_bytes += wire_size(data)
+            frames += 1
+    elapsed = time.perf_counter() - start
+    return frames / elapsed, total_bytes / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--energy", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    args = parser.parse_args()
+
+    print(f"{'page':<14} {'backend':<8} {'frames/s':>10} {'bytes/frame':>12}")
+    for page in (animation.COLLIDER_RUN, animation.COLLISION_LAB):
+        run = animation.trajectory(page, args.energy)
+        for name in args.backends.split(","):
+            fps, size = bench(BACKENDS[name], run, args.repeat)
+            mark = "*" if name in BROWSER_DRAWN else " "
+            print(f"{page:<14} {name:<8} {fps:>9.1f}{mark} {size:>12.0f}")
+    if BROWSER_DRAWN & set(args.backends.split(",")):
+        print("* markup only, not counting the browser rasterizing it; "
+              "not comparable with the PNG backends")
+
+
+if __name__ == "__main__":
+    main()
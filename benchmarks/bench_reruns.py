@@ -0,0 +1,125 @@
+"""What one frame of the classic animations costs the server.
+
+Plays a Collider Run and a Collision Lab run in "🐢 Classic" mode through
+Streamlit's AppTest and, for every rerun, records the script time (not
+counting the scheduler's sleep until the next frame) and how many delta
+messages (element updates) went to the browser. Runs each page
+twice: as the app is (the canvas is a fragment that reruns on its own) and
+with every ``st.rerun`` widened to the whole app, which is how the loops
+used to work.
+
+Usage (from the repo root):
+
+    python benchmarks/bench_reruns.py [--energy 60]
+"""
+
+import argparse
+import functools
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import streamlit as st  # noqa: E402
+from streamlit.runtime.scriptrunner import ScriptRunnerEvent  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1 import local_script_runner  # noqa: E402
+
+import scheduler  # noqa: E402
+
+PAGES = {
+    "Collider Run": "collider_run_mode",
+    "Collision Lab": "collision_lab_mode",
+}
+
+
+class RerunLog:
+    """Script time and delta count of every rerun of the script thread."""
+
+    def __init__(self):
+        self.runs = []
+        self.waited = 0.0
+        self._started = None
+        self._deltas = 0
+
+    def __call__(self, sender, event, **kwargs):
+        if event == ScriptRunnerEvent.SCRIPT_STARTED:
+            self._started = time.perf_counter()
+            self.waited = 0.0
+            self._deltas = 0
+        elif event == ScriptRunnerEvent.ENQUEUE_FORWARD_MSG:
+            if kwargs["forward_msg"].WhichOneof("type") == "delta":
+                self._deltas += 1
+        elif event in (
+            ScriptRunnerEvent.SCRIPT_STOPPED_WITH_SUCCESS,
+            ScriptRunnerEvent.SCRIPT_STOPPED_FOR_RERUN,
+            ScriptRunnerEvent.FRAGMENT_STOPPED_WITH_SUCCESS,
+        ):
+            if self._started is not None:
+                # the scheduler's sleep until the next frame isn't work
+                self.runs.append((time.perf_counter() - self._started - self.waited, self._deltas))
+                self._started = None
+
+
+def play(page, energy, whole_app):
+    log = RerunLog()
+    original_init = local_script_runner.LocalScriptRunner.__init__
+    original_rerun_data = local_script_runner.RerunData
+    original_rerun = st.rerun
+    original_wait = scheduler.FrameScheduler.wait
+
+    def init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        self.on_event.connect(log, weak=False)
+
+    def wait(self):
+        started = time.perf_counter()
+        original_wait(self)
+        log.waited += time.perf_counter() - started
+
+    local_script_runner.LocalScriptRunner.__init__ = init
+    scheduler.FrameScheduler.wait = wait
+    if whole_app:
+        st.rerun = lambda scope="app", **kwargs: original_rerun(**kwargs)
+    try:
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=600)
+        at.run()
+        at.sidebar.radio[0].set_value(page).run()
+        at.radio(key=PAGES[page]).set_value("live").run()
+        at.slider[0].set_value(energy).run()
+
+        # In the browser, Start is clicked inside the fragment, so only the
+        # fragment reruns. AppTest always runs the whole script, so start
+        # the run the way the browser would: a rerun of just that fragment.
+        fragment_ids = list(at._fragment_storage._fragments)
+        at.session_state["running"] = True
+        local_script_runner.RerunData = functools.partial(original_rerun_data, fragment_id_queue=fragment_ids)
+        log.runs.clear()
+        at.run()
+    finally:
+        local_script_runner.LocalScriptRunner.__init__ = original_init
+        local_script_runner.RerunData = original_rerun_data
+        scheduler.FrameScheduler.wait = original_wait
+        st.rerun = original_rerun
+    return log.runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--energy", type=int, default=60)
+    args = parser.parse_args()
+
+    print(f"{'page':<14} {'reruns':>12} {'frames':>7} {'ms/frame':>9} {'deltas/frame':>13}")
+    for page in PAGES:
+        for whole_app, label in ((True, "whole app"), (False, "fragment")):
+            runs = play(page, args.energy, whole_app)
+            ms = statistics.median(t for t, _ in runs) * 1000
+            deltas = statistics.median(d for _, d in runs)
+            print(f"{page:<14} {label:>12} {len(runs):>7} {ms:>9.2f} {deltas:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""A classroom submitting the quiz at once: queued writes vs writing in the rerun.
+
+Starts ``--students`` threads that each submit ``--quizzes`` graded quizzes
+as fast as they can, first through the background writer (``record_result``)
+and then with one INSERT transaction per submission on the submitting thread,
+the way a page would without the queue. Prints how long a submit blocks the
+student (median and p99), how long until everything is on disk, and the
+writer's batch sizes.
+
+Usage (from the repo root):
+
+    python benchmarks/bench_results.py [--students 300] [--quizzes 2]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import quiz_results  # noqa: E402
+from quiz import quiz_bank  # noqa: E402
+
+
+def classroom(students, quizzes, submit):
+    bank = quiz_bank()
+    times = []
+    lock = threading.Lock()
+    go = threading.Event()
+
+    def student(n):
+        rng = random.Random(n)
+        graded = []
+        for _ in range(quizzes):
+            questions = bank.sample(7, rng=rng)
+            graded.append(bank.grade(questions, [rng.randrange(len(bank.options[q])) for q in questions]))
+        go.wait()
+        mine = []
+        for result in graded:
+            begin = time.perf_counter()
+            submit(f"student-{n}", bank, result)
+            mine.append(time.perf_counter() - begin)
+        with lock:
+            times.extend(mine)
+
+    threads = [threading.Thread(target=student, args=(n,)) for n in range(students)]
+    for t in threads:
+        t.start()
+    begin = time.perf_counter()
+    go.set()
+    for t in threads:
+        t.join()
+    return times, begin
+
+
+def show(name, times, seconds):
+    times = sorted(times)
+    print(f"{name:<12} submit {statistics.median(times) * 1000:7.2f} ms median, "
+          f"{times[int(len(times) * 0.99)] * 1000:7.2f} ms p99 · all saved after {seconds:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=300)
+    parser.add_argument("--quizzes", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # record_result() goes through the shared writer; point it at a scratch file
+        writer = quiz_results._writer = quiz_results.ResultWriter(os.path.join(tmp, "queued.sqlite3"))
+        writer.start()
+
+        def queued(session, bank, result):
+            quiz_results.record_result(session, bank, result, time.time() - 60)
+
+        times, begin = classroom(args.students, args.quizzes, queued)
+        writer.close()
+        show("queued", times, time.perf_counter() - begin)
+        stats = writer.stats()
+        print(f"{'':<12} {stats['written']:,} written in {stats['batches']} batches "
+              f"(mean {stats['batch_mean']:.0f}, max {stats['batch_max']}), "
+              f"flush {stats['flush_p50'] * 1000:.1f} ms typical")
+
+        # Without the queue: every submit opens the file and commits its own transaction
+        direct_path = os.path.join(tmp, "direct.sqlite3")
+        setup = quiz_results.ResultWriter(direct_path)
+        setup._connect().close()
+
+        def direct(session, bank, result):
+            db = sqlite3.connect(direct_path, timeout=60.0)
+            try:
+                submission = quiz_results.Submission(session, time.time(), 60.0, result.score, result.total, tuple(
+                    (q, bank.prompts[q], bank.options[q][pick], int(right))
+                    for q, pick, right in zip(result.questions, result.picks, result.correct)
+                ), time.perf_counter())
+                setup._write(db, [submission])
+            finally:
+                db.close()
+
+        times, begin = classroom(args.students, args.quizzes, direct)
+        show("in rerun", times, time.perf_counter() - begin)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Plays a precomputed run in the browser.
+
+The whole trajectory is sent once as JSON and a small canvas script animates
+it locally, so Start / Stop / Reset never talk to the server. Moving the
+energy slider is the only thing that reruns the page.
+"""
+
+import json
+
+import animation
+
+
+_PLAYER_HTML = """
+<div class="lc-player">
+  <div class="lc-buttons">
+    <button id="lc-start">▶ Start</button>
+    <button id="lc-stop">__STOP_LABEL__</button>
+    <button id="lc-reset">↩ Reset</button>
+  </div>
+  <canvas id="lc-canvas"></canvas>
+  <div id="lc-result" class="lc-result"></div>
+</div>
+<style>
+  body { margin: 0; font-family: "Source Sans Pro", sans-serif; }
+  .lc-buttons { display: flex; gap: 8px; margin-bottom: 6px; }
+  .lc-buttons button {
+    padding: 6px 14px; border: 1px solid #ccc; border-radius: 8px;
+    background: white; cursor: pointer; font-size: 15px;
+  }
+  .lc-buttons button:hover { border-color: #ff4b4b; color: #ff4b4b; }
+  #lc-canvas { width: 100%; display: block; }
+  .lc-result { padding: 10px 14px; border-radius: 8px; font-size: 16px; }
+  .lc-result.info { background: #e8f2fc; color: #0c4a8a; }
+  .lc-result.success { background: #e6f4ea; color: #17603a; }
+  .lc-result.warning { background: #fff8e1; color: #7a5b00; }
+</style>
+<script>
+const RUN = __PAYLOAD__;
+const canvas = document.getElementById("lc-canvas");
+const ctx = canvas.getContext("2d");
+const result = document.getElementById("lc-result");
+const scene = RUN.scene;
+const [figW, figH] = RUN.size;
+const [boxL, boxB, boxR, boxT] = RUN.axes_box;
+
+let frame = 0;
+let playing = false;
+let startTime = 0;
+let startFrame = 0;
+
+function resize() {
+  const ratio = window.devicePixelRatio || 1;
+  const cssW = canvas.clientWidth || 700;
+  canvas.width = Math.round(cssW * ratio);
+  canvas.height = Math.round(cssW * ratio * figH / figW);
+  canvas.style.height = (cssW * figH / figW) + "px";
+  draw();
+}
+
+function px(x, y) {
+  const w = canvas.width, h = canvas.height;
+  return [w * (boxL + x * (boxR - boxL)), h * (1 - (boxB + y * (boxT - boxB)))];
+}
+
+function disc(x, y, r, color, alpha) {
+  const [cx, cy] = px(x, y);
+  ctx.globalAlpha = alpha;
+  ctx.fillStyle = color;
+  ctx.beginPath();
+  ctx.ellipse(cx, cy, r * canvas.width * (boxR - boxL), r * canvas.height * (boxT - boxB), 0, 0, 2 * Math.PI);
+  ctx.fill();
+}
+
+function draw() {
+  ctx.clearRect(0, 0, canvas.width, canvas.height);
+  const beam = scene.beam;
+  const [x0, y0] = px(beam.x[0], beam.y);
+  const [x1] = px(beam.x[1], beam.y);
+  ctx.globalAlpha = beam.alpha;
+  ctx.strokeStyle = beam.color;
+  ctx.lineWidth = beam.width / 72 * canvas.width / figW;
+  ctx.lineCap = "square";
+  ctx.beginPath();
+  ctx.moveTo(x0, y0);
+  ctx.lineTo(x1, y0);
+  ctx.stroke();
+
+  const xs = RUN.frames[frame];
+  scene.particles.forEach((p, i) => disc(xs[i], p.y, p.radius, p.color, 1));
+  if (frame >= RUN.hit_frame) {
+    const f = scene.flash;
+    disc(f.x, f.y, f.radius, f.color, f.alpha);
+  }
+  ctx.globalAlpha = 1;
+  showResult();
+}
+
+function showResult() {
+  if (frame >= RUN.hit_frame) {
+    result.className = "lc-result " + RUN.outcome.style;
+    result.innerHTML = "<b>" + RUN.outcome.title + "</b>" +
+      (RUN.outcome.text ? "<br>" + RUN.outcome.text : "");
+  } else {
+    result.className = "lc-result info";
+    result.innerHTML = RUN.idle_text;
+  }
+}
+
+function tick(now) {
+  if (!playing) return;
+  const next = startFrame + Math.floor((now - startTime) / RUN.frame_ms);
+  frame = Math.min(next, RUN.hit_frame);
+  draw();
+  if (frame >= RUN.hit_frame) {
+    playing = false;
+    return;
+  }
+  requestAnimationFrame(tick);
+}
+
+document.getElementById("lc-start").onclick = () => {
+  if (playing || frame >= RUN.hit_frame) return;
+  playing = true;
+  startFrame = frame;
+  startTime = performance.now();
+  requestAnimationFrame(tick);
+};
+document.getElementById("lc-stop").onclick = () => { playing = false; };
+document.getElementById("lc-reset").onclick = () => { playing = false; frame = 0; draw(); };
+
+window.addEventListener("resize", resize);
+resize();
+</script>
+"""
+
+_IDLE_TEXT = {
+    animation.COLLIDER_RUN: "Press <b>Start</b> to see the particle zoom across the beam!",
+    animation.COLLISION_LAB: "Press <b>Start</b> to begin the collision.",
+}
+
+_STOP_LABEL = {
+    animation.COLLIDER_RUN: "⏹ Stop",
+    animation.COLLISION_LAB: "⏸ Stop",
+}
+
+
+def player_payload(run):
+    """Everything the browser needs to play ``run``, as plain JSON data."""
+    size, axes_box = animation.canvas_geometry(run.page)
+    return {
+        "page": run.page,
+        "energy": run.energy,
+        "scene": animation.SCENES[run.page],
+        "size": size,
+        "axes_box": axes_box,
+        # keep the payload small, 4 decimals is well below a pixel
+        "frames": [[round(x, 4) for x in xs] for xs in run.frames],
+        "hit_frame": run.hit_frame,
+        "frame_ms": int(run.frame_delay * 1000),
+        "outcome": animation.OUTCOMES[run.outcome],
+        "idle_text": _IDLE_TEXT[run.page],
+    }
+
+
+def player_html(run):
+    # "</" can't appear inside the inline <script>, escape it in the JSON
+    payload = json.dumps(player_payload(run), ensure_ascii=False).replace("</", "<\\/")
+    return (
+        _PLAYER_HTML
+        .replace("__PAYLOAD__", payload)
+        .replace("__STOP_LABEL__", _STOP_LABEL[run.page])
+    )
+
+
+def browser_player(page, energy):
+    """Show the whole run for ``energy`` as one self-animating element."""
+    import streamlit as st
+
+    run = animation.trajectory(page, energy)
+    st.iframe(player_html(run), height="content")
+    return run
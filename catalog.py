@@ -0,0 +1,109 @@
+"""The particle catalog, loaded from ``data/catalog.json``.
+
+The file lists every particle the app knows about (real ones and our toy
+ones) with its mass, lifetime, rarity, color and image, plus two sets of
+energy bands: which particle card the Energy Explorer shows, and what a
+Collision Lab crash produces. Adding a particle or moving a band is a data
+change only.
+
+Each set of bands is kept as a sorted ``array`` of cut-offs next to a tuple
+of ready-made payload dicts, so a lookup is one ``bisect`` and hands back
+the same dict every time; nothing is built per rerun.
+"""
+
+import json
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+
+
+CATALOG_PATH = Path(__file__).parent / "data" / "catalog.json"
+
+
+class ThresholdIndex:
+    """Energy bands as sorted cut-offs. Band ``i`` covers energies below
+    ``cutoffs[i]`` (and at or above the previous one); the last band is open."""
+
+    def __init__(self, bands):
+        cutoffs = [band["below"] for band in bands[:-1]]
+        if any(c is None for c in cutoffs) or bands[-1]["below"] is not None:
+            raise ValueError("only the last band may be open-ended")
+        if any(a >= b for a, b in zip(cutoffs, cutoffs[1:])):
+            raise ValueError(f"band cut-offs must increase: {cutoffs}")
+        self.cutoffs = array("d", cutoffs)
+        self.payloads = tuple(bands)
+
+    def __len__(self):
+        return len(self.payloads)
+
+    def lookup(self, energy):
+        return self.payloads[bisect_right(self.cutoffs, energy)]
+
+
+class Catalog:
+    def __init__(self, data):
+        self.version = data.get("version", 1)
+        self.particles = {}
+        for entry in data["particles"]:
+            if entry["id"] in self.particles:
+                raise ValueError(f"duplicate particle id: {entry['id']}")
+            self.particles[entry["id"]] = entry
+
+        # Energy Explorer cards, in the shape the page draws them
+        cards = []
+        for band in data["explorer_bands"]:
+            particle = self.particle(band["particle"])
+            cards.append({
+                "below": band["below"],
+                "id": particle["id"],
+                "name": particle["name"],
+                "mass": particle["mass_level"],
+                "rarity": particle["rarity"],
+                "meaning": particle["meaning"],
+                "image": particle["image"],
+                "color": particle["color"],
+            })
+        self.explorer = ThresholdIndex(cards)
+
+        # Collision Lab result boxes
+        outcomes = []
+        for band in data["collision_outcomes"]:
+            if band.get("particle"):
+                self.particle(band["particle"])
+            outcomes.append(dict(band))
+        self.collisions = ThresholdIndex(outcomes)
+        self.outcomes = {o["id"]: o for o in outcomes}
+
+    def particle(self, particle_id):
+        try:
+            return self.particles[particle_id]
+        except KeyError:
+            raise ValueError(f"unknown particle in catalog bands: {particle_id}") from None
+
+    def explorer_card(self, energy):
+        return self.explorer.lookup(energy)
+
+    def collision_outcome(self, energy):
+        return self.collisions.lookup(energy)
+
+    @property
+    def explorer_cards(self):
+        return list(self.explorer.payloads)
+
+    def images(self):
+        return sorted({p["image"] for p in self.particles.values() if p.get("image")})
+
+
+def load_catalog(path=CATALOG_PATH):
+    with open(path, encoding="utf-8") as f:
+        return Catalog(json.load(f))
+
+
+_catalog = {}
+
+
+def catalog():
+    """The catalog, read once per process."""
+    if "catalog" not in _catalog:
+        _catalog["catalog"] = load_catalog()
+    return _catalog["catalog"]
@@ -0,0 +1,202 @@
+"""Precomputed animation clips, one per page and energy.
+
+The energy slider only has 101 values, so every run the animated pages can
+show is known ahead of time. Each run is rendered once into an animated PNG
+and stored on disk under a name that includes a hash of everything that went
+into it (motion, scene, size). Changing any of that gives new names, so stale
+clips are never read again, and a finished warm-up deletes them.
+
+``start_warmup()`` fills the cache in a background thread when the server
+starts. It skips clips that are already on disk, so a restart picks up where
+the last one stopped, and the page renders a missing clip on demand if a
+student gets there first.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import animation
+
+
+CLIP_DIR = Path(os.environ.get("LITTLE_COLLIDER_CLIP_DIR", Path(__file__).parent / ".cache" / "clips"))
+
+# Clips are shown stretched to the column, 100 dpi keeps them small
+CLIP_DPI = 100
+
+# Bump when the clip encoding changes in a way the hash can't see
+CLIP_FORMAT = 1
+
+PAGES = (animation.COLLIDER_RUN, animation.COLLISION_LAB)
+ENERGIES = range(0, 101)
+
+
+def clip_hash(run, dpi=CLIP_DPI):
+    spec = {
+        "format": CLIP_FORMAT,
+        "page": run.page,
+        "frames": run.frames,
+        "hit_frame": run.hit_frame,
+        "delay": run.frame_delay,
+        "scene": animation.SCENES[run.page],
+        "geometry": animation.canvas_geometry(run.page),
+        "dpi": dpi,
+        "backend": "raster",
+    }
+    blob = json.dumps(spec, sort_keys=True).encode()
+    return hashlib.sha256(blob).hexdigest()[:16]
+
+
+def clip_path(page, energy):
+    run = animation.trajectory(page, energy)
+    return CLIP_DIR / f"{page}-{energy:03d}-{clip_hash(run)}.png"
+
+
+def render_clip(run, dpi=CLIP_DPI):
+    """Encode a whole run as an animated PNG that plays once and stops on the result."""
+    from PIL import Image
+    from raster import RasterRenderer
+
+    renderer = RasterRenderer(run.page, dpi=dpi)
+    images = [
+        Image.fromarray(renderer.draw(xs, flash=i >= run.hit_frame).copy())
+        for i, xs in enumerate(run.frames)
+    ]
+
+    out = io.BytesIO()
+    images[0].save(
+        out,
+        format="PNG",
+        save_all=True,
+        append_images=images[1:],
+        duration=int(run.frame_delay * 1000),
+        loop=1,
+    )
+    return out.getvalue()
+
+
+def _write_atomic(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def load_clip(page, energy):
+    """Clip bytes for ``(page, energy)``, rendering and storing it if missing."""
+    path = clip_path(page, energy)
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        pass
+    data = render_clip(animation.trajectory(page, energy))
+    _write_atomic(path, data)
+    return data
+
+
+def prune_clips():
+    """Delete clips whose name isn't one of the current ones; returns how many.
+
+    Old clips are left behind whenever the motion, scene or encoding
+    changes, since those are part of the name.
+    """
+    current = {clip_path(page, energy).name for page in PAGES for energy in ENERGIES}
+    pruned = 0
+    for path in CLIP_DIR.glob("*.png"):
+        if path.name not in current:
+            path.unlink(missing_ok=True)
+            pruned += 1
+    return pruned
+
+
+class _Warmup:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.thread = None
+        self.total = len(PAGES) * len(ENERGIES)
+        self.done = 0
+        self.rendered = 0
+        self.started = None
+        self.finished = None
+        self.error = None
+        self.pruned = 0
+
+    def run(self):
+        self.started = time.time()
+        try:
+            # Walk energies in the middle of the slider first, that's where
+            # lessons usually start
+            for energy in sorted(ENERGIES, key=lambda e: abs(e - 40)):
+                for page in PAGES:
+                    if not clip_path(page, energy).exists():
+                        load_clip(page, energy)
+                        self.rendered += 1
+                    self.done += 1
+            self.pruned = prune_clips()
+        except Exception as exc:  # keep the app usable, just stop warming
+            self.error = repr(exc)
+        self.finished = time.time()
+
+
+_warmup = _Warmup()
+
+
+def start_warmup():
+    """Start filling the clip cache in the background (once per process)."""
+    with _warmup.lock:
+        if _warmup.thread is None:
+            _warmup.thread = threading.Thread(target=_warmup.run, name="clip-warmup", daemon=True)
+            _warmup.thread.start()
+
+
+def warmup_status():
+    return {
+        "done": _warmup.done,
+        "total": _warmup.total,
+        "rendered": _warmup.rendered,
+        "pruned": _warmup.pruned,
+        "running": _warmup.thread is not None and _warmup.thread.is_alive(),
+        "seconds": (_warmup.finished or time.time()) - _warmup.started if _warmup.started else 0.0,
+        "error": _warmup.error,
+    }
+
+
+def clip_player(page, energy):
+    """Play the precomputed clip for ``energy`` with Play / Reset buttons."""
+    import streamlit as st
+    from frame_cache import cached_frame
+
+    key = f"clip_playing_{page}"
+    st.session_state.setdefault(key, False)
+
+    col1, col2 = st.columns([1, 3], gap="small")
+    if col1.button("▶ Start", key=f"{key}_start"):
+        st.session_state[key] = True
+    if col2.button("↩ Reset", key=f"{key}_reset"):
+        st.session_state[key] = False
+
+    run = animation.trajectory(page, energy)
+    if st.session_state[key]:
+        st.image(load_clip(page, energy), width="stretch")
+        outcome = animation.OUTCOMES[run.outcome]
+        getattr(st, outcome["style"])(outcome["title"])
+        if outcome["text"]:
+            st.write(outcome["text"])
+    else:
+        st.image(cached_frame(page, run.frames[0]), width="stretch")
+        st.info("Press **Start** to play the run.")
+    return run
+
+
+if __name__ == "__main__":
+    # Build every clip up front, e.g. during a deploy: python clips.py
+    start = time.time()
+    _warmup.run()
+    status = warmup_status()
+    print(f"{status['done']}/{status['total']} clips ready, "
+          f"{status['rendered']} rendered, {status['pruned']} stale removed "
+          f"in {time.time() - start:.1f}s -> {CLIP_DIR}")
@@ -0,0 +1,121 @@
+"""Static page text, kept in ``data/content/*.md`` and compiled once.
+
+Home, About CERN and About the LHC are mostly fixed text. Written out as one
+``st.write`` per sentence they sent dozens of element deltas on every rerun,
+even when somebody only pressed the fun-fact button. Now the text lives in
+one Markdown file per page, split into named sections:
+
+    === intro
+    # 🔬 Little Collider
+
+    Some **Markdown** text...
+
+    ::: caption
+    A call-out: caption, info, success or warning.
+    :::
+
+Compiling a file merges each run of plain Markdown into one block, so a
+section becomes a handful of ready-made ``(element, text)`` blocks. The page
+code shows a section with ``show_section()`` and keeps the interactive bits
+(buttons, images) in Python between sections. Files are compiled once per
+process (the prewarm does it at startup) and again only if they change; a
+rerun looks at the file's modification time at most every
+``RECHECK_SECONDS``.
+"""
+
+import time
+from pathlib import Path
+
+
+CONTENT_DIR = Path(__file__).parent / "data" / "content"
+
+# Call-out blocks and the Streamlit element that shows them
+CALLOUTS = ("caption", "info", "success", "warning")
+
+# How often a page's file is checked for edits (seconds)
+RECHECK_SECONDS = 2.0
+
+
+def compile_content(text, name="<content>"):
+    """Markdown with ``=== section`` lines and ``::: callout`` blocks ->
+    ``{section: ((element, text), ...)}``."""
+    sections = {}
+    blocks = None
+    lines = []
+    callout = None
+
+    def flush(element):
+        body = "\n".join(lines).strip()
+        lines.clear()
+        if not body:
+            return
+        # plain Markdown next to plain Markdown becomes one block
+        if element == "markdown" and blocks and blocks[-1][0] == "markdown":
+            blocks[-1] = ("markdown", blocks[-1][1] + "\n\n" + body)
+        else:
+            blocks.append((element, body))
+
+    for number, line in enumerate(text.splitlines(), 1):
+        stripped = line.strip()
+        if stripped.startswith("=== "):
+            if callout:
+                raise ValueError(f"{name}:{number}: section starts inside a ::: {callout} block")
+            if blocks is not None:
+                flush("markdown")
+            blocks = sections.setdefault(stripped[4:].strip(), [])
+            continue
+        if blocks is None:
+            if stripped:
+                raise ValueError(f"{name}:{number}: text before the first === section")
+            continue
+        if stripped.startswith(":::"):
+            kind = stripped[3:].strip()
+            if callout is None:
+                if kind not in CALLOUTS:
+                    raise ValueError(f"{name}:{number}: unknown call-out {kind!r}, expected one of {CALLOUTS}")
+                flush("markdown")
+                callout = kind
+            else:
+                flush(callout)
+                callout = None
+            continue
+        lines.append(line)
+
+    if callout:
+        raise ValueError(f"{name}: ::: {callout} block is never closed")
+    if blocks is not None:
+        flush("markdown")
+    return {section: tuple(blocks) for section, blocks in sections.items()}
+
+
+# page -> (mtime, when it was last checked, sections); one entry per page,
+# so an edited file replaces its old sections
+_compiled = {}
+
+
+def page_content(page):
+    """The compiled sections of ``data/content/<page>.md``."""
+    now = time.monotonic()
+    entry = _compiled.get(page)
+    if entry is not None and now - entry[1] < RECHECK_SECONDS:
+        return entry[2]
+    path = CONTENT_DIR / f"{page}.md"
+    mtime = path.stat().st_mtime_ns
+    if entry is not None and entry[0] == mtime:
+        sections = entry[2]
+    else:
+        sections = compile_content(path.read_text(encoding="utf-8"), path.name)
+    _compiled[page] = (mtime, now, sections)
+    return sections
+
+
+def compile_all():
+    for path in sorted(CONTENT_DIR.glob("*.md")):
+        page_content(path.stem)
+
+
+def show_section(page, section):
+    import streamlit as st
+
+    for element, text in page_content(page)[section]:
+        getattr(st, element)(text)
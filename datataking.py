@@ -0,0 +1,308 @@
+"""A toy "data-taking run" for the Collision Lab.
+
+Real experiments can't keep every collision, so the data flows through a
+chain of stages and most of it is thrown away on the way:
+
+    generate -> trigger (level 1, then high level) -> reconstruct -> store
+
+Each stage here is a generator that takes batches from the one before it and
+yields the batches it keeps. A ``DataTakingRun`` owns the chain and lives in
+the session, so every rerun pulls a few more batches through it and adds them
+to the histograms in place; nothing is recomputed. The histograms have fixed
+bins and the mean/spread are running statistics, so the run uses the same
+memory after a thousand events or a billion.
+"""
+
+import time
+
+import numpy as np
+
+import events
+from catalog import catalog
+
+
+# Level-1 trigger: how much of the beam energy must come out sideways
+TRIGGER_FRACTION = 0.3
+
+# High-level trigger: keep events where this much of the energy went into
+# making something heavy, plus one in PRESCALE of the rest as a sample
+HLT_FRACTION = 0.6
+PRESCALE = 100
+
+# The detector can't see particles that stay inside the beam pipe
+ACCEPTANCE = (10.0, 170.0)
+
+# Toy detector: some events are lost, momenta are measured to a few percent
+RECO_EFFICIENCY = 0.97
+MOMENTUM_RESOLUTION = 0.03
+
+# Batches pulled through the chain on each rerun, and the pause in between
+BATCHES_PER_TICK = 8
+TICK_DELAY = 0.2
+
+
+class StageStats:
+    """Events in and out of one stage, and the time spent in it."""
+
+    def __init__(self, name):
+        self.name = name
+        self.events_in = 0
+        self.events_out = 0
+        self.seconds = 0.0
+
+    def record(self, events_in, events_out, seconds):
+        self.events_in += int(events_in)
+        self.events_out += int(events_out)
+        self.seconds += seconds
+
+    @property
+    def throughput(self):
+        return self.events_in / self.seconds if self.seconds else 0.0
+
+    @property
+    def rejection(self):
+        return 1 - self.events_out / self.events_in if self.events_in else 0.0
+
+
+class FixedHistogram:
+    """Equal bins over ``[0, upper)``, filled in place."""
+
+    def __init__(self, bins, upper):
+        self.bins = bins
+        self.upper = upper
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    def fill(self, values):
+        self.counts += events.bin_counts(values, self.bins, self.upper)
+
+    @property
+    def edges(self):
+        width = self.upper / self.bins
+        return [i * width for i in range(self.bins)]
+
+
+class RunningStats:
+    """Count, mean and spread of a stream, merged one batch at a time
+    (Chan et al.'s parallel form of Welford's method)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values):
+        n = len(values)
+        if not n:
+            return
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        delta = mean - self.mean
+        total = self.count + n
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    @property
+    def std(self):
+        return (self.m2 / (self.count - 1)) ** 0.5 if self.count > 1 else 0.0
+
+
+def _select(batch, keep):
+    return {key: values[keep] for key, values in batch.items()}
+
+
+def generate_stage(energy, seed, stats):
+    # pull from an endless generator; the timing covers the drawing only
+    source = events.generate(energy, None, seed)
+    while True:
+        started = time.perf_counter()
+        batch = next(source)
+        n = len(batch["outcome"])
+        stats.record(n, n, time.perf_counter() - started)
+        yield batch
+
+
+def trigger_stage(batches, energy, stats):
+    """Level 1: keep events that throw a lot of energy out sideways. Glancing
+    scatters mostly fail; making a new particle releases energy in every
+    direction, so those mostly pass."""
+    threshold = TRIGGER_FRACTION * energy
+    for batch in batches:
+        started = time.perf_counter()
+        sideways = batch["momentum"] * np.sin(np.radians(batch["angle"]))
+        sideways += 0.6 * (batch["energy"] - batch["momentum"])
+        keep = sideways > threshold
+        out = _select(batch, keep)
+        stats.record(len(keep), len(out["outcome"]), time.perf_counter() - started)
+        yield out
+
+
+def high_level_trigger_stage(batches, energy, seed, stats):
+    """Keep events where most of the energy didn't go into motion, i.e. it
+    made something heavy. A few ordinary events are kept at random too."""
+    rng = np.random.default_rng([seed, 2])
+    threshold = HLT_FRACTION * energy
+    for batch in batches:
+        started = time.perf_counter()
+        n = len(batch["outcome"])
+        keep = (batch["energy"] - batch["momentum"] > threshold) | (rng.random(n) < 1 / PRESCALE)
+        out = _select(batch, keep)
+        stats.record(n, len(out["outcome"]), time.perf_counter() - started)
+        yield out
+
+
+def reconstruct_stage(batches, seed, stats):
+    """Measure what the detector can see: drop events outside the acceptance
+    or lost by the detector, and smear the momentum."""
+    rng = np.random.default_rng([seed, 1])
+    low, high = ACCEPTANCE
+    for batch in batches:
+        started = time.perf_counter()
+        n = len(batch["outcome"])
+        angle = batch["angle"]
+        keep = (angle > low) & (angle < high) & (rng.random(n) < RECO_EFFICIENCY)
+        out = _select(batch, keep)
+        out["measured_momentum"] = out["momentum"] * (
+            1.0 + MOMENTUM_RESOLUTION * rng.standard_normal(len(out["momentum"]))
+        )
+        stats.record(n, len(out["outcome"]), time.perf_counter() - started)
+        yield out
+
+
+class DataTakingRun:
+    def __init__(self, energy, seed=0):
+        self.energy = energy
+        self.seed = seed
+        k = len(events.outcome_ids())
+        self.stages = [
+            StageStats(name)
+            for name in ("Generate", "Level-1 trigger", "High-level trigger", "Reconstruct", "Store")
+        ]
+        self.generated = np.zeros(k, dtype=np.int64)
+        self.recorded = np.zeros(k, dtype=np.int64)
+        self.momentum = FixedHistogram(events.MOMENTUM_BINS, events.MOMENTUM_MAX)
+        self.angle = FixedHistogram(events.ANGLE_BINS, events.ANGLE_MAX)
+        self.momentum_stats = RunningStats()
+
+        generate, trigger, hlt, reconstruct, _ = self.stages
+        source = generate_stage(energy, seed, generate)
+        source = self._count_generated(source)
+        source = trigger_stage(source, energy, trigger)
+        source = high_level_trigger_stage(source, energy, seed, hlt)
+        self._chain = reconstruct_stage(source, seed, reconstruct)
+
+    def _count_generated(self, batches):
+        k = len(self.generated)
+        for batch in batches:
+            self.generated += np.bincount(batch["outcome"], minlength=k)
+            yield batch
+
+    def _store(self, batch):
+        started = time.perf_counter()
+        n = len(batch["outcome"])
+        self.recorded += np.bincount(batch["outcome"], minlength=len(self.recorded))
+        self.momentum.fill(batch["measured_momentum"])
+        self.angle.fill(batch["angle"])
+        self.momentum_stats.update(batch["measured_momentum"])
+        self.stages[-1].record(n, n, time.perf_counter() - started)
+
+    def advance(self, batches=BATCHES_PER_TICK):
+        for _ in range(batches):
+            self._store(next(self._chain))
+
+    @property
+    def events_generated(self):
+        return self.stages[0].events_in
+
+    @property
+    def events_recorded(self):
+        return self.stages[-1].events_out
+
+
+def run_panel(energy):
+    """The Collision Lab's "data-taking run" view. The page runs it in a
+    fragment, so each tick only reruns this panel."""
+    import streamlit as st
+    from scheduler import next_frame, session_scheduler
+
+    st.write(
+        "Real detectors see millions of collisions every second — far too many to keep. "
+        "A **trigger** picks the interesting ones in a split second and the rest are thrown away. "
+        "Start a run and watch the data pile up!"
+    )
+
+    st.session_state.setdefault("datataking_running", False)
+    run = st.session_state.get("datataking_run")
+
+    col1, col2, col3 = st.columns(3)
+    if col1.button("▶ Start run"):
+        if run is None or run.energy != energy:
+            run = st.session_state.datataking_run = DataTakingRun(energy)
+        st.session_state.datataking_running = True
+    if col2.button("⏸ Stop run"):
+        st.session_state.datataking_running = False
+    if col3.button("↩ New run"):
+        st.session_state.datataking_running = False
+        run = st.session_state.datataking_run = None
+
+    if run is None:
+        st.write("Press **Start run** to begin taking data.")
+        return
+
+    scheduler = session_scheduler("datataking", TICK_DELAY, scales_dpi=False)
+    scheduler.tick(st.session_state.datataking_running)
+    if st.session_state.datataking_running:
+        run.advance()
+
+    if run.energy != energy:
+        st.caption(f"This run is at energy {run.energy}. Press **New run** to use the slider's energy.")
+
+    labels = [band["label"] for band in catalog().collisions.payloads]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Collisions", f"{run.events_generated:,}")
+    col2.metric("Kept by the triggers", f"{run.stages[2].events_out:,}")
+    col3.metric("Stored", f"{run.events_recorded:,}")
+
+    st.markdown("**🏭 The data pipeline**")
+    st.table([
+        {
+            "Stage": stage.name,
+            "Events in": f"{stage.events_in:,}",
+            "Events out": f"{stage.events_out:,}",
+            "Thrown away": f"{stage.rejection:.1%}",
+            "Speed (events/s)": f"{stage.throughput:,.0f}",
+        }
+        for stage in run.stages
+    ])
+
+    st.markdown("**🔬 What was made vs. what we kept**")
+    generated = run.generated / max(run.generated.sum(), 1)
+    recorded = run.recorded / max(run.recorded.sum(), 1)
+    st.bar_chart(
+        {
+            "Outcome": labels * 2,
+            "Share (%)": (generated * 100).tolist() + (recorded * 100).tolist(),
+            "Data": ["All collisions"] * len(labels) + ["Stored"] * len(labels),
+        },
+        x="Outcome",
+        y="Share (%)",
+        color="Data",
+        stack=False,
+        sort=False,
+    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**💨 Measured momentum (toy)**")
+        st.bar_chart({"Momentum": run.momentum.edges, "Events": run.momentum.counts.tolist()}, x="Momentum", y="Events")
+        st.caption(
+            f"Mean {run.momentum_stats.mean:.1f} ± {run.momentum_stats.std:.1f} "
+            f"over {run.momentum_stats.count:,} stored events"
+        )
+    with col2:
+        st.markdown("**↗️ Outgoing angle (degrees)**")
+        st.bar_chart({"Angle": run.angle.edges, "Events": run.angle.counts.tolist()}, x="Angle", y="Events")
+
+    if st.session_state.datataking_running:
+        scheduler.wait()
+        next_frame()
@@ -0,0 +1,266 @@
+"""Toy detector event display for the Collision Lab.
+
+A side view of a detector like ATLAS or CMS: the beam runs left to right
+through the middle, the barrel layers are the long lines above and below it
+and the endcaps are the short ones at either end. Every collision sends out
+straight tracks from the crash point; where a track goes through a layer it
+leaves a hit.
+
+The detector itself never changes, so it is drawn once when the figure is
+built and saved as the background (the same blitting trick as renderer.py).
+Each event only draws its tracks, as one ``LineCollection``, and the hit
+heatmap on top. The heatmap is a grid of counts: adding an event bumps the
+cells its hits fall in, so the work is proportional to the new hits, never
+to everything seen so far.
+"""
+
+import io
+import threading
+
+import numpy as np
+
+import events
+
+
+# Detector geometry in toy units; z runs along the beam, y across it
+BARREL_RADII = (0.15, 0.3, 0.5, 0.8, 1.1)
+BARREL_HALF_LENGTH = 1.6
+ENDCAP_Z = (1.8, 2.2, 2.6)
+ENDCAP_R = (0.1, 1.1)
+VIEW = ((-3.0, 3.0), (-1.5, 1.5))
+
+# Heatmap cells along z and y
+HEAT_BINS = (120, 60)
+
+# Tracks per event: a couple from the scatter itself, more the more energy
+# there is, and a lot more when something new was made
+EXTRA_TRACKS = (0.0, 6.0, 25.0)
+SOFT_TRACKS_PER_ENERGY = 0.1
+
+DPI = 100
+FIGSIZE = (8, 4)
+
+
+def _layers():
+    """Every detector layer as ``(kind, position, low, high)``: barrel
+    layers sit at |y| = position for |z| <= high, endcaps at |z| = position
+    for low <= |y| <= high."""
+    barrel = [("barrel", r, 0.0, BARREL_HALF_LENGTH) for r in BARREL_RADII]
+    endcap = [("endcap", z, ENDCAP_R[0], ENDCAP_R[1]) for z in ENDCAP_Z]
+    return barrel + endcap
+
+
+def hits_for_tracks(vz, dz, dy):
+    """Where straight tracks from ``(vz, 0)`` going ``(dz, dy)`` cross the
+    layers. Returns ``(hit_z, hit_y, track_end)``; ``track_end`` is how far
+    along each track its outermost hit is."""
+    layers = _layers()
+    n = len(dz)
+    t = np.full((n, len(layers)), np.inf)
+    for column, (kind, position, low, high) in enumerate(layers):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if kind == "barrel":
+                tt = position / np.abs(dy)
+                z = vz + tt * dz
+                ok = np.abs(z) <= high
+            else:
+                tt = (np.sign(dz) * position - vz) / dz
+                y = tt * dy
+                ok = (tt > 0) & (np.abs(y) >= low) & (np.abs(y) <= high)
+        t[:, column] = np.where(ok, tt, np.inf)
+
+    hit = np.isfinite(t)
+    rows, _ = np.nonzero(hit)
+    hit_t = t[hit]
+    hit_z = vz[rows] + hit_t * dz[rows]
+    hit_y = hit_t * dy[rows]
+
+    reach = np.where(hit, t, 0).max(axis=1)
+    # tracks that slipped down the beam pipe just run to the edge of the view
+    reach = np.where(reach > 0, reach, VIEW[0][1])
+    return hit_z, hit_y, reach
+
+
+class DetectorDisplay:
+    """One session's display: the latest event's tracks plus the heatmap."""
+
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.heat = np.zeros(HEAT_BINS, dtype=np.int64)
+        self.heat_max = 0
+        self.events = 0
+        self.hits = 0
+        self.segments = np.zeros((0, 2, 2))
+        self.outcome = None
+
+    def collide(self, energy, count=1):
+        """Add ``count`` events; the last one's tracks are kept for drawing."""
+        chances = events.smeared_probabilities([energy])[0]
+        for _ in range(count):
+            outcome = int(self.rng.choice(len(chances), p=chances))
+            n = 2 + self.rng.poisson(EXTRA_TRACKS[outcome] + SOFT_TRACKS_PER_ENERGY * energy)
+            angle = self.rng.uniform(0, 2 * np.pi, n)
+            if outcome == 0:
+                # a plain scatter: the two particles glance off along the beam
+                angle[:2] = self.rng.normal(0, 0.15, 2) + np.array([0, np.pi])
+            dz, dy = np.cos(angle), np.sin(angle)
+            vz = np.full(n, self.rng.normal(0, 0.05))
+
+            hit_z, hit_y, reach = hits_for_tracks(vz, dz, dy)
+            self._fill(hit_z, hit_y)
+
+            start = np.column_stack([vz, np.zeros(n)])
+            end = start + np.column_stack([dz, dy]) * reach[:, None]
+            self.segments = np.stack([start, end], axis=1)
+            self.outcome = outcome
+            self.events += 1
+
+    def _fill(self, z, y):
+        (z0, z1), (y0, y1) = VIEW
+        iz = ((z - z0) / (z1 - z0) * HEAT_BINS[0]).astype(np.intp)
+        iy = ((y - y0) / (y1 - y0) * HEAT_BINS[1]).astype(np.intp)
+        inside = (iz >= 0) & (iz < HEAT_BINS[0]) & (iy >= 0) & (iy < HEAT_BINS[1])
+        iz, iy = iz[inside], iy[inside]
+        np.add.at(self.heat, (iz, iy), 1)
+        if len(iz):
+            # only the cells we just touched can have become the new maximum
+            self.heat_max = max(self.heat_max, int(self.heat[iz, iy].max()))
+        self.hits += len(iz)
+
+    def clear(self):
+        self.heat[:] = 0
+        self.heat_max = 0
+        self.events = 0
+        self.hits = 0
+        self.segments = np.zeros((0, 2, 2))
+        self.outcome = None
+
+
+class DetectorRenderer:
+    """Persistent figure with the detector drawn into the saved background;
+    per event only the heatmap image and the track collection are drawn."""
+
+    def __init__(self, dpi=DPI):
+        self.dpi = dpi
+        self._lock = threading.Lock()
+        self._figure = None
+
+    def _build(self):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.collections import LineCollection
+        from matplotlib.colors import LogNorm
+        from matplotlib.figure import Figure
+        from matplotlib.patches import Rectangle
+
+        fig = Figure(figsize=FIGSIZE, dpi=self.dpi, facecolor="#0b1020")
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_axes((0, 0, 1, 1))
+        (z0, z1), (y0, y1) = VIEW
+        ax.set_xlim(z0, z1)
+        ax.set_ylim(y0, y1)
+        ax.axis("off")
+
+        # beam pipe, barrel layers, endcaps
+        ax.add_patch(Rectangle((z0, -0.05), z1 - z0, 0.1, color="#2a3550"))
+        for r in BARREL_RADII:
+            for sign in (1, -1):
+                ax.plot([-BARREL_HALF_LENGTH, BARREL_HALF_LENGTH], [sign * r, sign * r], color="#5a6b8c", linewidth=2)
+        for z in ENDCAP_Z:
+            for zs in (z, -z):
+                for sign in (1, -1):
+                    ax.plot([zs, zs], [sign * ENDCAP_R[0], sign * ENDCAP_R[1]], color="#5a6b8c", linewidth=2)
+
+        # log colors so a cell hit once still shows next to the busy middle
+        self._heat = ax.imshow(
+            np.ma.masked_all(HEAT_BINS[::-1]), extent=(z0, z1, y0, y1), origin="lower",
+            cmap="autumn", norm=LogNorm(1, 2), alpha=0.8, interpolation="nearest",
+            aspect="auto", animated=True,
+        )
+        self._tracks = LineCollection([], colors="#7fdbff", linewidths=1.5, animated=True)
+        ax.add_collection(self._tracks)
+
+        canvas.draw()
+        self._background = canvas.copy_from_bbox(fig.bbox)
+        self._figure = fig
+        self._canvas = canvas
+        self._ax = ax
+
+    def render(self, display):
+        from renderer import figure_opened, figure_used
+
+        with self._lock:
+            built = self._figure is None
+            if built:
+                self._build()
+            png = self._draw(display)
+        if built:
+            figure_opened(self)
+        else:
+            figure_used(self)
+        return png
+
+    def _draw(self, display):
+        from PIL import Image
+
+        canvas = self._canvas
+        canvas.restore_region(self._background)
+        if display.heat_max:
+            self._heat.set_data(np.ma.masked_equal(display.heat.T, 0))
+            self._heat.set_clim(1, max(display.heat_max, 2))
+            self._ax.draw_artist(self._heat)
+        self._tracks.set_segments(display.segments)
+        self._ax.draw_artist(self._tracks)
+        canvas.blit(self._figure.bbox)
+
+        rgba = canvas.buffer_rgba()
+        image = Image.frombuffer("RGBA", (rgba.shape[1], rgba.shape[0]), rgba, "raw", "RGBA", 0, 1)
+        out = io.BytesIO()
+        image.convert("RGB").save(out, format="PNG", compress_level=1)
+        return out.getvalue()
+
+    def close(self):
+        from renderer import figure_closed
+
+        with self._lock:
+            if self._figure is None:
+                return
+            self._figure.clear()
+            self._figure = None
+            self._canvas = None
+            self._ax = None
+            self._background = None
+            self._heat = None
+            self._tracks = None
+        figure_closed(self)
+
+
+def detector_panel(energy):
+    """The Collision Lab's "detector" view."""
+    import streamlit as st
+    from catalog import catalog
+
+    st.write(
+        "This is what scientists see on their screens: a **detector** seen from the side. "
+        "Each line is a particle flying out of the crash, and the detector layers it passes light up. "
+        "The glow builds up over many collisions."
+    )
+
+    display = st.session_state.setdefault("detector_display", DetectorDisplay())
+    renderer = st.session_state.setdefault("detector_renderer", DetectorRenderer())
+
+    col1, col2, col3 = st.columns(3)
+    if col1.button("💥 Collide"):
+        display.collide(energy)
+    if col2.button("⚡ 100 collisions"):
+        display.collide(energy, 100)
+    if col3.button("🧹 Clear"):
+        display.clear()
+
+    st.image(renderer.render(display), width="stretch")
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Collisions", f"{display.events:,}")
+    col2.metric("Detector hits", f"{display.hits:,}")
+    if display.outcome is not None:
+        label = catalog().collisions.payloads[display.outcome]["label"]
+        col3.metric("Last collision", f"{label}, {len(display.segments)} tracks")
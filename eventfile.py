@@ -0,0 +1,267 @@
+"""Recorded collision events, stored in a compact binary file.
+
+A file is a 64-byte header, then one fixed-width 32-byte record per event,
+then an index:
+
+    header   magic, format version, event count, where the index starts, ...
+    records  RECORD (time, energy, momentum, pt, pz, angle, outcome)
+    index    OFFSETS: (outcomes x ENERGY_BINS + 1) uint64 start positions
+             POSITIONS: uint32 record numbers grouped by (outcome, energy bin)
+
+The index is built when the file is closed. Asking for "pions between
+energy 40 and 60" then reads a few slices of POSITIONS instead of scanning
+every record, and counting them only needs OFFSETS.
+
+``EventFile`` opens everything through ``np.memmap``, so the browser page
+can page through, filter and histogram millions of events while only the
+pages it actually touches are read from disk.
+"""
+
+import os
+import struct
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+import events
+
+
+RECORDINGS_DIR = Path(
+    os.environ.get("LITTLE_COLLIDER_RECORDINGS_DIR", Path(__file__).parent / ".cache" / "recordings")
+)
+SUFFIX = ".lcev"
+
+MAGIC = b"LCEV"
+FORMAT_VERSION = 1
+
+# magic, version, outcomes, energy bins, record size, events, index offset,
+# created (unix time), beam energy, seed
+HEADER = struct.Struct("<4sHHHHQQddq")
+HEADER_SIZE = 64
+
+RECORD = np.dtype([
+    ("time", "<f8"),  # seconds since the run started (see the header)
+    ("energy", "<f4"),
+    ("momentum", "<f4"),
+    ("pt", "<f4"),
+    ("pz", "<f4"),
+    ("angle", "<f4"),
+    ("outcome", "u1"),
+    ("_pad", "V3"),
+])
+
+# One index bin per slider step
+ENERGY_BINS = 101
+
+# The LHC's bunches cross every 25 ns; our toy events are one per crossing
+BUNCH_SPACING = 25e-9
+
+# Records read at a time when histogramming a whole file
+CHUNK = 1 << 18
+
+# Recordings kept open between reruns (least recently used are dropped)
+MAX_OPEN_FILES = 8
+
+
+def energy_bin(energy):
+    return np.clip(np.asarray(energy, dtype=np.float64).astype(np.intp), 0, ENERGY_BINS - 1)
+
+
+class EventWriter:
+    """Append batches from ``events.generate`` and write the index on ``close()``.
+
+    Only the 2-byte index key of each event is kept in memory until then.
+    """
+
+    def __init__(self, path, energy=0.0, seed=0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.outcomes = len(events.outcome_ids())
+        self.energy = float(energy)
+        self.seed = int(seed)
+        self.created = time.time()
+        self.count = 0
+        self._keys = []
+        # unique per writer: two sessions can save to the same path at once
+        self._tmp = self.path.with_name(self.path.name + f".{os.getpid()}.{threading.get_ident()}.{uuid.uuid4().hex[:8]}.tmp")
+        self._file = open(self._tmp, "wb")
+        self._file.write(b"\0" * HEADER_SIZE)
+
+    def write(self, batch):
+        n = len(batch["outcome"])
+        records = np.zeros(n, dtype=RECORD)
+        radians = np.radians(batch["angle"])
+        records["time"] = (self.count + np.arange(n)) * BUNCH_SPACING
+        records["energy"] = batch["energy"]
+        records["momentum"] = batch["momentum"]
+        records["pt"] = batch["momentum"] * np.sin(radians)
+        records["pz"] = batch["momentum"] * np.cos(radians)
+        records["angle"] = batch["angle"]
+        records["outcome"] = batch["outcome"]
+        self._file.write(records.tobytes())
+        # bin the float32 energy that is stored, not the float64 one we were
+        # given: near a bin edge the two can land in different bins
+        keys = batch["outcome"].astype(np.uint16) * ENERGY_BINS + energy_bin(records["energy"])
+        self._keys.append(keys.astype(np.uint16))
+        self.count += n
+
+    def close(self):
+        keys = np.concatenate(self._keys) if self._keys else np.zeros(0, dtype=np.uint16)
+        self._keys = []
+        order = np.argsort(keys, kind="stable").astype(np.uint32)
+        counts = np.bincount(keys, minlength=self.outcomes * ENERGY_BINS)
+        offsets = np.zeros(len(counts) + 1, dtype=np.uint64)
+        np.cumsum(counts, out=offsets[1:])
+
+        index_offset = HEADER_SIZE + self.count * RECORD.itemsize
+        self._file.write(offsets.tobytes())
+        self._file.write(order.tobytes())
+        self._file.seek(0)
+        self._file.write(HEADER.pack(
+            MAGIC, FORMAT_VERSION, self.outcomes, ENERGY_BINS, RECORD.itemsize,
+            self.count, index_offset, self.created, self.energy, self.seed,
+        ))
+        self._file.close()
+        os.replace(self._tmp, self.path)
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+            self._tmp.unlink(missing_ok=True)
+
+
+def record(energy, n, seed=0, directory=RECORDINGS_DIR):
+    """Generate ``n`` events and save them. Returns the new file's path."""
+    # the random part keeps two identical runs saved in the same second apart
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-E{energy:g}-n{n}-s{seed}-{uuid.uuid4().hex[:8]}{SUFFIX}"
+    with EventWriter(Path(directory) / name, energy, seed) as writer:
+        for batch in events.generate(energy, n, seed):
+            writer.write(batch)
+    return writer.path
+
+
+def recordings(directory=RECORDINGS_DIR):
+    """Saved files, newest first."""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob(f"*{SUFFIX}"), key=lambda p: p.stat().st_mtime, reverse=True)
+
+
+class EventFile:
+    """A saved file opened through memory maps. Nothing is read up front
+    apart from the header."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{self.path.name}: not an event file")
+        (magic, version, self.outcomes, bins, record_size, self.count, index_offset,
+         self.created, self.energy, self.seed) = HEADER.unpack(header)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{self.path.name}: not an event file (or a newer format)")
+        if bins != ENERGY_BINS or record_size != RECORD.itemsize:
+            raise ValueError(f"{self.path.name}: unexpected record layout")
+
+        keys = self.outcomes * ENERGY_BINS
+        self.records = np.memmap(self.path, dtype=RECORD, mode="r", offset=HEADER_SIZE, shape=(self.count,))
+        self.offsets = np.memmap(self.path, dtype=np.uint64, mode="r", offset=index_offset, shape=(keys + 1,))
+        self.positions = np.memmap(
+            self.path, dtype=np.uint32, mode="r", offset=index_offset + (keys + 1) * 8, shape=(self.count,)
+        )
+
+    def __len__(self):
+        return self.count
+
+    def page(self, start, size):
+        """Records ``start .. start+size`` as a small in-memory array."""
+        return np.array(self.records[start:start + size])
+
+    def _spans(self, outcomes, energy):
+        """Index slices ``(begin, end, edge)`` for the selection. ``edge`` is
+        True for the first/last energy bin, whose records still need checking
+        against the exact energy range."""
+        outcomes = range(self.outcomes) if outcomes is None else outcomes
+        lo, hi = energy if energy is not None else (0, ENERGY_BINS)
+        first, last = int(energy_bin(lo)), int(energy_bin(hi))
+        spans = []
+        for outcome in outcomes:
+            base = outcome * ENERGY_BINS
+            if energy is None:
+                spans.append((int(self.offsets[base]), int(self.offsets[base + ENERGY_BINS]), False))
+                continue
+            for b in (first,) if first == last else (first, last):
+                spans.append((int(self.offsets[base + b]), int(self.offsets[base + b + 1]), True))
+            if last - first > 1:
+                spans.append((int(self.offsets[base + first + 1]), int(self.offsets[base + last]), False))
+        return spans
+
+    def select(self, outcomes=None, energy=None):
+        """Record numbers matching the filter, in file order."""
+        parts = []
+        for begin, end, edge in self._spans(outcomes, energy):
+            positions = np.asarray(self.positions[begin:end])
+            if edge and len(positions):
+                values = self.records["energy"][positions]
+                positions = positions[(values >= energy[0]) & (values <= energy[1])]
+            parts.append(positions)
+        if not parts:
+            return np.zeros(0, dtype=np.uint32)
+        return np.sort(np.concatenate(parts))
+
+    def counts(self, energy=None):
+        """Events per outcome, from the index alone (to the nearest energy bin)."""
+        lo, hi = (0, ENERGY_BINS - 1) if energy is None else (int(energy_bin(energy[0])), int(energy_bin(energy[1])))
+        table = np.diff(np.asarray(self.offsets)).reshape(self.outcomes, ENERGY_BINS)
+        return table[:, lo:hi + 1].sum(axis=1)
+
+    def histogram(self, column, bins, upper, positions=None):
+        """Fixed-bin histogram of ``column`` for all records or ``positions``,
+        read ``CHUNK`` records at a time."""
+        counts = np.zeros(bins, dtype=np.int64)
+        total = self.count if positions is None else len(positions)
+        for start in range(0, total, CHUNK):
+            if positions is None:
+                values = self.records[column][start:start + CHUNK]
+            else:
+                values = self.records[column][positions[start:start + CHUNK]]
+            counts += events.bin_counts(np.asarray(values), bins, upper)
+        return counts
+
+
+_open_files = OrderedDict()
+_open_lock = threading.Lock()
+
+
+def open_recording(path):
+    """``EventFile`` for ``path``, kept open and shared between reruns.
+
+    At most ``MAX_OPEN_FILES`` stay open, and a file that was rewritten
+    replaces its old entry. A dropped file's memory maps are closed as soon
+    as no rerun still holds them (numpy can't unmap an array that's in use).
+    """
+    path = Path(path)
+    key = (path, path.stat().st_mtime_ns)
+    with _open_lock:
+        f = _open_files.get(key)
+        if f is not None:
+            _open_files.move_to_end(key)
+            return f
+        for stale in [k for k in _open_files if k[0] == path]:
+            del _open_files[stale]
+        f = _open_files[key] = EventFile(path)
+        while len(_open_files) > MAX_OPEN_FILES:
+            _open_files.popitem(last=False)
+    return f
@@ -0,0 +1,293 @@
+"""Toy Monte Carlo for the Collision Lab: many collisions at once.
+
+The animation shows one crash with one outcome, picked by hard energy bands.
+Here the bands from the particle catalog become soft: near a cut-off both
+outcomes are possible, and the further past it the more likely the next one
+gets. Every event also gets a toy outgoing angle and momentum.
+
+Events are drawn with NumPy in fixed-size batches, so a million of them take
+a fraction of a second and memory stays at one batch no matter how many are
+asked for. Results only depend on ``(energy, n, seed, batch_size)``.
+"""
+
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from catalog import catalog
+
+
+# Bump when the toy physics below changes (cached results are keyed on it)
+MODEL_VERSION = 1
+
+BATCH_SIZE = 1 << 14
+
+# Beam energy spread, as a fraction of the slider energy
+ENERGY_SPREAD = 0.02
+
+# How soft the outcome bands are, in slider energy units. Around a cut-off
+# the chance of the next outcome goes from ~12% to ~88% over 4 widths.
+THRESHOLD_WIDTH = 6.0
+
+# Nodes used to average the outcome chances over the beam energy spread
+SPREAD_NODES = 16
+
+# Histogram ranges: angle in degrees, momentum in toy GeV/c
+ANGLE_BINS = 36
+ANGLE_MAX = 180.0
+MOMENTUM_BINS = 55
+MOMENTUM_MAX = 110.0
+
+
+def outcome_ids():
+    return tuple(band["id"] for band in catalog().collisions.payloads)
+
+
+def _cutoffs():
+    return np.asarray(catalog().collisions.cutoffs)
+
+
+def _reach(energy, cutoffs):
+    """Chance of getting past each cut-off, shape ``energy.shape + (k,)``."""
+    energy = np.asarray(energy, dtype=np.float64)
+    return 1.0 / (1.0 + np.exp(-(energy[..., None] - cutoffs) / THRESHOLD_WIDTH))
+
+
+def outcome_probabilities(energy):
+    """Probability of each outcome (in catalog order) at ``energy``.
+
+    Works on a scalar or an array of energies; the outcomes are the last axis.
+    """
+    reach = _reach(energy, _cutoffs())
+    ones = np.ones(reach.shape[:-1] + (1,))
+    zeros = np.zeros(reach.shape[:-1] + (1,))
+    survive = np.concatenate([ones, reach, zeros], axis=-1)
+    return survive[..., :-1] - survive[..., 1:]
+
+
+def smeared_probabilities(energies):
+    """``outcome_probabilities`` averaged over the beam energy spread, which is
+    what ``generate`` actually draws from. Shape ``(len(energies), k)``."""
+    nodes, weights = np.polynomial.hermite_e.hermegauss(SPREAD_NODES)
+    weights = weights / weights.sum()
+    e = np.asarray(energies, dtype=np.float64)[:, None] * (1.0 + ENERGY_SPREAD * nodes)
+    np.maximum(e, 0.0, out=e)
+    return np.einsum("enk,n->ek", outcome_probabilities(e), weights)
+
+
+def generate(energy, n, seed=0, batch_size=BATCH_SIZE):
+    """Yield batches of events as dicts of arrays:
+    ``energy``, ``outcome`` (index into ``outcome_ids()``), ``angle`` (degrees)
+    and ``momentum``. ``n=None`` keeps going forever."""
+    rng = np.random.default_rng(seed)
+    cutoffs = _cutoffs()
+    left = n
+    while left is None or left > 0:
+        size = batch_size if left is None else min(batch_size, left)
+        if left is not None:
+            left -= size
+
+        e = energy * (1.0 + ENERGY_SPREAD * rng.standard_normal(size))
+        np.maximum(e, 0.0, out=e)
+        outcome = (rng.random(size)[:, None] < _reach(e, cutoffs)).sum(axis=1, dtype=np.int8)
+
+        # Scatters keep going mostly forward, the lower the energy the wider
+        # they spread; new particles fly out in any direction.
+        forward = rng.standard_exponential(size) * (8.0 / (e + 10.0))
+        isotropic = np.arccos(rng.uniform(-1.0, 1.0, size))
+        angle = np.degrees(np.where(outcome == 0, np.minimum(forward, np.pi), isotropic))
+
+        # Share of the energy carried away: almost all for a scatter, less
+        # the heavier the thing that was made
+        u = rng.random(size)
+        share = np.where(outcome == 0, 0.9 + 0.1 * u, np.where(outcome == 1, 0.2 + 0.6 * u, 0.3 * u))
+        yield {"energy": e, "outcome": outcome, "angle": angle, "momentum": e * share}
+
+
+def bin_counts(values, bins, upper):
+    """Counts in ``bins`` equal bins over ``[0, upper)``; overflow goes in the last bin."""
+    index = (values * (bins / upper)).astype(np.intp)
+    np.clip(index, 0, bins - 1, out=index)
+    return np.bincount(index, minlength=bins)
+
+
+@dataclass(frozen=True)
+class EventSummary:
+    energy: float
+    events: int
+    seed: int
+    counts: np.ndarray
+    angle_hist: np.ndarray
+    momentum_hist: np.ndarray
+    seconds: float
+
+    @property
+    def fractions(self):
+        return self.counts / max(self.events, 1)
+
+    @property
+    def events_per_second(self):
+        return self.events / self.seconds if self.seconds else float("inf")
+
+
+def simulate(energy, n, seed=0, batch_size=BATCH_SIZE):
+    """Generate ``n`` events and return only their histograms."""
+    started = time.perf_counter()
+    k = len(outcome_ids())
+    counts = np.zeros(k, dtype=np.int64)
+    angle_hist = np.zeros(ANGLE_BINS, dtype=np.int64)
+    momentum_hist = np.zeros(MOMENTUM_BINS, dtype=np.int64)
+    for batch in generate(energy, n, seed, batch_size):
+        counts += np.bincount(batch["outcome"], minlength=k)
+        angle_hist += bin_counts(batch["angle"], ANGLE_BINS, ANGLE_MAX)
+        momentum_hist += bin_counts(batch["momentum"], MOMENTUM_BINS, MOMENTUM_MAX)
+    return EventSummary(
+        energy, n, seed, counts, angle_hist, momentum_hist, time.perf_counter() - started
+    )
+
+
+@lru_cache(maxsize=64)
+def _cached(energy, n, seed, batch_size, version, catalog_version):
+    return simulate(energy, n, seed, batch_size)
+
+
+def cached_simulation(energy, n, seed=0, batch_size=BATCH_SIZE):
+    """``simulate`` memoized for the page, per model and catalog version;
+    every student asking for the same energy and seed gets the same
+    (shared) result."""
+    return _cached(energy, n, seed, batch_size, MODEL_VERSION, catalog().version)
+
+
+@dataclass(frozen=True)
+class Sweep:
+    """Outcome chances for every energy on a grid over the slider range."""
+
+    energies: np.ndarray
+    probabilities: np.ndarray
+    seconds: float
+
+    @property
+    def most_likely(self):
+        return self.probabilities.argmax(axis=1)
+
+    def crossovers(self):
+        """``(energy, outcome index)`` wherever the most likely outcome changes."""
+        winner = self.most_likely
+        changes = np.flatnonzero(winner[1:] != winner[:-1]) + 1
+        return [(float(self.energies[i]), int(winner[i])) for i in changes]
+
+
+@lru_cache(maxsize=8)
+def _sweep(step, version, catalog_version):
+    started = time.perf_counter()
+    energies = np.linspace(0.0, 100.0, int(round(100 / step)) + 1)
+    probabilities = smeared_probabilities(energies)
+    return Sweep(energies, probabilities, time.perf_counter() - started)
+
+
+def energy_sweep(step=1.0):
+    """The outcome model over 0..100 in one pass. Memoized per model and
+    catalog version, so after the first student it costs nothing."""
+    return _sweep(float(step), MODEL_VERSION, catalog().version)
+
+
+def events_panel(energy):
+    """The Collision Lab's "many collisions" view."""
+    import streamlit as st
+
+    st.write(
+        "Real collisions are random: the same energy can give different results. "
+        "Here we smash lots of particles together at once and count what comes out."
+    )
+    col1, col2 = st.columns([3, 1])
+    n = col1.select_slider(
+        "🎲 How many collisions?",
+        options=[1_000, 10_000, 100_000, 1_000_000],
+        value=10_000,
+        format_func=lambda v: f"{v:,}",
+    )
+    seed = col2.number_input("Seed", min_value=0, value=0, step=1, help="Same seed = same results")
+
+    summary = cached_simulation(float(energy), int(n), int(seed))
+    bands = catalog().collisions.payloads
+    labels = [band["label"] for band in bands]
+
+    st.subheader("📊 What came out")
+    st.bar_chart(
+        {"Outcome": labels, "Collisions": summary.counts.tolist()},
+        x="Outcome",
+        y="Collisions",
+        sort=False,
+    )
+    cols = st.columns(len(labels))
+    for col, label, fraction in zip(cols, labels, summary.fractions):
+        col.metric(label, f"{fraction:.1%}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**↗️ Outgoing angle (degrees)**")
+        width = ANGLE_MAX / ANGLE_BINS
+        st.bar_chart(
+            {"Angle": [i * width for i in range(ANGLE_BINS)], "Collisions": summary.angle_hist.tolist()},
+            x="Angle",
+            y="Collisions",
+        )
+    with col2:
+        st.markdown("**💨 Outgoing momentum (toy)**")
+        width = MOMENTUM_MAX / MOMENTUM_BINS
+        st.bar_chart(
+            {"Momentum": [i * width for i in range(MOMENTUM_BINS)], "Collisions": summary.momentum_hist.tolist()},
+            x="Momentum",
+            y="Collisions",
+        )
+
+    st.caption(
+        f"{summary.events:,} toy collisions generated in {summary.seconds * 1000:.0f} ms "
+        f"({summary.events_per_second / 1e6:.1f} million per second)."
+    )
+
+    if st.button("💾 Save these collisions"):
+        from eventfile import record
+
+        path = record(energy, int(n), int(seed))
+        st.success(f"Saved {n:,} collisions as `{path.name}`. Open the **Event Browser** to look through them.")
+
+
+def sweep_panel(energy):
+    """The Collision Lab's "every energy" view."""
+    import streamlit as st
+
+    st.write(
+        "What happens at every energy? Instead of trying the slider 101 times, "
+        "this chart shows the chance of each outcome for all energies at once."
+    )
+    step = st.select_slider(
+        "🔎 Energy step",
+        options=[5.0, 1.0, 0.5, 0.1],
+        value=1.0,
+        help="Smaller steps = a finer chart",
+    )
+
+    sweep = energy_sweep(step)
+    labels = [band["label"] for band in catalog().collisions.payloads]
+
+    data = {"Energy": sweep.energies.tolist()}
+    for i, label in enumerate(labels):
+        data[label] = (sweep.probabilities[:, i] * 100).tolist()
+    st.area_chart(data, x="Energy", y=labels, y_label="Chance (%)", stack=True)
+
+    st.markdown(f"**At energy {energy}:**")
+    here = smeared_probabilities([energy])[0]
+    cols = st.columns(len(labels))
+    for col, label, chance in zip(cols, labels, here):
+        col.metric(label, f"{chance:.1%}")
+
+    for at, winner in sweep.crossovers():
+        st.write(f"➡️ From about energy **{at:g}**, **{labels[winner]}** is the most likely outcome.")
+
+    st.caption(
+        f"{len(sweep.energies):,} energies computed in one go "
+        f"({sweep.seconds * 1000:.1f} ms, shared by everyone using the app)."
+    )
@@ -0,0 +1,117 @@
+"""Process-wide cache of encoded animation frames.
+
+A frame only depends on the page, the particle positions and whether the
+flash is showing, and the positions come from the same speed formula for
+everybody. So students running the same energy draw the very same PNGs, and
+after the first run every frame can come straight from here without touching
+matplotlib.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+# Total size of the cached PNGs. A frame is roughly 10 KB, so this keeps a
+# few thousand frames (dozens of complete runs).
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class FrameCache:
+    """Thread-safe LRU cache of encoded frames, bounded by total size."""
+
+    def __init__(self, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._frames = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            data = self._frames.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._frames.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._frames.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._frames[key] = data
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                _, dropped = self._frames.popitem(last=False)
+                self._bytes -= len(dropped)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._frames),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+frame_cache = FrameCache()
+
+
+def frame_key(page, xs, flash, backend, dpi):
+    # Rounding to 1e-4 of the axes width is far below a pixel and makes
+    # float noise from slightly different histories land on the same frame.
+    # Vector frames are the same at every DPI, so the DPI isn't part of theirs.
+    from renderer import uses_dpi
+
+    if not uses_dpi(backend):
+        dpi = None
+    return (page, tuple(round(x, 4) for x in xs), bool(flash), backend, dpi)
+
+
+def cached_frame(page, xs, flash=False, dpi=None, wait=None):
+    """One encoded frame (PNG bytes, or an SVG string with the svg backend),
+    from the cache or drawn by this session's renderer. ``dpi`` defaults to
+    the renderer's own, and is ignored by resolution-independent backends.
+
+    PNG frames are drawn in the shared render pool when there is one. With
+    ``wait`` (seconds) a slow pool may hand back this session's previous
+    frame instead; leave it out when the exact frame matters (the last one)."""
+    from prewarm import first_render
+    from render_pool import pooled_frame, session_id, shared_pool
+    from renderer import BACKEND, DPI, session_renderer, uses_dpi
+
+    dpi = (dpi or DPI) if uses_dpi(BACKEND) else DPI
+    key = frame_key(page, xs, flash, BACKEND, dpi)
+    data = frame_cache.get(key)
+    if data is not None:
+        return data
+
+    # draw the rounded positions so the cached frame is exactly the key
+    def draw_here():
+        started = time.perf_counter()
+        data = session_renderer(page, dpi=dpi).render(key[1], flash)
+        first_render((page, BACKEND, dpi), started, time.perf_counter() - started)
+        frame_cache.put(key, data)
+        return data
+
+    pool = shared_pool(BACKEND)
+    if pool is not None:
+        return pooled_frame(pool, session_id(), key, (page, key[1], flash, BACKEND, dpi), draw_here, wait)
+    return draw_here()
@@ -0,0 +1,8 @@
+"""The About CERN page."""
+
+
+def about_cern_page():
+    from content import show_section
+
+    # All static text, see data/content/about_cern.md
+    show_section("about_cern", "page")
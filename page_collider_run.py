@@ -0,0 +1,164 @@
+"""The Collider Run page: one particle racing along the beam, or the LHC ring."""
+
+import streamlit as st
+
+
+def collider_run_page():
+    import animation
+    from browser_player import browser_player
+    from clips import clip_player
+
+    
+    # Title & intro
+    
+    st.title("🚀 Collider Run")
+    st.write(
+        "Watch a particle zoom along a collider beam! "
+        "In this toy model, higher energy makes the particle move faster on screen. "
+        "In real colliders, energy is also used to create heavier particles."
+    )
+    st.caption("This is a toy model for learning about particle motion.")
+
+    
+    # Controls
+    
+    energy = st.slider(
+        "⚡ Beam Energy",
+        min_value=0,
+        max_value=100,
+        value=30,
+        step=1
+    )
+
+    st.markdown(f"**Beam Speed (toy):** `{animation.collider_run_speed(energy):.3f}`")
+
+    track = st.radio(
+        "Track",
+        ["line", "ring"],
+        format_func={"line": "➖ Straight track", "ring": "⭕ LHC ring"}.get,
+        horizontal=True,
+        key="collider_run_track",
+    )
+
+    # The ring: two beams of bunches crossing at the four experiments
+    if track == "ring":
+        ring_live(energy)
+        return
+
+    mode = st.radio(
+        "Animation mode",
+        list(animation.MODES),
+        format_func=animation.MODES.get,
+        horizontal=True,
+        key="collider_run_mode",
+    )
+
+    # Smooth mode: the whole run is sent once and animates in the browser,
+    # so Start/Stop/Reset don't rerun the app at all
+    if mode == "browser":
+        browser_player(animation.COLLIDER_RUN, energy)
+        return
+
+    # Movie clip: the run was rendered ahead of time, one rerun plays it
+    if mode == "clip":
+        clip_player(animation.COLLIDER_RUN, energy)
+        return
+
+    collider_run_live(energy)
+
+
+@st.fragment
+def ring_live(energy):
+    """The LHC ring view, rerunning on its own every frame."""
+    from ring import ring_panel
+
+    ring_panel(energy)
+
+
+@st.fragment
+def collider_run_live(energy):
+    """Collider Run's classic animation. It reruns on its own every frame,
+    so a frame doesn't redo the sidebar, the intro or the controls above."""
+    import animation
+    import renderer
+    from frame_cache import cached_frame
+    from render_pool import shared_pool
+    from scheduler import next_frame, session_scheduler
+
+    col1, col2, col3 = st.columns([1, 1, 2], gap="small")
+
+    
+    # Session state initialization
+    
+    st.session_state.setdefault("running", False)
+    st.session_state.setdefault("x_pos", animation.COLLIDER_RUN_START)
+    st.session_state.setdefault("completed", False)
+
+    
+    # Buttons
+    
+    if col1.button("▶ Start"):
+        st.session_state.running = True
+        st.session_state.completed = False
+
+    if col2.button("⏹ Stop"):
+        st.session_state.running = False
+
+    if col3.button("↩ Reset"):
+        st.session_state.x_pos = animation.COLLIDER_RUN_START
+        st.session_state.running = False
+        st.session_state.completed = False
+
+    
+    # Speed calculation
+    
+    speed = animation.collider_run_speed(energy)
+
+    
+    # Update position
+    
+    # The step follows the clock, so a slow server shows fewer frames
+    # instead of a slower particle
+    scheduler = session_scheduler(animation.COLLIDER_RUN, scales_dpi=renderer.uses_dpi())
+    frames = scheduler.tick(st.session_state.running)
+    if frames:
+        st.session_state.x_pos, completed = animation.step_collider_run(
+            st.session_state.x_pos, speed * frames
+        )
+        if completed:
+            st.session_state.running = False
+            st.session_state.completed = True
+
+    
+    # Draw particle + beam
+    
+    # Frames are shared between sessions; on a miss the session's renderer
+    # moves the particle on its persistent figure
+    with scheduler.drawing():
+        frame = cached_frame(
+            animation.COLLIDER_RUN, (st.session_state.x_pos,), flash=st.session_state.completed,
+            dpi=round(renderer.DPI * scheduler.dpi_scale),
+            wait=scheduler.interval if st.session_state.running else None,
+        )
+        st.image(frame, width="stretch")
+    if scheduler.frames:
+        st.caption(scheduler.report())
+        pool = shared_pool(renderer.BACKEND)
+        if pool is not None:
+            st.caption(pool.report())
+
+    
+    # Result 
+    
+    if st.session_state.completed:
+        st.success("🎉 Particle reached the end! Well done!")
+        st.balloons()
+    else:
+        st.info("Press **Start** to see the particle zoom across the beam!")
+
+    
+    # Smooth animation loop
+    
+    if st.session_state.running:
+        scheduler.wait()
+        next_frame()
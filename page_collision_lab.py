@@ -0,0 +1,220 @@
+"""The Collision Lab page: two beams colliding, and the views built on it."""
+
+import streamlit as st
+
+
+def collision_lab_page():
+    import animation
+    from browser_player import browser_player
+    from clips import clip_player
+    from detector import detector_panel
+    from events import events_panel, sweep_panel
+
+    
+    # Title & intro
+    
+    st.title("💥 Collision Lab")
+    st.write("Two particle beams race toward each other and collide at the center.")
+    st.caption(
+    "In this toy model, higher energy makes the particles move faster on screen. "
+    "In real colliders, energy is also used to create heavier particles."
+)
+
+    st.write(
+    "In this lab, you control how much energy the particles have when they crash. "
+    "Watch what happens when they collide — sometimes they bounce, sometimes they create new particles! "
+    "It’s a safe way to explore how tiny particles behave in a collider."
+)
+
+    st.write("🎯 Try different energies and see what happens when particles collide!")
+
+    
+    # Controls
+    
+    energy = st.slider(
+        "⚡ Collision Energy",
+        min_value=0,
+        max_value=100,
+        value=40,
+        step=1
+    )
+
+    st.caption("Higher energy → faster motion and more exciting outcomes (toy logic).")
+
+    view = st.radio(
+        "Lab view",
+        ["one", "detector", "shower", "many", "sweep", "run"],
+        format_func={
+            "one": "💥 One collision",
+            "detector": "🔭 Detector",
+            "shower": "✨ Particle shower",
+            "many": "🎲 Many collisions",
+            "sweep": "📈 Every energy",
+            "run": "📡 Data-taking run",
+        }.get,
+        horizontal=True,
+        key="collision_lab_view",
+    )
+
+    # Detector: what the crash looks like to a real experiment
+    if view == "detector":
+        detector_panel(energy)
+        return
+
+    # Particle shower: thousands of daughters from one crash
+    if view == "shower":
+        shower_live(energy)
+        return
+
+    # Many collisions: a toy Monte Carlo, no animation
+    if view == "many":
+        events_panel(energy)
+        return
+
+    # Every energy: the outcome chances over the whole slider range
+    if view == "sweep":
+        sweep_panel(energy)
+        return
+
+    # Data-taking run: a trigger and detector keep the interesting events
+    if view == "run":
+        datataking_live(energy)
+        return
+
+    mode = st.radio(
+        "Animation mode",
+        list(animation.MODES),
+        format_func=animation.MODES.get,
+        horizontal=True,
+        key="collision_lab_mode",
+    )
+
+    # Smooth mode: the whole run (and its result) is sent once and
+    # animates in the browser
+    if mode == "browser":
+        st.markdown(f"**🚀 Beam Speed (toy):** `{animation.collision_lab_speed(energy):.4f}`")
+        browser_player(animation.COLLISION_LAB, energy)
+        return
+
+    # Movie clip: the run was rendered ahead of time, one rerun plays it
+    if mode == "clip":
+        st.markdown(f"**🚀 Beam Speed (toy):** `{animation.collision_lab_speed(energy):.4f}`")
+        clip_player(animation.COLLISION_LAB, energy)
+        return
+
+    collision_lab_live(energy)
+
+
+@st.fragment
+def shower_live(energy):
+    """The particle shower view, rerunning on its own every frame."""
+    from shower import shower_panel
+
+    shower_panel(energy)
+
+
+@st.fragment
+def datataking_live(energy):
+    """The data-taking run view, rerunning on its own every tick."""
+    from datataking import run_panel
+
+    run_panel(energy)
+
+
+@st.fragment
+def collision_lab_live(energy):
+    """Collision Lab's classic animation, rerunning on its own like
+    ``collider_run_live``."""
+    import animation
+    import renderer
+    from frame_cache import cached_frame
+    from render_pool import shared_pool
+    from scheduler import next_frame, session_scheduler
+
+    col1, col2, col3 = st.columns(3)
+
+    
+    # Session state initialization
+    
+    st.session_state.setdefault("running", False)
+    st.session_state.setdefault("x_left", animation.COLLISION_LAB_START[0])
+    st.session_state.setdefault("x_right", animation.COLLISION_LAB_START[1])
+    st.session_state.setdefault("collided", False)
+    st.session_state.setdefault("celebrated", False)
+
+    
+    # Buttons
+    
+    if col1.button("▶ Start"):
+        st.session_state.running = True
+
+    if col2.button("⏸ Stop"):
+        st.session_state.running = False
+
+    if col3.button("↩ Reset"):
+        st.session_state.running = False
+        st.session_state.x_left, st.session_state.x_right = animation.COLLISION_LAB_START
+        st.session_state.collided = False
+        st.session_state.celebrated = False
+
+    
+    # Speed calculation 
+    
+    speed = animation.collision_lab_speed(energy)
+    st.markdown(f"**🚀 Beam Speed (toy):** `{speed:.4f}`")
+
+    
+    # Motion update + collision detection
+    
+    scheduler = session_scheduler(animation.COLLISION_LAB, scales_dpi=renderer.uses_dpi())
+    frames = scheduler.tick(st.session_state.running and not st.session_state.collided)
+    if frames:
+        st.session_state.x_left, st.session_state.x_right, collided = animation.step_collision_lab(
+            st.session_state.x_left, st.session_state.x_right, speed * frames
+        )
+        if collided:
+            st.session_state.collided = True
+            st.session_state.running = False
+
+    
+    # Drawing area
+    
+    # Particles move, the beam line stays put; the flash shows after the crash
+    with scheduler.drawing():
+        frame = cached_frame(
+            animation.COLLISION_LAB,
+            (st.session_state.x_left, st.session_state.x_right),
+            flash=st.session_state.collided,
+            dpi=round(renderer.DPI * scheduler.dpi_scale),
+            wait=scheduler.interval if st.session_state.running else None,
+        )
+        st.image(frame, width="stretch")
+    if scheduler.frames:
+        st.caption(scheduler.report())
+        pool = shared_pool(renderer.BACKEND)
+        if pool is not None:
+            st.caption(pool.report())
+
+    
+    # Collision result
+    
+    st.markdown("---")
+    st.subheader("🧪 Collision Result")
+
+    if st.session_state.collided:
+        if not st.session_state.celebrated:
+            st.balloons()
+            st.session_state.celebrated = True
+
+        outcome = animation.OUTCOMES[animation.collision_outcome(energy)]
+        getattr(st, outcome["style"])(outcome["title"])
+        st.write(outcome["text"])
+    else:
+        st.write("Press **Start** to begin the collision.")
+
+    
+    # Smooth animation loop
+    
+    if st.session_state.running:
+        scheduler.wait()
+        next_frame()
@@ -0,0 +1,98 @@
+"""The Energy Explorer page: particle cards along the energy slider."""
+
+
+def energy_explorer_page():
+    import streamlit as st
+    from asset_registry import registry
+    from particle_cards import circle_size, explorer_html, particle_for_energy
+
+    st.title("Energy Explorer")
+    st.write(
+        "Move the slider to give particles a push! ⚡ Watch what appears and learn about it."
+    )
+
+    # Instant mode: all five cards go to the browser once and the slider
+    # switches between them there, without rerunning the app
+    if st.toggle("⚡ Instant slider (runs in my browser)", value=True, key="explorer_instant"):
+        st.iframe(explorer_html(), height="content")
+        return
+
+    # 3 columns: slider , info , image
+    col_slider, col_info, col_img = st.columns([1.2, 1.6, 1.2], gap="small")
+
+    # image loader (the image column is roughly 360px wide)
+    def show_particle_image(path_str: str, caption: str):
+        data = registry.image_source(path_str, 360)
+        if data is not None:
+            st.image(data, caption=caption, width="stretch")
+        else:
+            st.warning(f"Image not found: `{path_str}`")
+            st.caption("Tip: Check your assets folder filenames.")
+
+   
+    # Slider / Energy input
+    
+    with col_slider:
+        st.subheader("Energy Slider")
+        energy = st.slider("How much energy to give the particle?", 0, 100, 20, 1)
+
+        st.info(
+            "Think of this like a particle race! 🏎️💨\n"
+            "Particles are already inside the collider. "
+            "The slider shows how much energy we give them to zoom. "
+            "Low energy lets tiny, common particles appear (like photons). "
+            "High energy can reveal heavier or rarer particles. "
+           
+        )
+
+   
+    # Determine particle based on energy
+    
+    card = particle_for_energy(energy)
+    particle = card["name"]
+    mass_level = card["mass"]
+    rarity = card["rarity"]
+    meaning = card["meaning"]
+    img_path = card["image"]
+    color = card["color"]
+
+    
+    # Visual circle for fun
+    
+    with col_slider:
+        st.markdown("**Particle Visual:**")
+        size_px = circle_size(energy)  # 40px -> 150px
+
+        st.markdown(
+            f"""
+            <div style="
+                width:{size_px}px;
+                height:{size_px}px;
+                background:{color};
+                border-radius:50%;
+                margin-top:10px;
+                margin-bottom:6px;
+            "></div>
+            """,
+            unsafe_allow_html=True
+        )
+        st.caption(
+            "Energy is like a push. The circle shows which particle appears — bigger = rarer!"
+        )
+
+    # Info column
+    
+    with col_info:
+        st.subheader("Particle Info")
+        st.markdown(f"**Energy level:** {energy}/100")
+        st.markdown(f"**Particle:** {particle}")
+        st.markdown(f"**Mass level:** {mass_level}")
+        st.markdown(f"**Rarity:** {rarity}")
+        st.info(meaning)
+
+
+    # Image column
+    
+    with col_img:
+        st.subheader("Particle Image")
+        show_particle_image(img_path, particle)
@@ -0,0 +1,89 @@
+"""The Event Browser page: paging through saved collision files."""
+
+
+def event_browser_page():
+    import streamlit as st
+    import time
+    import numpy as np
+    import events
+    from catalog import catalog
+    from eventfile import open_recording, recordings
+
+    st.title("🗂️ Event Browser")
+    st.write(
+        "Scientists save their collisions and look through them later. "
+        "Here you can dig through the collisions you saved in the Collision Lab."
+    )
+
+    files = recordings()
+    if not files:
+        st.info("No saved collisions yet. In the **Collision Lab**, pick **🎲 Many collisions** and press **💾 Save**.")
+        return
+
+    path = st.selectbox("📁 Saved run", files, format_func=lambda p: p.name)
+    f = open_recording(path)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Collisions", f"{len(f):,}")
+    col2.metric("Beam energy", f"{f.energy:g}")
+    col3.metric("File size", f"{path.stat().st_size / 1e6:.1f} MB")
+    col4.metric("Saved", time.strftime("%H:%M %d %b", time.localtime(f.created)))
+
+    
+    # Filters (answered from the file's index)
+    
+    labels = [band["label"] for band in catalog().collisions.payloads]
+    col1, col2 = st.columns(2)
+    picked = col1.multiselect("Outcome", labels, default=labels)
+    low, high = col2.slider("Energy range", 0.0, 110.0, (0.0, 110.0), 0.5)
+
+    outcomes = [labels.index(label) for label in picked]
+    if len(outcomes) == len(labels) and (low, high) == (0.0, 110.0):
+        positions = None
+        matches = len(f)
+    else:
+        positions = f.select(outcomes, (low, high))
+        matches = len(positions)
+    st.markdown(f"**{matches:,}** collisions match.")
+
+    
+    # Histogram of the selection
+    
+    columns = {
+        "momentum": ("💨 Momentum", events.MOMENTUM_BINS, events.MOMENTUM_MAX),
+        "pt": ("↔️ Sideways momentum", events.MOMENTUM_BINS, events.MOMENTUM_MAX),
+        "angle": ("↗️ Angle (degrees)", events.ANGLE_BINS, events.ANGLE_MAX),
+    }
+    column = st.radio("Histogram of", list(columns), format_func=lambda c: columns[c][0], horizontal=True)
+    title, bins, upper = columns[column]
+    counts = f.histogram(column, bins, upper, positions)
+    width = upper / bins
+    st.bar_chart({title: [i * width for i in range(bins)], "Collisions": counts.tolist()}, x=title, y="Collisions")
+
+    
+    # Page through the collisions
+    
+    rows = 50
+    pages = max(1, -(-matches // rows))
+    number = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, step=1)
+    start = (number - 1) * rows
+    if positions is None:
+        page = f.page(start, rows)
+        first = np.arange(start, start + len(page))
+    else:
+        first = positions[start:start + rows]
+        page = np.array(f.records[first])
+    st.dataframe(
+        {
+            "#": first.tolist(),
+            "Time (µs)": (page["time"] * 1e6).round(3).tolist(),
+            "Outcome": [labels[o] for o in page["outcome"]],
+            "Energy": page["energy"].astype(float).round(2).tolist(),
+            "Momentum": page["momentum"].astype(float).round(2).tolist(),
+            "Sideways": page["pt"].astype(float).round(2).tolist(),
+            "Along beam": page["pz"].astype(float).round(2).tolist(),
+            "Angle": page["angle"].astype(float).round(1).tolist(),
+        },
+        hide_index=True,
+    )
+    st.caption("Only the part of the file you are looking at is read from disk, so even huge runs open instantly.")
@@ -0,0 +1,14 @@
+"""The Home page."""
+
+
+def home_page():
+    import streamlit as st
+    from content import show_section
+
+    # Title, welcome note and what kids will do (data/content/home.md)
+    show_section("home", "intro")
+
+    # Start button
+    if st.button("🚀 Start Exploring"):
+        st.success("Open the menu on the left and begin your science adventure!")
+    show_section("home", "footer")
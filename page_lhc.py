@@ -0,0 +1,43 @@
+"""The About the LHC page."""
+
+
+def lhc_page():
+    import streamlit as st
+    from asset_registry import registry
+    from content import show_section
+
+    # Text lives in data/content/lhc.md; the pictures go in between
+    show_section("lhc", "intro")
+
+    map_img = registry.image_source("assets/lhs1.png", 1200)
+    if map_img is not None:
+        st.image(map_img, caption="Map of the LHC tunnel (not to scale)", width="stretch")
+    else:
+        st.warning("LHC map image not found (lhs1).")
+
+    show_section("lhc", "middle")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        img = registry.image_source("assets/lhs2.png", 400)
+        if img is not None:
+            st.image(img, caption="Taking a closer look at LHC", width="stretch")
+        else:
+            st.warning("Image lhs2 not found.")
+
+    with col2:
+        img = registry.image_source("assets/lhs3.png", 400)
+        if img is not None:
+            st.image(img, caption="LHC tunnel underground", width="stretch")
+        else:
+            st.warning("Image lhs3 not found.")
+
+    with col3:
+        img = registry.image_source("assets/lhs5.png", 400)
+        if img is not None:
+            st.image(img, caption="Scientists working at the LHC",width="stretch")
+        else:
+            st.warning("Image lhs5 not found.")
+
+    show_section("lhc", "wrap-up")
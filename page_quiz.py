@@ -0,0 +1,99 @@
+"""The Quiz page: a fresh quiz from the question bank for every student."""
+
+QUIZ_LENGTH = 7
+
+
+def quiz_page():
+    import time
+    import uuid
+
+    import streamlit as st
+    from quiz import DIFFICULTIES, quiz_bank
+    from quiz_results import record_result, shared_writer
+
+    bank = quiz_bank()
+
+    st.title("🧠 Quiz: Junior Collider Scientist")
+
+    # Settings only count when "New quiz" is pressed, so changing them
+    # doesn't rerun anything
+    with st.expander("⚙️ Quiz settings"):
+        with st.form("quiz_settings", border=False):
+            topics = st.multiselect(
+                "Topics", bank.topic_ids, default=bank.topic_ids,
+                format_func=lambda t: bank.topic_labels[bank.topic_ids.index(t)],
+            )
+            level = st.radio("Difficulty", ["Mixed", *DIFFICULTIES.values()], horizontal=True)
+            length = st.select_slider("Questions", [5, 7, 10, 15], value=QUIZ_LENGTH)
+            new_quiz = st.form_submit_button("🔄 New quiz")
+
+    quiz = st.session_state.get("quiz")
+    if quiz is None or new_quiz:
+        difficulties = None if level == "Mixed" else [d for d, name in DIFFICULTIES.items() if name == level]
+        questions = bank.sample(length, topics or None, difficulties)
+        quiz = st.session_state["quiz"] = {
+            "questions": questions,
+            "round": quiz["round"] + 1 if quiz else 0,
+            "started": time.time(),
+        }
+    questions = quiz["questions"]
+
+    st.caption(f"{len(questions)} questions • No time limit • Just for learning "
+               f"• Picked from {len(bank):,} questions ({bank.written} written by hand, the rest "
+               f"made from {bank.generated_templates} question templates)")
+    st.write("Answer the questions below and see how much you’ve learned!")
+    st.info("Tip: Read carefully. Some questions test honesty in science outreach.")
+
+    if not questions:
+        st.warning("No questions match those settings — try more topics or another difficulty.")
+        return
+
+    # All answers stay in the browser until Submit, which sends them in one go
+    with st.form(f"quiz_{quiz['round']}"):
+        picks = []
+        for n, q in enumerate(questions, 1):
+            options = bank.options[q]
+            picks.append(st.radio(
+                f"{n}) {bank.prompts[q]}",
+                range(len(options)),
+                format_func=options.__getitem__,
+                index=None,
+                key=f"quiz_{quiz['round']}_{n}",
+            ))
+        submitted = st.form_submit_button("✅ Submit Quiz")
+
+    if not submitted:
+        return
+    if None in picks:
+        st.warning("Please answer all questions before submitting 😊")
+        return
+
+    result = bank.grade(questions, picks)
+    score, total = result.score, result.total
+    # queued and saved in the background; the rerun doesn't wait for the disk
+    session = st.session_state.setdefault("_quiz_session", uuid.uuid4().hex)
+    if not record_result(session, bank, result, quiz["started"]):
+        st.warning("Your score couldn't be saved this time, but here it is anyway.")
+
+    st.subheader("🎉 Your Score")
+    st.write(f"**{score} / {total}**")
+
+    if score == total:
+        st.success("Excellent! You really think like a young scientist 👏")
+        st.balloons()
+    elif score >= total - 2:
+        st.success("Great job! Just a little review and you’re perfect 👍")
+    else:
+        st.info("Nice try! Review the app and try again — learning takes practice 💪")
+
+    # Reinforcement
+    st.markdown("### 🔍 Why these answers are correct")
+    review = []
+    for n, (q, right) in enumerate(zip(questions, result.correct), 1):
+        answer = bank.options[q][bank.answers[q]]
+        line = f"{'✅' if right else '❌'} **{n})** {answer}"
+        if bank.explanations[q]:
+            line += f" — {bank.explanations[q]}"
+        review.append(line)
+    st.markdown("\n\n".join(review))
+    st.caption(shared_writer().report())
@@ -0,0 +1,36 @@
+"""Which pages the app has and where their code lives.
+
+Each page is its own ``page_*`` module. A module is imported the first time
+someone opens its page and stays loaded (in ``sys.modules``) after that, so
+a rerun of app.py only looks up the one page being shown. Adding a page is
+one more line here and doesn't add to any other page's reruns.
+
+(The modules aren't in a ``pages/`` folder on purpose: Streamlit would turn
+that into its own multipage navigation.)
+"""
+
+import importlib
+
+
+# Sidebar label -> (module, function), in sidebar order
+PAGES = {
+    "Home": ("page_home", "home_page"),
+    "Energy Explorer": ("page_energy_explorer", "energy_explorer_page"),
+    "Collider Run": ("page_collider_run", "collider_run_page"),
+    "Collision Lab": ("page_collision_lab", "collision_lab_page"),
+    "Event Browser": ("page_event_browser", "event_browser_page"),
+    "Quiz": ("page_quiz", "quiz_page"),
+    "About CERN": ("page_about_cern", "about_cern_page"),
+    "About the LHC": ("page_lhc", "lhc_page"),
+}
+
+_loaded = {}
+
+
+def page_function(name):
+    """The function that draws page ``name``, importing its module on first use."""
+    page = _loaded.get(name)
+    if page is None:
+        module, function = PAGES[name]
+        page = _loaded[name] = getattr(importlib.import_module(module), function)
+    return page
@@ -0,0 +1,197 @@
+"""The Energy Explorer's particle cards, and a browser version of the page.
+
+Which card goes with which energy comes from the particle catalog
+(``data/catalog.json``, see catalog.py); the circle's size grows linearly
+with energy. ``explorer_html()`` sends all the cards and the size formula to
+the browser once, and the slider there switches cards locally, so dragging it
+never reruns the script.
+
+Under serve.py the card images are referenced by their static URLs, so the
+document stays a few KB and the browser caches the pictures. Otherwise a
+built variant small enough (``INLINE_MAX_BYTES``) is inlined as a data URI;
+a card whose picture is bigger than that (e.g. before the asset build has
+run) asks the student to switch to the server-side slider to see it,
+rather than sending megabytes with every rerun.
+"""
+
+import base64
+import json
+
+from catalog import catalog
+
+
+# Circle size: 40px at energy 0 -> 150px at energy 100
+CIRCLE_MIN_PX = 40
+CIRCLE_RANGE_PX = 110
+
+# The image column is roughly this wide (CSS px)
+IMAGE_WIDTH = 360
+
+# Largest picture inlined into the page when there are no static URLs
+INLINE_MAX_BYTES = 48 * 1024
+
+_MIME = {"webp": "image/webp", "jpg": "image/jpeg", "png": "image/png"}
+
+
+def particle_for_energy(energy):
+    return catalog().explorer_card(energy)
+
+
+def circle_size(energy):
+    return int(CIRCLE_MIN_PX + (energy / 100) * CIRCLE_RANGE_PX)
+
+
+def _image_url(path_str):
+    """A URL the browser can load the card image from, or ``None``.
+
+    A long-lived static URL when serve.py is running, otherwise the smallest
+    WebP/JPEG/PNG variant as a data URI if it is at most ``INLINE_MAX_BYTES``.
+    """
+    from asset_registry import registry
+    from static_assets import URL_FORMATS, static_url
+
+    if not registry.exists(path_str):
+        return None
+    variant = registry.resolve(path_str, IMAGE_WIDTH, URL_FORMATS)
+    url = static_url(variant)
+    if url is not None:
+        return url
+    data = registry.load(variant)
+    if len(data) > INLINE_MAX_BYTES:
+        return None
+    mime = _MIME.get(variant.rsplit(".", 1)[-1], "image/png")
+    return f"data:{mime};base64,{base64.b64encode(data).decode()}"
+
+
+def explorer_payload(initial_energy):
+    from asset_registry import registry
+
+    cards = []
+    for card in catalog().explorer_cards:
+        cards.append({**card, "image_url": _image_url(card["image"]), "image_found": registry.exists(card["image"])})
+    return {
+        "energy": initial_energy,
+        "cards": cards,
+        "circle": [CIRCLE_MIN_PX, CIRCLE_RANGE_PX],
+    }
+
+
+_EXPLORER_HTML = """
+<div class="ee">
+  <div class="ee-col">
+    <h3>Energy Slider</h3>
+    <label for="ee-energy">How much energy to give the particle?</label>
+    <div class="ee-value"><span id="ee-value"></span></div>
+    <input id="ee-energy" type="range" min="0" max="100" step="1">
+    <div class="ee-box info">
+      Think of this like a particle race! 🏎️💨
+      Particles are already inside the collider. The slider shows how much energy we give them to zoom.
+      Low energy lets tiny, common particles appear (like photons).
+      High energy can reveal heavier or rarer particles.
+    </div>
+    <p><b>Particle Visual:</b></p>
+    <div id="ee-circle" class="ee-circle"></div>
+    <p class="ee-caption">Energy is like a push. The circle shows which particle appears — bigger = rarer!</p>
+  </div>
+  <div class="ee-col">
+    <h3>Particle Info</h3>
+    <p><b>Energy level:</b> <span id="ee-level"></span>/100</p>
+    <p><b>Particle:</b> <span id="ee-name"></span></p>
+    <p><b>Mass level:</b> <span id="ee-mass"></span></p>
+    <p><b>Rarity:</b> <span id="ee-rarity"></span></p>
+    <div id="ee-meaning" class="ee-box info"></div>
+  </div>
+  <div class="ee-col">
+    <h3>Particle Image</h3>
+    <img id="ee-img" alt="">
+    <p id="ee-img-caption" class="ee-caption"></p>
+    <div id="ee-missing" class="ee-box warning" hidden></div>
+  </div>
+</div>
+<style>
+  body { margin: 0; font-family: "Source Sans Pro", sans-serif; color: #31333f; }
+  .ee { display: grid; grid-template-columns: 1.2fr 1.6fr 1.2fr; gap: 16px; }
+  @media (max-width: 640px) { .ee { grid-template-columns: 1fr; } }
+  h3 { margin: 0 0 10px; font-size: 1.5rem; font-weight: 600; }
+  p { margin: 0 0 8px; }
+  label { font-size: 14px; }
+  input[type=range] { width: 100%; accent-color: #ff4b4b; }
+  .ee-value { color: #ff4b4b; font-size: 14px; text-align: center; }
+  .ee-box { padding: 14px 16px; border-radius: 8px; margin: 10px 0; line-height: 1.5; }
+  .ee-box.info { background: #e8f2fc; color: #0c4a8a; }
+  .ee-box.warning { background: #fff8e1; color: #7a5b00; }
+  .ee-circle { border-radius: 50%; margin: 10px 0 6px; transition: width .08s, height .08s; }
+  .ee-caption { color: #808495; font-size: 14px; }
+  #ee-img { width: 100%; border-radius: 4px; }
+</style>
+<script>
+const EE = __PAYLOAD__;
+const slider = document.getElementById("ee-energy");
+const $ = (id) => document.getElementById(id);
+
+function cardFor(energy) {
+  for (const card of EE.cards) {
+    if (card.below === null || energy < card.below) return card;
+  }
+  return EE.cards[EE.cards.length - 1];
+}
+
+let shown = null;
+function update() {
+  const energy = Number(slider.value);
+  const card = cardFor(energy);
+  const size = Math.floor(EE.circle[0] + (energy / 100) * EE.circle[1]);
+  $("ee-value").textContent = energy;
+  $("ee-level").textContent = energy;
+  const circle = $("ee-circle");
+  circle.style.width = circle.style.height = size + "px";
+  circle.style.background = card.color;
+  if (card === shown) return;
+  shown = card;
+  $("ee-name").textContent = card.name;
+  $("ee-mass").textContent = card.mass;
+  $("ee-rarity").textContent = card.rarity;
+  $("ee-meaning").textContent = card.meaning;
+  const img = $("ee-img");
+  if (card.image_url) {
+    img.hidden = false;
+    img.src = card.image_url;
+    img.alt = card.name;
+    $("ee-img-caption").textContent = card.name;
+    $("ee-missing").hidden = true;
+  } else {
+    img.hidden = true;
+    $("ee-img-caption").textContent = "Tip: Check your assets folder filenames.";
+    $("ee-missing").hidden = false;
+    $("ee-missing").textContent = card.image_found
+      ? "Switch off ⚡ Instant slider to see this picture."
+      : "Image not found: " + card.image;
+  }
+}
+
+slider.value = EE.energy;
+slider.addEventListener("input", update);
+// preload every card image so switching is instant
+EE.cards.forEach((card) => { if (card.image_url) new Image().src = card.image_url; });
+update();
+</script>
+"""
+
+
+_html_cache = {}
+
+
+def explorer_html(initial_energy=20):
+    """The whole page as one HTML document, built once per image manifest
+    (and static URL base)."""
+    from asset_pipeline import manifest
+    from static_assets import static_base_url
+
+    key = (initial_energy, static_base_url(), id(manifest()))
+    html = _html_cache.get(key)
+    if html is None:
+        payload = json.dumps(explorer_payload(initial_energy), ensure_ascii=False).replace("</", "<\\/")
+        html = _EXPLORER_HTML.replace("__PAYLOAD__", payload)
+        _html_cache.clear()
+        _html_cache[key] = html
+    return html
@@ -0,0 +1,186 @@
+"""Get the drawing stack ready before the first student needs it.
+
+Right after a deploy (or a new replica starting) the first visitor to an
+animated page used to pay for importing matplotlib, setting up Agg, loading
+the font cache and building the page's first figure, all inside their own
+request. ``start_prewarm()`` does that in a background thread as soon as
+the app starts:
+
+* import matplotlib with the Agg backend and draw some text once, so the
+  font cache and FreeType are loaded;
+* encode a PNG so PIL's encoder is loaded;
+* import the page modules and build the things they share (the catalog,
+  the static page text, the energy sweep, the quiz bank);
+* draw each animated page's first frame into the shared frame cache (in
+  the render pool when there is one, which also starts its workers).
+
+Each step is timed. The first in-thread frame of each page is timed too, and
+marked "warm" if the prewarm had already finished when it started, or
+"cold" otherwise. Both go into a JSON-lines log tagged with the release
+(LITTLE_COLLIDER_RELEASE), so startup can be compared from one release to
+the next.
+"""
+
+import io
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+
+STARTUP_LOG = Path(
+    os.environ.get("LITTLE_COLLIDER_STARTUP_LOG", Path(__file__).parent / ".cache" / "startup.jsonl")
+)
+RELEASE = os.environ.get("LITTLE_COLLIDER_RELEASE", "dev")
+
+
+def _matplotlib():
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    # text pulls in the font cache (built on the very first start) and FreeType
+    fig = Figure(figsize=(1, 1), dpi=50)
+    fig.text(0.5, 0.5, "LHC")
+    FigureCanvasAgg(fig).draw()
+
+
+def _png():
+    from PIL import Image
+
+    Image.new("RGB", (8, 8)).save(io.BytesIO(), format="PNG", compress_level=1)
+
+
+def _page_modules():
+    import datataking  # noqa: F401
+    import detector  # noqa: F401
+    import eventfile  # noqa: F401
+    import ring  # noqa: F401
+    import shower  # noqa: F401
+    from catalog import catalog
+    from content import compile_all
+    from events import energy_sweep
+    from quiz import quiz_bank
+
+    catalog()
+    compile_all()
+    energy_sweep()
+    quiz_bank()
+
+
+def _first_frames():
+    import animation
+    from frame_cache import frame_cache, frame_key
+    from render_pool import shared_pool
+    from renderer import BACKEND, DPI, make_renderer
+
+    pool = shared_pool(BACKEND)
+    for page in animation.SCENES:
+        key = frame_key(page, animation.trajectory(page, 0).frames[0], False, BACKEND, DPI)
+        args = (page, key[1], False, BACKEND, DPI)
+        if pool is not None:
+            # starts the worker processes too (they warm up matplotlib themselves)
+            pool.request("prewarm", key, args).result()
+            continue
+        renderer = make_renderer(page, BACKEND, DPI)
+        frame_cache.put(key, renderer.render(key[1], False))
+        renderer.close()
+
+
+STEPS = (
+    ("matplotlib + fonts", _matplotlib),
+    ("PNG encoder", _png),
+    ("page modules", _page_modules),
+    ("first frames", _first_frames),
+)
+
+
+class _Prewarm:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.thread = None
+        self.steps = {}
+        self.started = None
+        self.finished = None
+        self.error = None
+        self.first_renders = {}
+
+    def run(self):
+        self.started = time.perf_counter()
+        # Without `streamlit run` (AppTest, bare mode) the app's folder is
+        # only on sys.path while the script runs, and is taken off again
+        # under this thread's feet; keep a copy of our own at the end
+        sys.path.append(str(Path(__file__).parent))
+        try:
+            for name, step in STEPS:
+                begin = time.perf_counter()
+                step()
+                self.steps[name] = time.perf_counter() - begin
+        except Exception as exc:  # the pages still work, just cold
+            self.error = repr(exc)
+        self.finished = time.perf_counter()
+        _log({"event": "prewarm", "seconds": self.finished - self.started, "steps": self.steps, "error": self.error})
+
+
+_prewarm = _Prewarm()
+
+
+def start_prewarm():
+    """Start warming up in the background (once per process)."""
+    with _prewarm.lock:
+        if _prewarm.thread is None:
+            _prewarm.thread = threading.Thread(target=_prewarm.run, name="prewarm", daemon=True)
+            _prewarm.thread.start()
+
+
+def is_warm():
+    return _prewarm.finished is not None
+
+
+def first_render(key, started, seconds):
+    """Record how long a process's first frame for ``key`` took to draw, if
+    this is the first. ``started`` is ``time.perf_counter()`` when it began."""
+    with _prewarm.lock:
+        if key in _prewarm.first_renders:
+            return
+        warm = _prewarm.finished is not None and _prewarm.finished <= started
+        _prewarm.first_renders[key] = {"seconds": seconds, "warm": warm}
+    _log({"event": "first_render", "key": [str(k) for k in key], "seconds": seconds, "warm": warm})
+
+
+def prewarm_status():
+    return {
+        "running": _prewarm.thread is not None and _prewarm.thread.is_alive(),
+        "seconds": (_prewarm.finished or time.perf_counter()) - _prewarm.started if _prewarm.started else 0.0,
+        "steps": dict(_prewarm.steps),
+        "first_renders": dict(_prewarm.first_renders),
+        "error": _prewarm.error,
+    }
+
+
+def _log(entry):
+    entry = {"release": RELEASE, "pid": os.getpid(), "time": time.time(), **entry}
+    try:
+        STARTUP_LOG.parent.mkdir(parents=True, exist_ok=True)
+        with open(STARTUP_LOG, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+    except OSError:
+        pass  # timings are nice to have, not worth failing over
+
+
+if __name__ == "__main__":
+    # Cold vs warm first frame in this process: python prewarm.py [--warm]
+    import animation
+    import renderer
+
+    if "--warm" in sys.argv:
+        _prewarm.run()
+        print(f"prewarm {_prewarm.finished - _prewarm.started:.3f}s", json.dumps(_prewarm.steps))
+    page = animation.COLLIDER_RUN
+    begin = time.perf_counter()
+    renderer.make_renderer(page, "figure").render(animation.trajectory(page, 0).frames[1])
+    print(f"first figure frame {time.perf_counter() - begin:.3f}s ({'warm' if is_warm() else 'cold'})")
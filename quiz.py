@@ -0,0 +1,344 @@
+"""Quiz questions: a bank of thousands, a fresh quiz for every student.
+
+The bank is ``data/quiz_bank.jsonl``, one question per line after a header
+line with the topic names. It is built by ``python quiz.py build`` from the
+hand-written questions in ``data/quiz_questions.json`` plus questions made
+from the particle catalog (masses, lifetimes, Energy Explorer cards) and the
+Collision Lab's outcome model, so it grows with the catalog.
+
+Nearly all of the bank is generated: a handful of templates ("which is
+heavier, A or B?") filled in with every pair or group of particles, while
+the hand-written topics have a few questions each. So a quiz is dealt out
+over templates, not topics: each generated family is one template, and so
+are the hand-written questions of each topic. A quiz takes at most one
+question per template until it has used them all, so the few hand-written
+questions don't fill every quiz, and the thousands of permutations of one
+template don't either.
+
+Loaded, the bank is a set of columns instead of a dict per question: the
+texts in tuples (repeated option lists are shared), the answers, topics and
+difficulties in byte arrays, and an index from ``(topic, template,
+difficulty)`` to an ``array`` of question numbers. Drawing a quiz of ``k``
+questions only touches those ``k`` (``sample``), and grading compares each
+pick with the answer column (``grade``).
+"""
+
+import json
+import math
+import random
+import sys
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import accumulate, combinations
+from pathlib import Path
+
+
+BANK_PATH = Path(__file__).parent / "data" / "quiz_bank.jsonl"
+QUESTIONS_PATH = Path(__file__).parent / "data" / "quiz_questions.json"
+
+BANK_VERSION = 2
+
+DIFFICULTIES = {1: "Easy", 2: "Medium", 3: "Hard"}
+
+
+class QuizBank:
+    def __init__(self, topics, questions):
+        self.topic_ids = tuple(topics)
+        self.topic_labels = tuple(topics.values())
+        topic_number = {topic: n for n, topic in enumerate(self.topic_ids)}
+
+        prompts, options, explanations = [], [], []
+        self.answers = array("B")
+        self.topics = array("B")
+        self.difficulty = array("B")
+        shared = {}
+        index = {}
+        templates = {}
+        generated = set()
+        self.written = 0
+        for number, q in enumerate(questions):
+            if not 0 <= q["a"] < len(q["o"]):
+                raise ValueError(f"question {number}: answer {q['a']} is not one of its options")
+            if q["d"] not in DIFFICULTIES:
+                raise ValueError(f"question {number}: unknown difficulty {q['d']}")
+            topic = topic_number[q["t"]]
+            choices = tuple(q["o"])
+            prompts.append(q["q"])
+            options.append(shared.setdefault(choices, choices))
+            explanations.append(q.get("e", ""))
+            self.answers.append(q["a"])
+            self.topics.append(topic)
+            self.difficulty.append(q["d"])
+            # generated questions name their template ("k"); the hand-written
+            # ones of a topic share one
+            if "k" in q:
+                generated.add(q["k"])
+            else:
+                self.written += 1
+            template = templates.setdefault(q.get("k", f"written:{q['t']}"), len(templates))
+            index.setdefault((topic, template, q["d"]), array("I")).append(number)
+        self.templates = len(templates)
+        self.generated_templates = len(generated)
+        self.prompts = tuple(prompts)
+        self.options = tuple(options)
+        self.explanations = tuple(explanations)
+        self.index = index
+
+    def __len__(self):
+        return len(self.prompts)
+
+    def count(self, topic):
+        t = self.topic_ids.index(topic)
+        return sum(len(ids) for (bucket_topic, _, _), ids in self.index.items() if bucket_topic == t)
+
+    def sample(self, k, topics=None, difficulties=None, rng=random):
+        """``k`` question numbers for a new quiz from ``topics`` (default all),
+        limited to ``difficulties`` (default all), spread as evenly as the
+        bank allows over question templates. Costs O(k) plus one step per
+        index bucket."""
+        wanted = {self.topic_ids.index(topic) for topic in (self.topic_ids if topics is None else topics)}
+        levels = set(DIFFICULTIES if difficulties is None else difficulties)
+        by_template = {}
+        for (t, template, d), ids in self.index.items():
+            if t in wanted and d in levels:
+                by_template.setdefault(template, []).append(ids)
+        pools = list(by_template.values())
+
+        # Deal the k places out to the templates in a random order, skipping
+        # templates that have run out of questions
+        sizes = [sum(map(len, buckets)) for buckets in pools]
+        order = rng.sample(range(len(pools)), len(pools))
+        shares = [0] * len(pools)
+        left = min(k, sum(sizes))
+        while left:
+            for p in order:
+                if left and shares[p] < sizes[p]:
+                    shares[p] += 1
+                    left -= 1
+
+        picked = []
+        for buckets, share in zip(pools, shares):
+            # the template's buckets, read as one long list without joining them
+            ends = list(accumulate(map(len, buckets)))
+            for position in rng.sample(range(ends[-1]), share):
+                b = bisect_right(ends, position)
+                picked.append(buckets[b][position - (ends[b - 1] if b else 0)])
+        rng.shuffle(picked)
+        return tuple(picked)
+
+    def grade(self, questions, picks):
+        """Score option numbers ``picks`` for question numbers ``questions``."""
+        correct = tuple(pick == self.answers[q] for q, pick in zip(questions, picks))
+        return QuizResult(tuple(questions), tuple(picks), correct)
+
+
+@dataclass(frozen=True)
+class QuizResult:
+    questions: tuple
+    picks: tuple
+    correct: tuple
+
+    @property
+    def score(self):
+        return sum(self.correct)
+
+    @property
+    def total(self):
+        return len(self.questions)
+
+
+def load_bank(path=BANK_PATH):
+    with open(path, encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("version") != BANK_VERSION:
+            raise ValueError(f"{path}: bank version {header.get('version')}, expected {BANK_VERSION}")
+        return QuizBank(header["topics"], (json.loads(line) for line in f if line.strip()))
+
+
+_bank = {}
+
+
+def quiz_bank():
+    """The question bank, read once per process."""
+    if "bank" not in _bank:
+        _bank["bank"] = load_bank()
+    return _bank["bank"]
+
+
+# ---------------------------------------------------------------------------
+# Building the bank
+
+
+def _mass_text(mev):
+    if mev == 0:
+        return "no mass at all"
+    if mev < 1e-3:
+        return f"less than {mev * 1e6:.2g} eV"
+    if mev < 1:
+        return f"{mev * 1000:.3g} keV"
+    if mev < 1000:
+        return f"{mev:.4g} MeV"
+    return f"{mev / 1000:.4g} GeV"
+
+
+_SUPERSCRIPT = str.maketrans("-0123456789", "⁻⁰¹²³⁴⁵⁶⁷⁸⁹")
+
+
+def _time_text(seconds):
+    if seconds >= 60:
+        return f"about {seconds / 60:.0f} minutes"
+    exponent = math.floor(math.log10(seconds))
+    return f"{seconds / 10 ** exponent:.2g}×10{str(exponent).translate(_SUPERSCRIPT)} s"
+
+
+def _difficulty(ratio, easy, medium):
+    """1-3 from how far apart two numbers are (as a ratio)."""
+    gap = math.log10(ratio)
+    return 1 if gap >= easy else 2 if gap >= medium else 3
+
+
+def _mass_ratio(a, b):
+    # photons have no mass; below a keV the difference is too small to feel
+    return max(a, b, 1e-3) / max(min(a, b), 1e-3)
+
+
+def _particle_questions(particles, rng):
+    weighed = sorted((p for p in particles if p["kind"] == "real" and p["mass_mev"] is not None),
+                     key=lambda p: p["mass_mev"])
+
+    def masses(group):
+        return ", ".join(f"{p['name']} {_mass_text(p['mass_mev'])}" for p in sorted(group, key=lambda p: -p["mass_mev"]))
+
+    for light, heavy in combinations(weighed, 2):
+        d = _difficulty(_mass_ratio(light["mass_mev"], heavy["mass_mev"]), 2, 0.5)
+        for word, answer in (("heavier", heavy), ("lighter", light)):
+            pair = [light["name"], heavy["name"]]
+            rng.shuffle(pair)
+            yield "particles", d, f"Which particle is {word}: {pair[0]} or {pair[1]}?", pair, answer["name"], \
+                f"Masses: {masses((light, heavy))}.", "particles.pair"
+
+    for group in combinations(weighed, 4):
+        names = [p["name"] for p in group]
+        rng.shuffle(names)
+        explanation = f"Masses: {masses(group)}."
+        d = _difficulty(_mass_ratio(group[-2]["mass_mev"], group[-1]["mass_mev"]), 1.5, 0.3)
+        yield "particles", d, "Which of these is the heaviest?", names, group[-1]["name"], explanation, \
+            "particles.heaviest"
+        d = _difficulty(_mass_ratio(group[0]["mass_mev"], group[1]["mass_mev"]), 1.5, 0.3)
+        yield "particles", d, "Which of these is the lightest?", names, group[0]["name"], explanation, \
+            "particles.lightest"
+
+
+def _lifetime_questions(particles, rng):
+    real = [p for p in particles if p["kind"] == "real"]
+    stable = [p for p in real if p["lifetime_s"] is None]
+    decaying = sorted((p for p in real if p["lifetime_s"] is not None), key=lambda p: p["lifetime_s"])
+
+    for short, long in combinations(decaying, 2):
+        d = _difficulty(long["lifetime_s"] / short["lifetime_s"], 6, 2)
+        explanation = (f"{long['name']} lives for {_time_text(long['lifetime_s'])}, "
+                       f"{short['name']} for {_time_text(short['lifetime_s'])}.")
+        for word, answer in (("longer", long), ("shorter", short)):
+            pair = [short["name"], long["name"]]
+            rng.shuffle(pair)
+            yield "lifetimes", d, f"Which lives {word} before it decays: {pair[0]} or {pair[1]}?", pair, \
+                answer["name"], explanation, "lifetimes.pair"
+
+    for keeper in stable:
+        for others in combinations(decaying, 3):
+            names = [keeper["name"]] + [p["name"] for p in others]
+            rng.shuffle(names)
+            # a neutron lasts about a quarter of an hour, long enough to fool anyone
+            d = 3 if max(p["lifetime_s"] for p in others) > 1 else 2 if keeper["mass_mev"] else 1
+            decays = ", ".join(f"{p['name']} after {_time_text(p['lifetime_s'])}" for p in others)
+            yield "lifetimes", d, "Which of these never decays on its own?", names, keeper["name"], \
+                f"{keeper['name']} is stable; the others decay: {decays}.", "lifetimes.stable"
+
+
+def _band_text(index, i):
+    low = index.cutoffs[i - 1] if i else 0
+    high = index.cutoffs[i] if i < len(index.cutoffs) else None
+    return f"from {low:g} up to {high:g}" if high is not None else f"from {low:g} up"
+
+
+def _band_distance(index, energy):
+    return min((abs(energy - c) for c in index.cutoffs), default=math.inf)
+
+
+def _energy_questions(cat):
+    from events import energy_sweep
+
+    cards = cat.explorer
+    names = [card["name"] for card in cards.payloads]
+    for energy in range(0, 101):
+        gap = _band_distance(cards, energy)
+        if gap < 1:
+            continue  # right on a cut-off is a trick question
+        i = bisect_right(cards.cutoffs, energy)
+        yield "energy_explorer", 1 if gap >= 8 else 2 if gap >= 3 else 3, \
+            f"In the Energy Explorer, which particle card shows up at energy {energy}?", names, names[i], \
+            f"The {names[i]} card shows for energies {_band_text(cards, i)}.", "energy_explorer.card"
+
+    # The Collision Lab's soft bands: ask for the most likely outcome, away
+    # from where two outcomes are neck and neck
+    sweep = energy_sweep()
+    crossovers = [e for e, _ in sweep.crossovers()]
+    labels = [outcome["label"] for outcome in cat.collisions.payloads]
+    for energy, chances in zip(sweep.energies, sweep.probabilities):
+        gap = min((abs(energy - c) for c in crossovers), default=math.inf)
+        if gap < 2:
+            continue
+        best = int(chances.argmax())
+        yield "collision_lab", 1 if gap >= 15 else 2 if gap >= 6 else 3, \
+            f"In the Collision Lab, what is the most likely result of a crash at energy {energy:g}?", labels, \
+            labels[best], f"At energy {energy:g} about {chances[best]:.0%} of collisions end in {labels[best]}.", \
+            "collision_lab.likely"
+
+
+def build_bank(path=BANK_PATH, questions_path=QUESTIONS_PATH, seed=2024):
+    """Write the bank file; returns how many questions went in."""
+    from catalog import catalog
+
+    with open(questions_path, encoding="utf-8") as f:
+        written = json.load(f)
+    cat = catalog()
+    particles = list(cat.particles.values())
+    rng = random.Random(seed)
+
+    lines = []
+    seen = set()
+
+    def add(topic, difficulty, prompt, options, answer, explanation, template=None):
+        key = (prompt, frozenset(options))
+        if key in seen:
+            return
+        seen.add(key)
+        line = {"t": topic, "d": difficulty, "q": prompt, "o": list(options),
+                "a": list(options).index(answer), "e": explanation}
+        if template is not None:
+            line["k"] = template
+        lines.append(line)
+
+    for q in written["questions"]:
+        options = list(q["options"])
+        if len(options) > 2:  # two-way ones (Electron/Muon, Yes/No) read better as written
+            rng.shuffle(options)
+        add(q["topic"], q["difficulty"], q["question"], options, q["options"][q["answer"]], q.get("why", ""))
+    for generated in (_particle_questions(particles, rng), _lifetime_questions(particles, rng), _energy_questions(cat)):
+        for question in generated:
+            add(*question)
+
+    QuizBank(written["topics"], lines)  # same checks as loading it
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"version": BANK_VERSION, "topics": written["topics"]}, ensure_ascii=False) + "\n")
+        for line in lines:
+            f.write(json.dumps(line, ensure_ascii=False, separators=(",", ":")) + "\n")
+    return len(lines)
+
+
+if __name__ == "__main__":
+    # Rebuild the bank after changing the questions or the catalog: python quiz.py build
+    if sys.argv[1:] != ["build"]:
+        sys.exit("usage: python quiz.py build")
+    print(f"{build_bank()} questions -> {BANK_PATH}")
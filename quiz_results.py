@@ -0,0 +1,298 @@
+"""Keeping every quiz submission, without making anyone wait for the disk.
+
+When a whole school submits the quiz within a minute, writing each result
+to disk inside the student's own rerun would put a disk write (and a lock
+on the database) into every one of those reruns. Instead ``record_result()``
+puts the submission on an in-process queue and returns. A background writer
+takes whatever has piled up, up to ``MAX_BATCH`` at a time, and writes it
+in one transaction to a SQLite file in WAL mode (readers such as a
+teacher's report don't block it and it doesn't block them).
+
+``stats()`` reports the queue depth, the batch sizes and how long flushes
+take, both the transaction itself and from submit to committed. On shutdown
+the writer is told to stop after what is already queued, and the process
+waits for it (``close()``, run at exit), so a clean stop loses nothing.
+
+If the database can't be opened even after a few tries with growing pauses,
+the writer is marked failed: what was queued is counted as lost, and
+``submit()`` turns new submissions away (returns False) instead of letting
+them pile up in memory. A batch that can't be written is counted in
+``failed`` and the writer carries on with the next one. Anything lost is
+logged, and ``close()`` reports how many submissions were never saved.
+
+Each submission is an anonymous session id, the time, how long the quiz
+took, the score and, per question, what was asked, what was picked and
+whether it was right.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DB = Path(
+    os.environ.get("LITTLE_COLLIDER_RESULTS_DB", Path(__file__).parent / ".cache" / "quiz_results.sqlite3")
+)
+
+# Most submissions written in one transaction
+MAX_BATCH = 500
+
+# How long the writer waits for more submissions before writing a batch
+LINGER = 0.05
+
+# Tries at writing a batch before giving up on it (with a pause between)
+RETRIES = 5
+RETRY_PAUSE = 0.5
+
+# Tries at opening the database, the pause doubling each time
+CONNECT_RETRIES = 5
+
+# Flushes kept for the percentiles in stats()
+FLUSH_WINDOW = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    session TEXT NOT NULL,
+    submitted REAL NOT NULL,
+    seconds REAL NOT NULL,
+    score INTEGER NOT NULL,
+    total INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS answers (
+    submission INTEGER NOT NULL REFERENCES submissions(id),
+    position INTEGER NOT NULL,
+    question INTEGER NOT NULL,
+    prompt TEXT NOT NULL,
+    pick TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    PRIMARY KEY (submission, position)
+);
+"""
+
+
+@dataclass(frozen=True)
+class Submission:
+    session: str
+    submitted: float
+    seconds: float
+    score: int
+    total: int
+    answers: tuple  # (question number, prompt, picked option, correct)
+    queued: float = 0.0
+
+
+_STOP = object()
+
+
+class ResultWriter:
+    def __init__(self, path=RESULTS_DB, max_batch=MAX_BATCH, linger=LINGER):
+        self.path = Path(path)
+        self.max_batch = max_batch
+        self.linger = linger
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._flush_seconds = deque(maxlen=FLUSH_WINDOW)
+        self._lag_seconds = deque(maxlen=FLUSH_WINDOW)
+        self._batch_sizes = deque(maxlen=FLUSH_WINDOW)
+        self.submitted = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.error = None
+        self.broken = False
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="quiz-results", daemon=True)
+                self._thread.start()
+
+    def submit(self, submission):
+        """Queue ``submission`` for writing; never touches the disk. Returns
+        False (and counts it as failed) if the writer has failed for good."""
+        with self._lock:
+            self.submitted += 1
+            if self.broken:
+                self.failed += 1
+                return False
+            self._queue.put(submission)
+        return True
+
+    def close(self, timeout=30.0):
+        """Write everything queued so far, then stop the writer. Returns how
+        many submissions were never saved (and logs it if any)."""
+        with self._lock:
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.error("Quiz results writer didn't finish within %.0f s", timeout)
+        with self._lock:
+            lost = self.submitted - self.written
+        if lost:
+            logger.error("%d quiz submissions were not saved to %s (last error: %s)", lost, self.path, self.error)
+        return lost
+
+    def _fail(self, exc):
+        """The database can't be opened: stop taking submissions and count
+        the queued ones as lost."""
+        with self._lock:
+            self.broken = True
+            self.error = repr(exc)
+            dropped = 0
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    dropped += 1
+            self.failed += dropped
+        logger.error("Can't open %s, quiz results won't be saved (%d dropped): %s", self.path, dropped, exc)
+
+    def _run(self):
+        for attempt in range(CONNECT_RETRIES):
+            try:
+                db = self._connect()
+                break
+            except (OSError, sqlite3.Error) as exc:
+                self.error = repr(exc)
+                if attempt == CONNECT_RETRIES - 1:
+                    self._fail(exc)
+                    return
+                logger.warning("Can't open %s yet, trying again: %s", self.path, exc)
+                time.sleep(RETRY_PAUSE * 2 ** attempt)
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            if batch[0] is _STOP:
+                break
+            # give a burst a moment to pile up, then take all of it
+            deadline = time.perf_counter() + self.linger
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.perf_counter()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                self._write(db, batch)
+            except Exception as exc:  # a bad submission; keep the writer going
+                self.error = repr(exc)
+                with self._lock:
+                    self.failed += len(batch)
+                logger.exception("Couldn't save %d quiz submissions", len(batch))
+        db.close()
+
+    def _connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=10.0)
+        db.execute("PRAGMA journal_mode=WAL")
+        # with WAL this survives an app crash; only a power cut can lose the last commits
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(SCHEMA)
+        return db
+
+    def _write(self, db, batch):
+        for attempt in range(RETRIES):
+            begin = time.perf_counter()
+            try:
+                with db:
+                    for s in batch:
+                        cursor = db.execute(
+                            "INSERT INTO submissions (session, submitted, seconds, score, total) VALUES (?, ?, ?, ?, ?)",
+                            (s.session, s.submitted, s.seconds, s.score, s.total),
+                        )
+                        db.executemany(
+                            "INSERT INTO answers (submission, position, question, prompt, pick, correct)"
+                            " VALUES (?, ?, ?, ?, ?, ?)",
+                            [(cursor.lastrowid, n, *answer) for n, answer in enumerate(s.answers, 1)],
+                        )
+            except sqlite3.Error as exc:  # e.g. the file is locked by a long read
+                self.error = repr(exc)
+                time.sleep(RETRY_PAUSE * (attempt + 1))
+                continue
+            done = time.perf_counter()
+            with self._lock:
+                self.written += len(batch)
+                self.batches += 1
+                self._flush_seconds.append(done - begin)
+                self._lag_seconds.append(done - min(s.queued for s in batch))
+                self._batch_sizes.append(len(batch))
+            return
+        with self._lock:
+            self.failed += len(batch)
+        logger.error("Gave up on %d quiz submissions: %s", len(batch), self.error)
+
+    def stats(self):
+        with self._lock:
+            flushes = sorted(self._flush_seconds)
+            lags = sorted(self._lag_seconds)
+            sizes = self._batch_sizes
+            return {
+                "queue_depth": self._queue.qsize(),
+                "submitted": self.submitted,
+                "written": self.written,
+                "failed": self.failed,
+                "batches": self.batches,
+                "batch_mean": sum(sizes) / len(sizes) if sizes else 0.0,
+                "batch_max": max(sizes, default=0),
+                "flush_p50": flushes[len(flushes) // 2] if flushes else 0.0,
+                "flush_p95": flushes[int(len(flushes) * 0.95)] if flushes else 0.0,
+                "lag_p50": lags[len(lags) // 2] if lags else 0.0,
+                "lag_p95": lags[int(len(lags) * 0.95)] if lags else 0.0,
+                "error": self.error,
+                "broken": self.broken,
+            }
+
+    def report(self):
+        stats = self.stats()
+        return (
+            f"💾 Results: {stats['written']:,} saved, {stats['queue_depth']} waiting · "
+            f"{stats['batch_mean']:.1f} per write · saved within {stats['lag_p50'] * 1000:.0f} ms typical, "
+            f"{stats['lag_p95'] * 1000:.0f} ms slow"
+        )
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def shared_writer():
+    """The process-wide writer, started on first use."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ResultWriter()
+            _writer.start()
+            atexit.register(_writer.close)
+        return _writer
+
+
+def record_result(session, bank, result, started):
+    """Queue a graded quiz (``quiz.QuizResult``) for saving. ``started`` is
+    ``time.time()`` when the quiz was handed out. Returns False if results
+    can't be saved at the moment."""
+    now = time.time()
+    answers = tuple(
+        (q, bank.prompts[q], bank.options[q][pick], int(right))
+        for q, pick, right in zip(result.questions, result.picks, result.correct)
+    )
+    return shared_writer().submit(Submission(
+        session, now, now - started, result.score, result.total, answers, time.perf_counter()
+    ))
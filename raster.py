@@ -0,0 +1,155 @@
+"""Small NumPy drawing backend for the beam canvases.
+
+The animated pages only ever draw one thick line and a few filled circles
+(ellipses on screen, since the axes aren't square). That's cheap to paint
+straight into an RGB buffer (three channels, no alpha: transparency only
+comes in when colors are blended into it), with no figure, no artists and
+no pyplot:
+
+* the white background and the beam line are painted once into a static
+  buffer;
+* every frame reuses one frame buffer: the boxes the particles covered last
+  time are copied back from the static buffer, and the new particles and
+  the flash are blended on top, touching only the pixels inside each
+  ellipse's bounding box.
+
+Edges are anti-aliased from an approximate signed distance to the ellipse,
+and the output lines up with what the matplotlib renderer draws.
+"""
+
+import io
+
+import numpy as np
+
+import animation
+
+
+DPI = 200
+
+# The colors the scenes use, so we don't need matplotlib to parse them
+NAMED_COLORS = {
+    "white": "#ffffff",
+    "gray": "#808080",
+    "deepskyblue": "#00bfff",
+    "orange": "#ffa500",
+    "gold": "#ffd700",
+    "red": "#ff0000",
+    "purple": "#800080",
+}
+
+
+def to_rgb(color):
+    """A color name or ``#rrggbb`` string as a float32 array in 0..1."""
+    value = NAMED_COLORS.get(color, color)
+    if isinstance(value, str) and value.startswith("#") and len(value) == 7:
+        return np.array([int(value[i:i + 2], 16) for i in (1, 3, 5)], dtype=np.float32) / 255
+    # anything else (e.g. "C1" or "tab:blue"), let matplotlib work it out
+    from matplotlib.colors import to_rgb as mpl_to_rgb
+
+    return np.array(mpl_to_rgb(value), dtype=np.float32)
+
+
+def _to_uint8(buf):
+    return (buf * 255 + 0.5).astype(np.uint8)
+
+
+def _blend(region, coverage, color, alpha):
+    """Alpha-blend a solid color into ``region`` (H×W×3, float) in place."""
+    a = (coverage * alpha)[..., None]
+    region *= 1 - a
+    region += a * color
+
+
+class RasterRenderer:
+    """NumPy counterpart of ``renderer.BeamRenderer``.
+
+    ``draw(xs, flash)`` returns the frame buffer (uint8, H×W×3). The array is
+    reused for the next frame, so copy it if you need to keep it.
+    ``render(xs, flash)`` returns the frame as PNG bytes.
+    """
+
+    def __init__(self, page, dpi=DPI):
+        self.page = page
+        self.dpi = dpi
+        self.scene = animation.SCENES[page]
+        (width_in, height_in), box = animation.canvas_geometry(page)
+        self.width = int(width_in * dpi)
+        self.height = int(height_in * dpi)
+        left, bottom, right, top = box
+        # data (0..1) -> pixel transform
+        self._x0 = left * self.width
+        self._sx = (right - left) * self.width
+        self._y0 = (1 - bottom) * self.height
+        self._sy = (top - bottom) * self.height
+
+        static = np.ones((self.height, self.width, 3), dtype=np.float32)
+        self._paint_beam(static)
+        self._static = _to_uint8(static)
+        self._frame = self._static.copy()
+        self._dirty = []
+
+        self._particles = [
+            (p["y"], p["radius"], to_rgb(p["color"])) for p in self.scene["particles"]
+        ]
+        flash = self.scene["flash"]
+        self._flash = (flash["x"], flash["y"], flash["radius"], to_rgb(flash["color"]), flash["alpha"])
+
+    def _px(self, x, y):
+        return self._x0 + x * self._sx, self._y0 - y * self._sy
+
+    def _paint_beam(self, buf):
+        beam = self.scene["beam"]
+        half = beam["width"] / 72 * self.dpi / 2
+        (x0, y), (x1, _) = self._px(beam["x"][0], beam["y"]), self._px(beam["x"][1], beam["y"])
+        # matplotlib's default "projecting" cap sticks out by half a line width
+        left, right, top, bottom = x0 - half, x1 + half, y - half, y + half
+
+        i0, i1 = max(int(top) - 1, 0), min(int(bottom) + 2, self.height)
+        j0, j1 = max(int(left) - 1, 0), min(int(right) + 2, self.width)
+        ys = np.arange(i0, i1, dtype=np.float32) + 0.5
+        xs = np.arange(j0, j1, dtype=np.float32) + 0.5
+        cov_y = np.clip(np.minimum(ys - top, bottom - ys) + 0.5, 0, 1)
+        cov_x = np.clip(np.minimum(xs - left, right - xs) + 0.5, 0, 1)
+        coverage = cov_y[:, None] * cov_x[None, :]
+        _blend(buf[i0:i1, j0:j1], coverage, to_rgb(beam["color"]), beam["alpha"])
+
+    def _paint_disc(self, buf, x, y, radius, color, alpha):
+        cx, cy = self._px(x, y)
+        rx, ry = radius * self._sx, radius * self._sy
+
+        i0, i1 = max(int(cy - ry) - 1, 0), min(int(cy + ry) + 2, self.height)
+        j0, j1 = max(int(cx - rx) - 1, 0), min(int(cx + rx) + 2, self.width)
+        if i0 >= i1 or j0 >= j1:
+            return
+        self._dirty.append((i0, i1, j0, j1))
+        dy = (np.arange(i0, i1, dtype=np.float32) + 0.5 - cy)[:, None]
+        dx = (np.arange(j0, j1, dtype=np.float32) + 0.5 - cx)[None, :]
+
+        # f / |grad f| approximates the signed distance (in pixels) to the edge
+        f = (dx / rx) ** 2 + (dy / ry) ** 2 - 1
+        grad = 2 * np.sqrt((dx / rx ** 2) ** 2 + (dy / ry ** 2) ** 2) + 1e-6
+        coverage = np.clip(0.5 - f / grad, 0, 1)
+        region = buf[i0:i1, j0:j1].astype(np.float32) / 255
+        _blend(region, coverage, color, alpha)
+        buf[i0:i1, j0:j1] = _to_uint8(region)
+
+    def draw(self, xs, flash=False):
+        frame = self._frame
+        for i0, i1, j0, j1 in self._dirty:
+            frame[i0:i1, j0:j1] = self._static[i0:i1, j0:j1]
+        self._dirty = []
+        for (y, radius, color), x in zip(self._particles, xs):
+            self._paint_disc(frame, x, y, radius, color, 1.0)
+        if flash:
+            self._paint_disc(frame, *self._flash)
+        return frame
+
+    def render(self, xs, flash=False):
+        from PIL import Image
+
+        out = io.BytesIO()
+        Image.fromarray(self.draw(xs, flash)).save(out, format="PNG")
+        return out.getvalue()
+
+    def close(self):
+        pass
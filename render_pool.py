@@ -0,0 +1,282 @@
+"""Shared worker processes for drawing the classic animation frames.
+
+With the PNG backends ("figure" and "raster" in renderer.py) every frame is
+drawn and encoded on the session's own script thread, so under the GIL a
+classroom of animating sessions all queue up for one core. ``RenderPool``
+sends that work to a few worker processes instead. Each worker keeps its own
+renderers, so the blitting figures are built once per worker, not per frame.
+
+The pool never lets a backlog build up:
+
+* a session has at most ``PER_SESSION_IN_FLIGHT`` frames being drawn and at
+  most one more waiting. A newer frame replaces the waiting one, since by
+  the time it would be drawn the particle has moved on anyway;
+* the waiting line as a whole is capped at ``MAX_QUEUE``, dropping the
+  oldest request when it is full;
+* a page that can't wait shows the session's latest finished frame and
+  picks up the new one on the next rerun.
+
+Finished frames go into the shared frame cache like any other. ``stats()``
+reports queue depth, frames in flight, drops and latency.
+
+The SVG backend (the default) isn't sent here: its frames are a bit of
+string formatting, cheaper than the trip to another process.
+"""
+
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+
+# Worker processes; 0 turns the pool off and frames are drawn in-thread
+WORKERS = int(os.environ.get("LITTLE_COLLIDER_RENDER_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+
+# Backends whose frames are worth drawing in another process
+POOLED_BACKENDS = ("figure", "raster")
+
+PER_SESSION_IN_FLIGHT = 1
+MAX_QUEUE = 64
+
+# Sessions whose latest frame we remember for the "show the last one" fallback
+MAX_SESSIONS = 256
+
+# Latencies kept for the percentiles in stats()
+LATENCY_WINDOW = 500
+
+# Longest a page waits on the pool for a frame it needs before drawing it
+# itself (a worker may have hung or been killed)
+RESULT_TIMEOUT = 10.0
+
+
+# --- worker side -----------------------------------------------------------
+
+_worker_renderers = {}
+
+
+def _draw(page, xs, flash, backend, dpi):
+    from renderer import make_renderer
+
+    key = (page, backend, dpi)
+    renderer = _worker_renderers.get(key)
+    if renderer is None:
+        renderer = _worker_renderers[key] = make_renderer(page, backend, dpi)
+    return renderer.render(xs, flash)
+
+
+def _warm_up():
+    # pay for the matplotlib import when the worker starts, not on a frame
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.figure  # noqa: F401
+
+
+# --- server side -----------------------------------------------------------
+
+class _Request:
+    __slots__ = ("session", "key", "args", "future", "queued")
+
+    def __init__(self, session, key, args):
+        self.session = session
+        self.key = key
+        self.args = args
+        self.future = Future()
+        self.queued = time.perf_counter()
+
+
+class RenderPool:
+    def __init__(self, workers=WORKERS, per_session=PER_SESSION_IN_FLIGHT, max_queue=MAX_QUEUE):
+        import multiprocessing
+
+        # spawn, not fork: forking a server full of threads isn't safe
+        self._executor = ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("spawn"), initializer=_warm_up
+        )
+        self.workers = workers
+        self.per_session = per_session
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._waiting = deque()
+        self._waiting_by_session = {}
+        self._in_flight = {}
+        self._latest = OrderedDict()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def request(self, session, key, args):
+        """Queue a frame for ``session``; ``args`` go to the worker's
+        ``render``. Returns a Future whose result is the frame, or None if it
+        was dropped for a newer one."""
+        req = _Request(session, key, args)
+        dropped = []
+        with self._lock:
+            self.submitted += 1
+            older = self._waiting_by_session.pop(session, None)
+            if older is not None:
+                self._waiting.remove(older)
+                dropped.append(older)
+            self._waiting.append(req)
+            self._waiting_by_session[session] = req
+            while len(self._waiting) > self.max_queue:
+                oldest = self._waiting.popleft()
+                del self._waiting_by_session[oldest.session]
+                dropped.append(oldest)
+            self.dropped += len(dropped)
+            start = self._next_runnable()
+        for req_ in dropped:
+            req_.future.set_result(None)
+        self._start(start)
+        return req.future
+
+    def _next_runnable(self):
+        # called with the lock held; requests we may hand to the executor now
+        ready = []
+        busy = sum(self._in_flight.values())
+        for req in list(self._waiting):
+            if busy >= self.workers:
+                break
+            if self._in_flight.get(req.session, 0) >= self.per_session:
+                continue
+            self._waiting.remove(req)
+            del self._waiting_by_session[req.session]
+            self._in_flight[req.session] = self._in_flight.get(req.session, 0) + 1
+            busy += 1
+            ready.append(req)
+        return ready
+
+    def _release(self, session):
+        # called with the lock held; a frame of ``session`` is no longer in flight
+        left = self._in_flight[session] - 1
+        if left:
+            self._in_flight[session] = left
+        else:
+            del self._in_flight[session]
+
+    def _start(self, requests):
+        for req in requests:
+            try:
+                work = self._executor.submit(_draw, *req.args)
+            except RuntimeError:
+                # shutting down (or a worker died); nobody is going to show
+                # this frame, but give the session its slot back
+                with self._lock:
+                    self._release(req.session)
+                req.future.set_result(None)
+                continue
+            work.add_done_callback(lambda work, req=req: self._finished(req, work))
+
+    def _finished(self, req, work):
+        error = work.exception()
+        with self._lock:
+            self._release(req.session)
+            if error is None:
+                self.completed += 1
+                self._latencies.append(time.perf_counter() - req.queued)
+                self._latest[req.session] = work.result()
+                self._latest.move_to_end(req.session)
+                while len(self._latest) > MAX_SESSIONS:
+                    self._latest.popitem(last=False)
+            else:
+                self.failed += 1
+            start = self._next_runnable()
+        if error is None:
+            from frame_cache import frame_cache
+
+            frame_cache.put(req.key, work.result())
+            req.future.set_result(work.result())
+        else:
+            req.future.set_exception(error)
+        self._start(start)
+
+    def latest(self, session):
+        with self._lock:
+            return self._latest.get(session)
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {
+                "workers": self.workers,
+                "queue_depth": len(self._waiting),
+                "in_flight": sum(self._in_flight.values()),
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "latency_p50": latencies[len(latencies) // 2] if latencies else 0.0,
+                "latency_p95": latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+            }
+
+    def report(self):
+        stats = self.stats()
+        return (
+            f"🧵 Render pool: {stats['in_flight']} drawing, {stats['queue_depth']} waiting, "
+            f"{stats['dropped']:,} skipped · {stats['latency_p50'] * 1000:.0f} ms typical, "
+            f"{stats['latency_p95'] * 1000:.0f} ms slow"
+        )
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def shared_pool(backend):
+    """The process-wide pool, or None when ``backend`` isn't pooled or the
+    pool is turned off."""
+    global _pool
+    if backend not in POOLED_BACKENDS or WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = RenderPool()
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def session_id():
+    """A stable id for the current Streamlit session."""
+    import uuid
+
+    import streamlit as st
+
+    return st.session_state.setdefault("_render_session", uuid.uuid4().hex)
+
+
+def pooled_frame(pool, session, key, args, draw_here, wait=None):
+    """Draw a frame in the pool. With ``wait`` (seconds), give up after that
+    long and return the session's latest finished frame instead, if it has
+    one; the new frame still lands in the cache for later.
+
+    ``draw_here()`` draws the frame on the calling thread. It is used when
+    the pool can't deliver: the frame failed, took longer than
+    ``RESULT_TIMEOUT``, or was dropped with no earlier frame to show."""
+    future = pool.request(session, key, args)
+    if wait is not None:
+        try:
+            data = future.result(timeout=wait)
+        except TimeoutError:
+            data = None
+        except Exception:
+            return draw_here()
+        if data is None:
+            data = pool.latest(session)
+        if data is not None:
+            return data
+    try:
+        data = future.result(timeout=RESULT_TIMEOUT)
+    except Exception:  # timed out, a dead worker, or the draw failed there
+        return draw_here()
+    if data is None:
+        # dropped for a newer frame of ours, which can only come from
+        # another thread of the same session; take whatever finished last
+        data = pool.latest(session)
+    return data if data is not None else draw_here()
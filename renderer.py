@@ -0,0 +1,230 @@
+"""Reusable frame renderer for the animated pages.
+
+Each page/session pair gets one ``BeamRenderer``. It builds its Figure, beam
+line and particle patches once and then only moves the circles on every
+frame: the static background is copied back from a saved snapshot and only
+the moving artists are redrawn (blitting).
+
+Figures come from the object-oriented ``matplotlib.figure.Figure`` API with
+their own Agg canvas. They are never registered with pyplot, so nothing
+piles up in pyplot's figure manager and sessions on different script threads
+never share global drawing state. A process-wide registry caps how many
+renderers (and so figures) can be alive at once.
+"""
+
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import animation
+
+
+# Matches st.pyplot's default savefig dpi so frames look the same as before
+DPI = 200
+
+# Which drawing backend the live animation loops use:
+#   "svg"    - svg_renderer.SvgRenderer, a few hundred bytes of SVG per frame
+#              and next to no server time (default)
+#   "raster" - raster.RasterRenderer, NumPy buffer -> PNG
+#   "figure" - BeamRenderer below, persistent matplotlib figure + blitting
+# Run benchmarks/bench_renderers.py for frames/s and bytes/frame of each.
+BACKEND = os.environ.get("LITTLE_COLLIDER_RENDERER", "svg")
+
+# Backends that draw vectors: their frames look the same at any DPI
+RESOLUTION_INDEPENDENT = {"svg"}
+
+# Most figures alive at once across all sessions. The least recently used
+# renderer is closed when a new one would go over the limit.
+MAX_LIVE_FIGURES = 32
+
+
+class BeamRenderer:
+    """Draws frames of one page's beam scene with matplotlib.
+
+    ``render(xs, flash)`` takes the particle x positions and whether the gold
+    flash is showing, and returns the frame as PNG bytes.
+    """
+
+    def __init__(self, page, dpi=DPI):
+        self.page = page
+        self.dpi = dpi
+        self._lock = threading.Lock()
+        self._figure = None
+
+    @property
+    def is_open(self):
+        return self._figure is not None
+
+    def _build(self):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from matplotlib.patches import Circle
+
+        scene = animation.SCENES[self.page]
+        size, (left, bottom, right, top) = animation.canvas_geometry(self.page)
+
+        fig = Figure(figsize=size, dpi=self.dpi)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_axes((left, bottom, right - left, top - bottom))
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.axis("off")
+
+        beam = scene["beam"]
+        ax.plot(
+            beam["x"], [beam["y"], beam["y"]],
+            linewidth=beam["width"], color=beam["color"], alpha=beam["alpha"],
+        )
+
+        # The moving bits are "animated" so a full draw leaves them out of
+        # the saved background
+        self._particles = []
+        for p in scene["particles"]:
+            circle = Circle((0, p["y"]), p["radius"], color=p["color"], animated=True)
+            ax.add_patch(circle)
+            self._particles.append(circle)
+
+        flash = scene["flash"]
+        self._flash = Circle(
+            (flash["x"], flash["y"]), flash["radius"],
+            color=flash["color"], alpha=flash["alpha"], animated=True,
+        )
+        ax.add_patch(self._flash)
+
+        canvas.draw()
+        self._background = canvas.copy_from_bbox(fig.bbox)
+        self._figure = fig
+        self._canvas = canvas
+        self._ax = ax
+
+    def render(self, xs, flash=False):
+        with self._lock:
+            built = self._figure is None
+            if built:
+                self._build()
+            png = self._draw(xs, flash)
+
+        # Outside our own lock: opening may close other renderers
+        if built:
+            _registry.opened(self)
+        else:
+            _registry.touched(self)
+        return png
+
+    def _draw(self, xs, flash):
+        from PIL import Image
+
+        canvas = self._canvas
+        canvas.restore_region(self._background)
+        for circle, x in zip(self._particles, xs):
+            circle.center = (x, circle.center[1])
+            self._ax.draw_artist(circle)
+        if flash:
+            self._ax.draw_artist(self._flash)
+        canvas.blit(self._figure.bbox)
+
+        rgba = canvas.buffer_rgba()
+        image = Image.frombuffer("RGBA", (rgba.shape[1], rgba.shape[0]), rgba, "raw", "RGBA", 0, 1)
+        out = io.BytesIO()
+        image.convert("RGB").save(out, format="PNG")
+        return out.getvalue()
+
+    def close(self):
+        """Drop the figure. The next ``render`` builds a fresh one."""
+        with self._lock:
+            if self._figure is None:
+                return
+            self._figure.clear()
+            self._figure = None
+            self._canvas = None
+            self._ax = None
+            self._background = None
+            self._particles = []
+            self._flash = None
+        _registry.closed(self)
+
+
+class _FigureRegistry:
+    """Keeps track of open renderers and enforces ``MAX_LIVE_FIGURES``."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._open = OrderedDict()
+
+    def opened(self, renderer):
+        with self._lock:
+            self._open[id(renderer)] = renderer
+            evict = []
+            while len(self._open) > self.limit:
+                _, oldest = self._open.popitem(last=False)
+                evict.append(oldest)
+        for oldest in evict:
+            oldest.close()
+
+    def touched(self, renderer):
+        with self._lock:
+            if id(renderer) in self._open:
+                self._open.move_to_end(id(renderer))
+
+    def closed(self, renderer):
+        with self._lock:
+            self._open.pop(id(renderer), None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._open)
+
+
+_registry = _FigureRegistry(MAX_LIVE_FIGURES)
+
+
+def figure_opened(owner):
+    """Count a figure made outside this module (anything with ``close()``)
+    against ``MAX_LIVE_FIGURES``."""
+    _registry.opened(owner)
+
+
+def figure_used(owner):
+    _registry.touched(owner)
+
+
+def figure_closed(owner):
+    _registry.closed(owner)
+
+
+def live_figures():
+    """How many renderer figures are alive in this process right now."""
+    return len(_registry)
+
+
+def uses_dpi(backend=BACKEND):
+    """Whether ``backend``'s frames depend on the DPI they are drawn at."""
+    return backend not in RESOLUTION_INDEPENDENT
+
+
+def make_renderer(page, backend=BACKEND, dpi=DPI):
+    if backend == "raster":
+        from raster import RasterRenderer
+
+        return RasterRenderer(page, dpi=dpi)
+    if backend == "svg":
+        from svg_renderer import SvgRenderer
+
+        return SvgRenderer(page)
+    if backend == "figure":
+        return BeamRenderer(page, dpi=dpi)
+    raise ValueError(f"Unknown renderer backend: {backend!r}")
+
+
+def session_renderer(page, backend=BACKEND, dpi=DPI):
+    """The current session's renderer for ``page`` (created on first use)."""
+    import streamlit as st
+
+    key = f"_renderer_{page}_{backend}" if dpi == DPI else f"_renderer_{page}_{backend}_{dpi}"
+    renderer = st.session_state.get(key)
+    if renderer is None:
+        renderer = make_renderer(page, backend, dpi)
+        st.session_state[key] = renderer
+    return renderer
@@ -0,0 +1,331 @@
+"""Toy LHC ring for the Collider Run page.
+
+Two beams go round the ring in opposite directions. Each beam is a train of
+bunches and each bunch is a cloud of particles; every particle is a row in a
+few NumPy arrays:
+
+    s   how far ahead of or behind its bunch's center it is (radians)
+    d   its energy, relative to the beam energy
+    x   how far off the ideal orbit it is, sideways
+    xp  how fast it drifts sideways
+
+One step moves all of them at once. The RF cavities keep each bunch
+together (``s`` and ``d`` swap into each other, so particles slosh back and
+forth around the bunch center), the focusing magnets pull ``x`` back to the
+orbit, and a little random kick keeps the beams from shrinking to nothing.
+
+Where the beams cross at ATLAS, CMS, ALICE and LHCb, every pair of bunches
+that meets there is a bunch crossing, and each crossing brings a random
+number of collisions. The tighter the focusing, the smaller the beams and the
+more collisions. Only a fixed sample of particles is drawn, however many are
+simulated.
+"""
+
+import io
+import threading
+
+import numpy as np
+
+
+RING_RADIUS = 1.0
+
+# The experiments and where they sit on the ring (the LHC's interaction
+# points 1, 2, 5 and 8; the ring is split into 8 equal octants). The last
+# number is how tightly the beams are squeezed there: ALICE and LHCb ask for
+# far fewer collisions than ATLAS and CMS.
+EXPERIMENTS = (
+    ("ATLAS", 0.0, 1.0),
+    ("ALICE", 45.0, 0.02),
+    ("CMS", 180.0, 1.0),
+    ("LHCb", 315.0, 0.1),
+)
+
+BUNCH_OPTIONS = (8, 48, 240, 2808)
+PARTICLE_OPTIONS = (10, 100, 1000)
+
+# Cap on simulated particles per beam; bigger requests get fewer per bunch
+MAX_PARTICLES = 300_000
+
+# Particles drawn per beam, however many there are
+MAX_DRAWN = 3000
+
+# Steps per frame and the bunches' angular speed per step at energy 0 / 100
+STEPS_PER_FRAME = 4
+OMEGA = (0.004, 0.012)
+
+# RF: how strongly energy and position within the bunch trade places
+RF_COUPLING = 0.05
+
+# Betatron motion: focusing strength range, random kick and damping per step
+FOCUS_RANGE = (0.02, 0.3)
+KICK = 2e-4
+DAMPING = 0.01
+
+# Mean collisions per bunch crossing for two bunches of PARTICLE_OPTIONS[1]
+# particles with a sideways spread of 0.01
+PILEUP_SCALE = 3.0
+
+# How far apart the bunch trains look on screen
+DRAW_SCALE = {"s": 1.0, "x": 6.0}
+
+BEAM_COLORS = ("deepskyblue", "orange")
+
+DPI = 100
+FIGSIZE = (6, 6)
+
+# Target time per frame while the beams run (seconds)
+FRAME_DELAY = 0.04
+
+
+class Beam:
+    def __init__(self, direction, bunches, per_bunch, rng, spread):
+        n = bunches * per_bunch
+        self.direction = direction
+        self.bunches = bunches
+        self.per_bunch = per_bunch
+        self.bunch = np.repeat(np.arange(bunches, dtype=np.int32), per_bunch)
+        spacing = 2 * np.pi / bunches
+        length = min(0.15 * spacing, 0.02)
+        self.s = (rng.standard_normal(n) * length).astype(np.float32)
+        # matched to the RF bucket (see Ring.step), so bunches keep their length
+        self.d = (rng.standard_normal(n) * length / 10).astype(np.float32)
+        self.x = (rng.standard_normal(n) * spread).astype(np.float32)
+        self.xp = np.zeros(n, dtype=np.float32)
+        self.drawn = np.sort(rng.choice(n, size=min(n, MAX_DRAWN), replace=False))
+
+    def centers(self, phase):
+        return (self.direction * phase + 2 * np.pi * np.arange(self.bunches) / self.bunches) % (2 * np.pi)
+
+    @property
+    def size(self):
+        return float(self.x.std())
+
+
+class Ring:
+    def __init__(self, energy, bunches, per_bunch, focus=0.5, seed=0):
+        self.rng = np.random.default_rng(seed)
+        # what was asked for, before the cap, so the page can tell whether
+        # the controls changed
+        self.requested = (energy, bunches, per_bunch)
+        per_bunch = max(1, min(per_bunch, MAX_PARTICLES // bunches))
+        self.energy = energy
+        self.omega = OMEGA[0] + (OMEGA[1] - OMEGA[0]) * energy / 100
+        self.focus = focus
+        self.beams = (
+            Beam(+1, bunches, per_bunch, self.rng, 0.02),
+            Beam(-1, bunches, per_bunch, self.rng, 0.02),
+        )
+        self.phase = 0.0
+        self.steps = 0
+        self.turns = 0.0
+        self.crossings = np.zeros(len(EXPERIMENTS), dtype=np.int64)
+        self.collisions = np.zeros(len(EXPERIMENTS), dtype=np.int64)
+
+    @property
+    def particles(self):
+        return sum(len(beam.s) for beam in self.beams)
+
+    @property
+    def per_bunch(self):
+        return self.beams[0].per_bunch
+
+    def step(self, steps=STEPS_PER_FRAME):
+        q = FOCUS_RANGE[0] + (FOCUS_RANGE[1] - FOCUS_RANGE[0]) * self.focus
+        for _ in range(steps):
+            before = self.phase
+            self.phase += self.omega
+            for beam in self.beams:
+                # RF bucket: energy and position in the bunch rotate into
+                # each other, so particles oscillate around the bunch center
+                beam.s += beam.d * (RF_COUPLING * 10)
+                beam.d -= beam.s * (RF_COUPLING / 10)
+                # Focusing magnets pull back to the orbit; kicks and damping
+                # balance out at a beam size set by the focusing
+                beam.xp -= (q * q) * beam.x
+                beam.xp *= 1 - DAMPING
+                beam.xp += KICK * self.rng.standard_normal(len(beam.xp), dtype=np.float32)
+                beam.x += beam.xp
+            self._cross(before, self.phase)
+        self.steps += steps
+        self.turns = self.phase / (2 * np.pi)
+
+    def _cross(self, before, after):
+        """Count bunch crossings and collisions at each experiment."""
+        bunches = self.beams[0].bunches
+        spacing = 2 * np.pi / bunches
+        angles = np.radians([angle for _, angle, _ in EXPERIMENTS])
+        # bunch k of beam 1 is at k*spacing + phase and bunch m of beam 2 at
+        # m*spacing - phase, so per step the bunches passing a point are the
+        # lattice points between the two phases
+        passed = [
+            np.floor((after - angles) / spacing) - np.floor((before - angles) / spacing),
+            np.floor((after + angles) / spacing) - np.floor((before + angles) / spacing),
+        ]
+        crossings = np.minimum(*passed).astype(np.int64)
+        if not crossings.any():
+            return
+        self.crossings += crossings
+        sizes = [beam.size for beam in self.beams]
+        squeeze = np.array([s for _, _, s in EXPERIMENTS])
+        mean = self.pileup(sizes) * squeeze
+        self.collisions += self.rng.poisson(mean * crossings)
+
+    def pileup(self, sizes=None):
+        """Mean collisions per bunch crossing at an unsqueezed experiment."""
+        sizes = sizes or [beam.size for beam in self.beams]
+        per_bunch = self.per_bunch / PARTICLE_OPTIONS[1]
+        area = (sizes[0] ** 2 + sizes[1] ** 2) / (2 * 0.01 ** 2)
+        return PILEUP_SCALE * per_bunch * per_bunch / max(area, 1e-6)
+
+    def drawn_positions(self, beam):
+        """x, y of the drawn sample of ``beam``."""
+        index = beam.drawn
+        angle = beam.centers(self.phase)[beam.bunch[index]] + DRAW_SCALE["s"] * beam.s[index]
+        radius = RING_RADIUS + DRAW_SCALE["x"] * beam.x[index] + 0.03 * beam.direction
+        return np.column_stack([radius * np.cos(angle), radius * np.sin(angle)])
+
+
+class RingRenderer:
+    """Persistent figure for a session's ring: the ring and the experiments
+    are drawn once, each beam is one scatter of at most ``MAX_DRAWN`` points."""
+
+    def __init__(self, dpi=DPI):
+        self.dpi = dpi
+        self._lock = threading.Lock()
+        self._figure = None
+
+    def _build(self):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from matplotlib.patches import Circle
+
+        fig = Figure(figsize=FIGSIZE, dpi=self.dpi)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_axes((0, 0, 1, 1))
+        ax.set_xlim(-1.45, 1.45)
+        ax.set_ylim(-1.45, 1.45)
+        ax.set_aspect("equal")
+        ax.axis("off")
+
+        ax.add_patch(Circle((0, 0), RING_RADIUS, fill=False, edgecolor="lightgray", linewidth=14))
+        for name, angle, _ in EXPERIMENTS:
+            a = np.radians(angle)
+            x, y = np.cos(a), np.sin(a)
+            ax.add_patch(Circle((x, y), 0.07, color="dimgray", zorder=3))
+            ax.text(1.25 * x, 1.25 * y, name, ha="center", va="center", fontsize=12, fontweight="bold")
+
+        self._scatters = [
+            ax.scatter([], [], s=3, linewidths=0, color=color, animated=True) for color in BEAM_COLORS
+        ]
+        canvas.draw()
+        self._background = canvas.copy_from_bbox(fig.bbox)
+        self._figure = fig
+        self._canvas = canvas
+        self._ax = ax
+
+    def render(self, ring):
+        from renderer import figure_opened, figure_used
+
+        with self._lock:
+            built = self._figure is None
+            if built:
+                self._build()
+            png = self._draw(ring)
+        if built:
+            figure_opened(self)
+        else:
+            figure_used(self)
+        return png
+
+    def _draw(self, ring):
+        from PIL import Image
+
+        canvas = self._canvas
+        canvas.restore_region(self._background)
+        for scatter, beam in zip(self._scatters, ring.beams):
+            scatter.set_offsets(ring.drawn_positions(beam))
+            self._ax.draw_artist(scatter)
+        canvas.blit(self._figure.bbox)
+
+        rgba = canvas.buffer_rgba()
+        image = Image.frombuffer("RGBA", (rgba.shape[1], rgba.shape[0]), rgba, "raw", "RGBA", 0, 1)
+        out = io.BytesIO()
+        image.convert("RGB").save(out, format="PNG", compress_level=1)
+        return out.getvalue()
+
+    def close(self):
+        from renderer import figure_closed
+
+        with self._lock:
+            if self._figure is None:
+                return
+            self._figure.clear()
+            self._figure = None
+            self._canvas = None
+            self._ax = None
+            self._background = None
+            self._scatters = []
+        figure_closed(self)
+
+
+def ring_panel(energy):
+    """Collider Run's "LHC ring" view. The page runs it in a fragment, so
+    each frame only reruns this panel."""
+    import streamlit as st
+    from scheduler import next_frame, session_scheduler
+
+    st.write(
+        "The real LHC is a **27 km ring**. Two beams fly around it in opposite directions, "
+        "each made of bunches of particles, and they cross where the big experiments sit."
+    )
+    col1, col2, col3 = st.columns(3)
+    bunches = col1.select_slider("🚃 Bunches per beam", options=BUNCH_OPTIONS, value=48)
+    per_bunch = col2.select_slider("⚛️ Particles per bunch", options=PARTICLE_OPTIONS, value=100)
+    focus = col3.slider("🧲 Focusing magnets", 0.0, 1.0, 0.5, 0.05, help="Stronger focusing = thinner beams")
+
+    st.session_state.setdefault("ring_running", False)
+    ring = st.session_state.get("ring")
+    renderer = st.session_state.setdefault("ring_renderer", RingRenderer())
+
+    col1, col2, col3 = st.columns(3)
+    if col1.button("▶ Start beams"):
+        if ring is None or ring.requested != (energy, bunches, per_bunch):
+            ring = st.session_state.ring = Ring(energy, bunches, per_bunch, focus)
+        st.session_state.ring_running = True
+    if col2.button("⏸ Stop beams"):
+        st.session_state.ring_running = False
+    if col3.button("↩ Refill"):
+        ring = st.session_state.ring = None
+        st.session_state.ring_running = False
+
+    if ring is None:
+        st.write("Press **Start beams** to fill the ring.")
+        return
+
+    # A fixed number of steps per frame; the scheduler paces the frames
+    scheduler = session_scheduler("ring", FRAME_DELAY, scales_dpi=False)
+    scheduler.tick(st.session_state.ring_running)
+    ring.focus = focus
+    if st.session_state.ring_running:
+        ring.step()
+
+    with scheduler.drawing():
+        st.image(renderer.render(ring), width="stretch")
+
+    st.caption(
+        f"{ring.particles:,} particles in {ring.beams[0].bunches * 2:,} bunches, "
+        f"{ring.turns:.2f} turns; {sum(len(beam.drawn) for beam in ring.beams):,} of them are drawn."
+    )
+    st.table([
+        {
+            "Experiment": name,
+            "Bunch crossings": f"{crossings:,}",
+            "Collisions": f"{collisions:,}",
+            "Per crossing": f"{collisions / crossings:.2f}" if crossings else "-",
+        }
+        for (name, _, _), crossings, collisions in zip(EXPERIMENTS, ring.crossings, ring.collisions)
+    ])
+
+    if st.session_state.ring_running:
+        scheduler.wait()
+        next_frame()
@@ -0,0 +1,192 @@
+"""Wall-clock frame scheduling for the classic (server loop) animations.
+
+The classic loops used to move the particles a fixed step per rerun and then
+sleep a fixed delay. On a busy server every rerun takes longer, so the
+particles slowed down with it: a one-second run could take ten. Now each
+session's ``FrameScheduler`` works out how much time really passed since the
+last frame and the page moves the particles by that much, so a run takes the
+same time however many frames make it to the screen.
+
+It also watches what frames cost. When drawing a frame keeps eating most of
+the frame's time budget, or frames keep arriving late, it steps down a
+quality level (smaller DPI, then fewer frames per second) so the loop stops
+piling work onto an overloaded box; when things are comfortable again it
+steps back up. Loops whose frames don't depend on the DPI (the svg backend,
+the ring and shower pictures) only step the frame rate.
+"""
+
+import time
+from contextlib import contextmanager
+
+import animation
+
+
+# Quality levels, best first: (share of the target frame rate, share of the
+# renderer's DPI). Dropping the frame rate just means the particles jump a
+# bit further between frames; their speed doesn't change.
+LEVELS = (
+    (1.0, 1.0),
+    (1.0, 0.75),
+    (0.5, 0.5),
+    (0.25, 0.5),
+)
+
+# The same frame rates at full DPI, for loops where the DPI changes nothing
+FPS_LEVELS = tuple(dict.fromkeys((fps, 1.0) for fps, _ in LEVELS))
+
+# Step down when drawing takes more than this share of a frame's time, or a
+# frame arrives this many times later than planned...
+BUDGET_SHARE = 0.8
+LATE_FACTOR = 1.5
+OVERRUNS_TO_DEGRADE = 3
+
+# ...and back up after this many frames in a row with drawing under this
+# share of the budget of the next better level
+RECOVER_SHARE = 0.4
+FRAMES_TO_RECOVER = 30
+
+# Weight of the newest frame in the running averages
+SMOOTHING = 0.2
+
+# Longest gap that still counts as motion, so coming back to a page that was
+# left "running" doesn't teleport the particles to the end
+MAX_GAP = 0.5
+
+
+class FrameScheduler:
+    """Frame timing for one page in one session.
+
+    ``frame_delay`` is the target time per frame, for loops that aren't one
+    of the ``animation`` pages (which have theirs in ``FRAME_DELAY``).
+    ``scales_dpi=False`` is for loops whose frames look the same at any DPI:
+    they only step down the frame rate.
+    """
+
+    def __init__(self, page, clock=time.perf_counter, frame_delay=None, scales_dpi=True):
+        self.page = page
+        self.clock = clock
+        self.levels = LEVELS if scales_dpi else FPS_LEVELS
+        self.frame_delay = frame_delay or animation.FRAME_DELAY[page]
+        self.target_fps = 1 / self.frame_delay
+        self.level = 0
+        self.frames = 0
+        self.render_cost = 0.0
+        self.frame_interval = 0.0
+        self._last = None
+        self._carry = 0.0
+        self._overruns = 0
+        self._comfortable = 0
+
+    @property
+    def fps(self):
+        """Frame rate we are aiming for at the current quality level."""
+        return self.target_fps * self.levels[self.level][0]
+
+    @property
+    def interval(self):
+        return 1 / self.fps
+
+    @property
+    def dpi_scale(self):
+        return self.levels[self.level][1]
+
+    @property
+    def achieved_fps(self):
+        return 1 / self.frame_interval if self.frame_interval else 0.0
+
+    def tick(self, running):
+        """Start a frame. Returns how many nominal frames' worth of motion to
+        apply (the step functions move by ``speed`` per nominal frame), or 0
+        when the animation isn't running.
+
+        The count is whole frames, with the leftover time carried over, so
+        the particles stay on the same positions as everybody else's runs
+        and the shared frame cache keeps hitting."""
+        now = self.clock()
+        last, self._last = self._last, (now if running else None)
+        if not running or last is None:
+            self._carry = 0.0
+            return 0
+        gap = now - last
+        late = gap > LATE_FACTOR * self.interval
+        self.frame_interval = gap if not self.frames else _smooth(self.frame_interval, gap)
+        self.frames += 1
+        self._judge(late)
+        frames = min(gap, MAX_GAP) / self.frame_delay + self._carry
+        whole = int(frames)
+        self._carry = frames - whole
+        return whole
+
+    @contextmanager
+    def drawing(self):
+        """Time the frame drawing inside the ``with`` block."""
+        started = self.clock()
+        try:
+            yield
+        finally:
+            cost = self.clock() - started
+            self.render_cost = cost if not self.render_cost else _smooth(self.render_cost, cost)
+
+    def wait(self):
+        """Sleep whatever is left of this frame's time (nothing if it already
+        overran) before the page reruns."""
+        if self._last is None:
+            return
+        left = self.interval - (self.clock() - self._last)
+        if left > 0:
+            time.sleep(left)
+
+    def _judge(self, late):
+        if late or self.render_cost > BUDGET_SHARE * self.interval:
+            self._comfortable = 0
+            self._overruns += 1
+            if self._overruns >= OVERRUNS_TO_DEGRADE and self.level < len(self.levels) - 1:
+                self.level += 1
+                self._overruns = 0
+            return
+
+        self._overruns = 0
+        if self.level == 0:
+            return
+        better = 1 / (self.target_fps * self.levels[self.level - 1][0])
+        if self.render_cost < RECOVER_SHARE * better:
+            self._comfortable += 1
+            if self._comfortable >= FRAMES_TO_RECOVER:
+                self.level -= 1
+                self._comfortable = 0
+        else:
+            self._comfortable = 0
+
+    def report(self):
+        quality = "full quality" if self.level == 0 else f"reduced quality (level {self.level})"
+        return (
+            f"🎞️ {self.achieved_fps:.0f} of {self.target_fps:.0f} frames/s · "
+            f"drawing {self.render_cost * 1000:.0f} ms per frame · {quality}"
+        )
+
+
+def _smooth(average, value):
+    return average + SMOOTHING * (value - average)
+
+
+def next_frame():
+    """Rerun for the next frame: just the calling fragment when this is
+    already a fragment rerun, otherwise the whole app (Streamlit won't rerun
+    a fragment on its own in the middle of a full run). The loops start from
+    their Start button, inside the fragment, so that is the usual case."""
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    st.rerun(scope="fragment" if ctx is not None and ctx.fragment_ids_this_run else "app")
+
+
+def session_scheduler(page, frame_delay=None, scales_dpi=True):
+    """The current session's scheduler for ``page``."""
+    import streamlit as st
+
+    key = f"_scheduler_{page}"
+    scheduler = st.session_state.get(key)
+    if scheduler is None:
+        scheduler = st.session_state[key] = FrameScheduler(page, frame_delay=frame_delay, scales_dpi=scales_dpi)
+    return scheduler
@@ -0,0 +1,30 @@
+"""Run Little Collider with the image variants served as immutable static files.
+
+    uvicorn serve:app --host 0.0.0.0 --port 8501
+
+This is the same app as ``streamlit run app.py``, plus a route that serves
+``assets/build`` with far-future cache headers (see static_assets.py). Build
+the variants first with ``python asset_pipeline.py`` so the very first
+visitors already get URLs; anything not built yet is sent as bytes like
+before. deploy/nginx.conf shows an optional caching proxy in front of it.
+
+Image URLs are built from the origin each browser loaded the app from. Set
+LITTLE_COLLIDER_PUBLIC_URL (e.g. ``https://collider.myschool.example``) if
+that isn't where the files should be fetched from, or set
+LITTLE_COLLIDER_STATIC_URL to a full URL yourself.
+"""
+
+import os
+
+import streamlit as st
+from starlette.routing import Mount
+
+from static_assets import STATIC_ROUTE, STATIC_URL_ENV, immutable_static_files
+
+
+os.environ.setdefault(STATIC_URL_ENV, STATIC_ROUTE)
+
+app = st.App(
+    "app.py",
+    routes=[Mount(STATIC_ROUTE, app=immutable_static_files(), name="assets-immutable")],
+)
@@ -0,0 +1,338 @@
+"""Particle shower for the Collision Lab.
+
+When the beams collide, the crash point sprays out hundreds or thousands of
+daughter particles. Every particle lives in a few NumPy arrays (position,
+velocity, charge, ...) and a frame is one vectorized update of all of them:
+charged particles curve in the detector's magnet, everything slows down a
+little, close pairs bounce off each other, and particles that reach the
+detector wall stop there and light it up.
+
+Close pairs are found with a uniform grid: particles are sorted by the cell
+they are in, and each one is only compared with the particles in its own and
+the neighbouring cells, not with all the others. Drawing uses one ``scatter``
+collection per kind of particle on a persistent figure (see renderer.py for
+the blitting trick): Agg only takes its fast marker path when every marker in
+a collection has the same color, and one multi-colored scatter of 10,000
+points took ~15x longer to draw than the five single-colored ones.
+"""
+
+import io
+import threading
+
+import numpy as np
+
+from catalog import catalog
+
+
+# The detector is the unit square; the crash happens in the middle
+CENTER = (0.5, 0.5)
+
+# Particles closer than this bounce off each other (unit-square lengths).
+# Grid cells are this wide, so every close pair sits in neighbouring cells.
+INTERACTION_RADIUS = 0.004
+GRID = int(1 / INTERACTION_RADIUS)
+
+# Daughters start together, so they only start bumping into each other
+# once they had a few frames to spread out
+SPREAD_FRAMES = 15
+
+# Toy magnet: how far a charged particle turns each frame (radians). The
+# circle it would fly is proportional to its speed, like in a real magnet.
+FIELD = 0.015
+
+# Particles slow down a little every frame as they plough through the
+# detector, and stop inside it once they are slower than MIN_SPEED
+DRAG = 0.004
+MIN_SPEED = 0.0006
+
+# Which particles a shower is made of, by collision energy: (catalog id,
+# charge, weight at energy 0, weight at energy 100)
+DAUGHTERS = (
+    ("photon", 0, 6.0, 3.0),
+    ("electron", -1, 3.0, 2.0),
+    ("pion", 1, 0.5, 3.0),
+    ("muon", -1, 0.2, 1.5),
+    ("rare_toy", 0, 0.0, 0.3),
+)
+
+SIZES = (200, 1000, 5000, 10000)
+
+DPI = 100
+FIGSIZE = (6, 6)
+
+# Target time per frame while the shower runs (seconds)
+FRAME_DELAY = 0.05
+
+# Offsets of the neighbouring cells. Only half of them are needed: the pair
+# (a, b) in cells (0, 0) and (1, 0) is the same pair seen from the other side.
+_HALF_STENCIL = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+
+class Shower:
+    def __init__(self, energy, n, seed=0):
+        rng = np.random.default_rng(seed)
+        self.energy = energy
+        self.n = n
+        self.frame = 0
+        self.bounces = 0
+
+        weights = np.array([w0 + (w1 - w0) * energy / 100 for _, _, w0, w1 in DAUGHTERS])
+        self.kind = rng.choice(len(DAUGHTERS), size=n, p=weights / weights.sum())
+        self.charge = np.array([charge for _, charge, _, _ in DAUGHTERS], dtype=np.float32)[self.kind]
+
+        angle = rng.uniform(0, 2 * np.pi, n)
+        speed = (0.002 + 0.006 * energy / 100) * rng.gamma(4.0, 0.25, n)
+        self.vel = np.stack([np.cos(angle), np.sin(angle)], axis=1) * speed[:, None]
+        self.pos = np.tile(np.array(CENTER), (n, 1)) + self.vel * rng.random(n)[:, None]
+        self.stopped = np.zeros(n, dtype=bool)
+        self.hit_wall = np.zeros(n, dtype=bool)
+
+    @property
+    def done(self):
+        return bool(self.stopped.all())
+
+    def step(self):
+        """Advance every particle by one frame."""
+        moving = ~self.stopped
+        vel = self.vel
+
+        # Magnet: turn each charged particle's velocity by a small angle
+        turn = FIELD * self.charge
+        cos, sin = np.cos(turn), np.sin(turn)
+        vx, vy = vel[:, 0].copy(), vel[:, 1]
+        vel[:, 0] = vx * cos - vy * sin
+        vel[:, 1] = vx * sin + vy * cos
+        vel *= 1 - DRAG
+
+        self.pos[moving] += vel[moving]
+
+        # Detector wall: stop there and stay as a hit
+        outside = moving & ((self.pos < 0) | (self.pos > 1)).any(axis=1)
+        np.clip(self.pos, 0, 1, out=self.pos)
+        self.hit_wall |= outside
+        self.stopped |= outside | ((vel * vel).sum(axis=1) < MIN_SPEED * MIN_SPEED)
+        vel[self.stopped] = 0
+
+        if self.frame >= SPREAD_FRAMES:
+            self.bounces += self._bounce(np.flatnonzero(~self.stopped))
+        self.frame += 1
+
+    def _bounce(self, index):
+        """Elastic bounce for every pair of moving particles that touch."""
+        i, j = close_pairs(self.pos[index], INTERACTION_RADIUS)
+        if not len(i):
+            return 0
+        i, j = index[i], index[j]
+        d = self.pos[j] - self.pos[i]
+        dist = np.maximum(np.hypot(d[:, 0], d[:, 1]), 1e-9)
+        normal = d / dist[:, None]
+        approach = ((self.vel[i] - self.vel[j]) * normal).sum(axis=1)
+        hit = approach > 0
+        i, j, normal, approach = i[hit], j[hit], normal[hit], approach[hit]
+
+        # A particle bounces off at most one other per frame, so every
+        # bounce is a clean two-body one and no energy is made up
+        pair = np.arange(len(i))
+        owner = np.full(self.n, -1)
+        owner[np.concatenate([j, i])[::-1]] = np.concatenate([pair, pair])[::-1]
+        first = (owner[i] == pair) & (owner[j] == pair)
+        i, j = i[first], j[first]
+
+        # Equal masses: swap the velocity parts along the line between them
+        impulse = normal[first] * approach[first, None]
+        self.vel[i] -= impulse
+        self.vel[j] += impulse
+        return len(i)
+
+
+def close_pairs(pos, radius, grid=None):
+    """Index pairs ``(i, j)``, ``i < j`` in cell order, of points in ``pos``
+    closer than ``radius`` (positions in the unit square)."""
+    grid = grid or int(1 / radius)
+    n = len(pos)
+    if n < 2:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    cell = np.clip((pos * grid).astype(np.intp), 0, grid - 1)
+    key = cell[:, 0] * grid + cell[:, 1]
+    order = np.argsort(key, kind="stable")
+    sorted_key = key[order]
+    cx, cy = cell[order, 0], cell[order, 1]
+    rank = np.arange(n)
+
+    firsts, seconds = [], []
+    for dx, dy in _HALF_STENCIL:
+        nx, ny = cx + dx, cy + dy
+        valid = (nx < grid) & (ny >= 0) & (ny < grid)
+        neighbour = nx * grid + ny
+        lo = np.searchsorted(sorted_key, neighbour, "left")
+        hi = np.searchsorted(sorted_key, neighbour, "right")
+        if (dx, dy) == (0, 0):
+            lo = rank + 1  # same cell: only the ones after me
+        counts = np.where(valid, np.maximum(hi - lo, 0), 0)
+        total = int(counts.sum())
+        if not total:
+            continue
+        a = np.repeat(rank, counts)
+        starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+        b = starts + np.arange(total)
+        firsts.append(a)
+        seconds.append(b)
+
+    if not firsts:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    a = order[np.concatenate(firsts)]
+    b = order[np.concatenate(seconds)]
+    d = pos[a] - pos[b]
+    near = (d * d).sum(axis=1) < radius * radius
+    return a[near], b[near]
+
+
+class ShowerRenderer:
+    """Persistent figure for a session's shower, one scatter per kind of particle."""
+
+    def __init__(self, dpi=DPI):
+        self.dpi = dpi
+        self._lock = threading.Lock()
+        self._figure = None
+
+    def _build(self):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from matplotlib.patches import Circle, Rectangle
+
+        fig = Figure(figsize=FIGSIZE, dpi=self.dpi, facecolor="#0b1020")
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_axes((0.02, 0.02, 0.96, 0.96))
+        ax.set_xlim(-0.02, 1.02)
+        ax.set_ylim(-0.02, 1.02)
+        ax.set_aspect("equal")
+        ax.axis("off")
+
+        # detector wall, beam pipe and the crash point
+        ax.add_patch(Rectangle((0, 0), 1, 1, fill=False, edgecolor="#5a6b8c", linewidth=3))
+        ax.plot([0, 1], [CENTER[1], CENTER[1]], color="#2a3550", linewidth=6, zorder=0)
+        ax.add_patch(Circle(CENTER, 0.015, color="gold", alpha=0.8))
+
+        particles = catalog().particles
+        self._scatters = [
+            ax.scatter([], [], s=4, linewidths=0, color=particles[pid]["color"], animated=True)
+            for pid, _, _, _ in DAUGHTERS
+        ]
+        canvas.draw()
+        self._background = canvas.copy_from_bbox(fig.bbox)
+        self._figure = fig
+        self._canvas = canvas
+        self._ax = ax
+        self._groups_for = None
+
+    def render(self, shower):
+        from renderer import figure_opened, figure_used
+
+        with self._lock:
+            built = self._figure is None
+            if built:
+                self._build()
+            png = self._draw(shower)
+        if built:
+            figure_opened(self)
+        else:
+            figure_used(self)
+        return png
+
+    def _draw(self, shower):
+        from PIL import Image
+
+        if self._groups_for is not shower:
+            self._groups = [np.flatnonzero(shower.kind == k) for k in range(len(DAUGHTERS))]
+            self._groups_for = shower
+
+        canvas = self._canvas
+        canvas.restore_region(self._background)
+        for scatter, group in zip(self._scatters, self._groups):
+            scatter.set_offsets(shower.pos[group])
+            self._ax.draw_artist(scatter)
+        canvas.blit(self._figure.bbox)
+
+        rgba = canvas.buffer_rgba()
+        image = Image.frombuffer("RGBA", (rgba.shape[1], rgba.shape[0]), rgba, "raw", "RGBA", 0, 1)
+        out = io.BytesIO()
+        image.convert("RGB").save(out, format="PNG", compress_level=1)
+        return out.getvalue()
+
+    def close(self):
+        from renderer import figure_closed
+
+        with self._lock:
+            if self._figure is None:
+                return
+            self._figure.clear()
+            self._figure = None
+            self._canvas = None
+            self._ax = None
+            self._background = None
+            self._scatters = []
+            self._groups_for = None
+        figure_closed(self)
+
+
+def shower_panel(energy):
+    """The Collision Lab's "particle shower" view. The page runs it in a
+    fragment, so each frame only reruns this panel."""
+    import streamlit as st
+    import time
+    from scheduler import next_frame, session_scheduler
+
+    st.write(
+        "When the beams crash, the energy turns into a spray of new particles — a **shower**. "
+        "Charged ones curve in the detector's magnet, and the detector wall lights up where they land."
+    )
+    n = st.select_slider("✨ Particles in the shower", options=SIZES, value=1000, format_func=lambda v: f"{v:,}")
+
+    st.session_state.setdefault("shower_running", False)
+    shower = st.session_state.get("shower")
+    renderer = st.session_state.setdefault("shower_renderer", ShowerRenderer())
+
+    col1, col2, col3 = st.columns(3)
+    if col1.button("💥 Collide!"):
+        shower = st.session_state.shower = Shower(energy, n, seed=int(time.time()))
+        st.session_state.shower_running = True
+    if col2.button("⏯ Pause / go"):
+        st.session_state.shower_running = not st.session_state.shower_running and shower is not None
+    if col3.button("↩ Clear"):
+        shower = st.session_state.shower = None
+        st.session_state.shower_running = False
+
+    if shower is None:
+        st.write("Press **Collide!** to start a shower.")
+        return
+
+    # One physics step per frame; the scheduler only paces the frames so a
+    # running shower doesn't redraw as fast as the CPU allows
+    scheduler = session_scheduler("shower", FRAME_DELAY, scales_dpi=False)
+    scheduler.tick(st.session_state.shower_running)
+    if st.session_state.shower_running:
+        started = time.perf_counter()
+        shower.step()
+        step_ms = (time.perf_counter() - started) * 1000
+    else:
+        step_ms = 0.0
+
+    started = time.perf_counter()
+    with scheduler.drawing():
+        st.image(renderer.render(shower), width="stretch")
+    draw_ms = (time.perf_counter() - started) * 1000
+
+    flying = int((~shower.stopped).sum())
+    walls = int(shower.hit_wall.sum())
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Still flying", f"{flying:,}")
+    col2.metric("Reached the wall", f"{walls:,}")
+    col3.metric("Stopped inside", f"{shower.n - flying - walls:,}")
+    col4.metric("Bounces", f"{shower.bounces:,}")
+    st.caption(f"Frame {shower.frame}: physics {step_ms:.1f} ms, drawing {draw_ms:.1f} ms.")
+
+    if shower.done:
+        st.session_state.shower_running = False
+    if st.session_state.shower_running:
+        scheduler.wait()
+        next_frame()
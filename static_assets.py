@@ -0,0 +1,100 @@
+"""Serve the built image variants as long-lived static files.
+
+Every file in ``assets/build`` is named after a hash of its bytes, so a URL
+never changes meaning and browsers (or a proxy in front of the app) can keep
+it forever. ``serve.py`` mounts that folder at ``STATIC_ROUTE`` with
+``Cache-Control: public, max-age=31536000, immutable`` and turns this mode on.
+
+In static mode the pages hand ``st.image`` a URL instead of the image bytes.
+Streamlit then only sends the URL over the websocket, nothing gets registered
+with the media file manager per session, and repeat visits, page switches
+and even server restarts cost no image bytes from our server. Because the
+browser fetches the file itself, WebP is fine here too (st.image would
+re-encode it if we passed the bytes).
+
+``st.image`` only passes ``http(s)://`` and ``data:`` URLs through; anything
+else is opened as a local file. So the URLs are always absolute: when
+``LITTLE_COLLIDER_STATIC_URL`` is a path (serve.py sets ``/assets-immutable``)
+it is joined to ``LITTLE_COLLIDER_PUBLIC_URL`` if that is set, or else to the
+origin the browser loaded the app from. With neither, the pages send bytes.
+"""
+
+import os
+from urllib.parse import urlsplit
+
+from asset_pipeline import BUILD_DIR, ROOT
+
+
+STATIC_ROUTE = "/assets-immutable"
+
+# Set by serve.py; empty means the pages keep sending bytes
+STATIC_URL_ENV = "LITTLE_COLLIDER_STATIC_URL"
+
+# e.g. https://collider.myschool.example, for when the browser's origin
+# isn't the one the static files should come from
+PUBLIC_URL_ENV = "LITTLE_COLLIDER_PUBLIC_URL"
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+URL_FORMATS = ("webp", "jpeg", "png")
+
+
+def _is_absolute(url):
+    return urlsplit(url).scheme in ("http", "https")
+
+
+def _browser_origin():
+    """``scheme://host`` of the page the current session was loaded from, if known."""
+    try:
+        import streamlit as st
+
+        url = st.context.url
+    except Exception:  # no session (e.g. a script or a test), or an older Streamlit
+        return None
+    if not url or not _is_absolute(url):
+        return None
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def static_base_url():
+    """Absolute URL the built variants are served from, or ``None`` when static mode is off."""
+    base = os.environ.get(STATIC_URL_ENV, "").rstrip("/")
+    if not base or _is_absolute(base):
+        return base or None
+    origin = os.environ.get(PUBLIC_URL_ENV, "").rstrip("/") or _browser_origin()
+    if origin is None:
+        return None
+    return origin + "/" + base.lstrip("/")
+
+
+def static_url(variant):
+    """A cacheable URL for a built ``variant`` (as picked by ``best_variant``).
+
+    ``None`` when static mode is off or ``variant`` is a source image, which
+    isn't under the served folder.
+    """
+    base = static_base_url()
+    if base is None:
+        return None
+    if not (ROOT / variant).is_relative_to(BUILD_DIR):
+        return None
+    relative = (ROOT / variant).relative_to(BUILD_DIR).as_posix()
+    return f"{base}/{relative}"
+
+
+def immutable_static_files():
+    """A Starlette app serving ``assets/build`` with far-future cache headers."""
+    from starlette.staticfiles import StaticFiles
+
+    class ImmutableStaticFiles(StaticFiles):
+        def file_response(self, *args, **kwargs):
+            response = super().file_response(*args, **kwargs)
+            if response.status_code in (200, 304) and not str(args[0]).endswith(".json"):
+                response.headers["Cache-Control"] = IMMUTABLE
+            else:
+                response.headers["Cache-Control"] = "no-cache"
+            return response
+
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    return ImmutableStaticFiles(directory=BUILD_DIR)
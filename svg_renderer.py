@@ -0,0 +1,66 @@
+"""SVG drawing backend for the beam canvases.
+
+A frame is a few hundred bytes of markup: the beam line and the static
+header are formatted once, and each frame only fills in the ellipse
+centers. The browser does the rasterizing.
+"""
+
+import animation
+
+
+class SvgRenderer:
+    """Same interface as ``renderer.BeamRenderer``, but ``render`` returns an SVG string."""
+
+    def __init__(self, page, dpi=None):
+        self.page = page
+        self.dpi = dpi
+        scene = animation.SCENES[page]
+        (width_in, height_in), (left, bottom, right, top) = animation.canvas_geometry(page)
+        # work in points (1/72"), like matplotlib's own SVG output
+        self.width = width_in * 72
+        self.height = height_in * 72
+        self._x0 = left * self.width
+        self._sx = (right - left) * self.width
+        self._y0 = (1 - bottom) * self.height
+        self._sy = (top - bottom) * self.height
+
+        beam = scene["beam"]
+        (x0, y), (x1, _) = self._px(beam["x"][0], beam["y"]), self._px(beam["x"][1], beam["y"])
+        self._head = (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width:.1f}pt" height="{self.height:.1f}pt" '
+            f'viewBox="0 0 {self.width:.1f} {self.height:.1f}">'
+            f'<rect width="100%" height="100%" fill="white"/>'
+            f'<line x1="{x0:.2f}" y1="{y:.2f}" x2="{x1:.2f}" y2="{y:.2f}" stroke="{beam["color"]}" '
+            f'stroke-width="{beam["width"]}" stroke-opacity="{beam["alpha"]}" stroke-linecap="square"/>'
+        )
+        self._particles = [
+            (self._py(p["y"]), p["radius"] * self._sx, p["radius"] * self._sy, p["color"])
+            for p in scene["particles"]
+        ]
+        flash = scene["flash"]
+        fx, fy = self._px(flash["x"], flash["y"])
+        self._flash = (
+            f'<ellipse cx="{fx:.2f}" cy="{fy:.2f}" rx="{flash["radius"] * self._sx:.2f}" '
+            f'ry="{flash["radius"] * self._sy:.2f}" fill="{flash["color"]}" fill-opacity="{flash["alpha"]}"/>'
+        )
+
+    def _px(self, x, y):
+        return self._x0 + x * self._sx, self._py(y)
+
+    def _py(self, y):
+        return self._y0 - y * self._sy
+
+    def render(self, xs, flash=False):
+        parts = [self._head]
+        for (cy, rx, ry, color), x in zip(self._particles, xs):
+            cx = self._x0 + x * self._sx
+            parts.append(
+                f'<ellipse cx="{cx:.2f}" cy="{cy:.2f}" rx="{rx:.2f}" ry="{ry:.2f}" fill="{color}"/>'
+            )
+        if flash:
+            parts.append(self._flash)
+        parts.append("</svg>")
+        return "".join(parts)
+
+    def close(self):
+        pass
@@ -0,0 +1,94 @@
+"""Writing, indexing and querying recorded events (eventfile.py)."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import eventfile  # noqa: E402
+import events  # noqa: E402
+from eventfile import EventFile, EventWriter, open_recording, record  # noqa: E402
+
+
+def _batch(energy, outcome):
+    energy = np.asarray(energy, dtype=np.float64)
+    return {
+        "energy": energy,
+        "outcome": np.asarray(outcome, dtype=np.int8),
+        "angle": np.full(len(energy), 30.0),
+        "momentum": energy / 2,
+    }
+
+
+def _save(path, batches):
+    with EventWriter(path, energy=40, seed=1) as writer:
+        for batch in batches:
+            writer.write(batch)
+    return EventFile(path)
+
+
+def test_round_trip(tmp_path):
+    f = _save(tmp_path / "run.lcev", [_batch([10.5, 60.25], [0, 1]), _batch([99.0], [2])])
+    assert len(f) == 3
+    assert (f.energy, f.seed) == (40.0, 1)
+    assert f.page(1, 10)["energy"].tolist() == [60.25, 99.0]
+    assert f.page(0, 3)["outcome"].tolist() == [0, 1, 2]
+
+
+def test_select_matches_a_full_scan(tmp_path):
+    rng = np.random.default_rng(7)
+    outcomes = len(events.outcome_ids())
+    batches = [_batch(rng.uniform(0, 100, 500), rng.integers(0, outcomes, 500)) for _ in range(4)]
+    f = _save(tmp_path / "run.lcev", batches)
+    records = np.asarray(f.records)
+    for selected_outcomes, energy in [
+        (None, None),
+        ([1], None),
+        (None, (20.0, 20.9)),
+        ([0, 2], (12.5, 67.25)),
+        ([1], (0.0, 100.0)),
+    ]:
+        mask = np.ones(len(records), dtype=bool)
+        if selected_outcomes is not None:
+            mask &= np.isin(records["outcome"], selected_outcomes)
+        if energy is not None:
+            mask &= (records["energy"] >= energy[0]) & (records["energy"] <= energy[1])
+        assert f.select(selected_outcomes, energy).tolist() == np.flatnonzero(mask).tolist()
+
+
+def test_index_uses_the_stored_float32_energy(tmp_path):
+    # 40.999999999 is stored as float32 41.0, so it belongs in bin 41
+    assert np.float32(40.999999999) == 41.0
+    f = _save(tmp_path / "run.lcev", [_batch([40.999999999, 40.5], [0, 0])])
+    assert f.select(energy=(41.0, 41.0)).tolist() == [0]
+    assert f.select(energy=(40.0, 40.9)).tolist() == [1]
+    assert f.counts(energy=(41, 41))[0] == 1
+
+
+def test_counts_come_from_the_index(tmp_path):
+    f = _save(tmp_path / "run.lcev", [_batch([5.0, 5.5, 70.0, 100.0], [0, 1, 1, 2])])
+    assert f.counts()[:3].tolist() == [1, 2, 1]
+    assert f.counts(energy=(0, 10))[:3].tolist() == [1, 1, 0]
+
+
+def test_failed_write_leaves_nothing_behind(tmp_path):
+    with pytest.raises(RuntimeError):
+        with EventWriter(tmp_path / "run.lcev") as writer:
+            writer.write(_batch([1.0], [0]))
+            raise RuntimeError("boom")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_identical_runs_get_their_own_files(tmp_path):
+    first = record(40, 100, seed=3, directory=tmp_path)
+    second = record(40, 100, seed=3, directory=tmp_path)
+    assert first != second
+    assert sorted(tmp_path.iterdir()) == sorted([first, second])
+
+
+def test_open_recordings_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(eventfile, "MAX_OPEN_FILES", 2)
+    monkeypatch.setattr(eventfile, "_open_files", eventfile.OrderedDict())
+    paths = [_save(tmp_path / f"run{i}.lcev", [_batch([1.0], [0])]).path for i in range(3)]
+    opened = [open_recording(path) for path in paths]
+    assert open_recording(paths[2]) is opened[2]
+    assert [key[0] for key in eventfile._open_files] == paths[1:]
@@ -0,0 +1,102 @@
+"""Drawing and grading quizzes from the question bank (quiz.py)."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from quiz import QuizBank, load_bank
+
+
+TOPICS = {"energy": "Energy", "particles": "Particles", "lhc": "The LHC"}
+
+
+def _question(topic, difficulty=1, answer=0, template=None, n=0):
+    q = {"t": topic, "d": difficulty, "q": f"{topic} question {n}?", "o": ["A", "B", "C"], "a": answer}
+    if template is not None:
+        q["k"] = template
+    return q
+
+
+@pytest.fixture
+def bank():
+    questions = [_question("energy", n=n) for n in range(2)]
+    questions += [_question("lhc", difficulty=3, n=n) for n in range(3)]
+    # lots of generated permutations of a single template
+    questions += [_question("particles", difficulty=1 + n % 3, template="particles.pair", n=n) for n in range(500)]
+    return QuizBank(TOPICS, questions)
+
+
+def test_columns_and_counts(bank):
+    assert len(bank) == 505
+    assert (bank.written, bank.templates, bank.generated_templates) == (5, 3, 1)
+    assert [bank.count(topic) for topic in TOPICS] == [2, 500, 3]
+
+
+def test_sample_has_no_repeats_and_respects_filters(bank):
+    rng = random.Random(1)
+    quiz = bank.sample(6, rng=rng)
+    assert len(quiz) == len(set(quiz)) == 6
+    assert {bank.topic_ids[bank.topics[q]] for q in bank.sample(3, topics=["lhc"], rng=rng)} == {"lhc"}
+    hard = bank.sample(10, difficulties=[3], rng=rng)
+    assert all(bank.difficulty[q] == 3 for q in hard)
+
+
+def test_one_question_per_template_until_they_run_out(bank):
+    # three templates: the written energy and LHC questions, and the generated family
+    for seed in range(50):
+        quiz = bank.sample(3, rng=random.Random(seed))
+        topics = Counter(bank.topic_ids[bank.topics[q]] for q in quiz)
+        assert topics == {"energy": 1, "lhc": 1, "particles": 1}
+
+
+def test_templates_fill_up_when_the_quiz_is_longer(bank):
+    quiz = bank.sample(20, rng=random.Random(0))
+    topics = Counter(bank.topic_ids[bank.topics[q]] for q in quiz)
+    assert topics == {"energy": 2, "lhc": 3, "particles": 15}
+
+
+def test_asking_for_more_than_there_is(bank):
+    assert len(bank.sample(10, topics=["energy"])) == 2
+    assert bank.sample(5, topics=["energy"], difficulties=[3]) == ()
+
+
+def test_grade(bank):
+    quiz = bank.sample(4, rng=random.Random(3))
+    picks = [bank.answers[q] for q in quiz]
+    picks[0] = (picks[0] + 1) % 3
+    result = bank.grade(quiz, picks)
+    assert result.correct == (False, True, True, True)
+    assert (result.score, result.total) == (3, 4)
+
+
+def test_rejects_bad_questions():
+    with pytest.raises(ValueError):
+        QuizBank(TOPICS, [_question("energy", answer=3)])
+    with pytest.raises(ValueError):
+        QuizBank(TOPICS, [_question("energy", difficulty=4)])
+
+
+def test_shipped_bank_loads():
+    bank = load_bank()
+    assert bank.written > 0
+    assert bank.generated_templates > 0
+    quiz = bank.sample(7, rng=random.Random(0))
+    assert len(set(quiz)) == 7
+
+
+def test_written_questions_are_a_minority_of_a_quiz():
+    from page_quiz import QUIZ_LENGTH
+
+    bank = load_bank()
+    rng = random.Random(0)
+    quizzes = 2000
+    written = total = 0
+    for _ in range(quizzes):
+        quiz = bank.sample(QUIZ_LENGTH, rng=rng)
+        # the bank starts with the hand-written questions
+        written += sum(q < bank.written for q in quiz)
+        total += len(quiz)
+    assert written / total < 0.5
+    # a quiz shows a few of them, not all of them
+    assert written / quizzes < bank.written / 4
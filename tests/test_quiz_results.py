@@ -0,0 +1,124 @@
+"""The background quiz results writer (quiz_results.py)."""
+
+import sqlite3
+import time
+
+import pytest
+
+import quiz_results
+from quiz_results import ResultWriter, Submission
+
+
+@pytest.fixture(autouse=True)
+def no_pauses(monkeypatch):
+    monkeypatch.setattr(quiz_results, "RETRY_PAUSE", 0.0)
+
+
+def _submission(n=0):
+    answers = ((n, f"question {n}?", "A", 1), (n + 1, "another?", "B", 0))
+    return Submission(f"session-{n}", time.time(), 60.0, 1, 2, answers, time.perf_counter())
+
+
+def _rows(path, table):
+    db = sqlite3.connect(path)
+    try:
+        return db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        db.close()
+
+
+def test_burst_is_split_into_batches(tmp_path):
+    path = tmp_path / "results.sqlite3"
+    writer = ResultWriter(path, max_batch=10, linger=0.2)
+    for n in range(35):
+        assert writer.submit(_submission(n))
+    writer.start()
+    assert writer.close() == 0
+    stats = writer.stats()
+    assert stats["written"] == 35
+    assert stats["batches"] >= 4
+    assert stats["batch_max"] == 10
+    assert (_rows(path, "submissions"), _rows(path, "answers")) == (35, 70)
+
+
+def test_close_drains_the_queue(tmp_path):
+    writer = ResultWriter(tmp_path / "results.sqlite3")
+    writer.start()
+    for n in range(200):
+        writer.submit(_submission(n))
+    assert writer.close() == 0
+    stats = writer.stats()
+    assert (stats["queue_depth"], stats["submitted"], stats["written"]) == (0, 200, 200)
+
+
+def test_database_is_in_wal_mode(tmp_path):
+    path = tmp_path / "results.sqlite3"
+    writer = ResultWriter(path)
+    writer.start()
+    writer.submit(_submission())
+    writer.close()
+    db = sqlite3.connect(path)
+    try:
+        assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    finally:
+        db.close()
+
+
+class FlakyConnection:
+    """A connection whose first statement fails as if the file were locked."""
+
+    def __init__(self, db):
+        self.db = db
+        self.failures = 1
+
+    def __enter__(self):
+        return self.db.__enter__()
+
+    def __exit__(self, *exc):
+        return self.db.__exit__(*exc)
+
+    def execute(self, *args):
+        if self.failures:
+            self.failures -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return self.db.execute(*args)
+
+    def executemany(self, *args):
+        return self.db.executemany(*args)
+
+
+def test_write_is_retried_after_an_error(tmp_path):
+    writer = ResultWriter(tmp_path / "results.sqlite3")
+    db = writer._connect()
+    try:
+        writer._write(FlakyConnection(db), [_submission()])
+    finally:
+        db.close()
+    stats = writer.stats()
+    assert (stats["written"], stats["batches"], stats["failed"]) == (1, 1, 0)
+    assert "database is locked" in stats["error"]
+
+
+def test_bad_submission_doesnt_stop_the_writer(tmp_path):
+    writer = ResultWriter(tmp_path / "results.sqlite3", linger=0.0)
+    writer.start()
+    writer.submit(object())  # no session, score, ...
+    time.sleep(0.2)
+    writer.submit(_submission())
+    assert writer.close() == 1
+    stats = writer.stats()
+    assert (stats["written"], stats["failed"]) == (1, 1)
+
+
+def test_unopenable_database_turns_submissions_away(tmp_path, monkeypatch):
+    monkeypatch.setattr(quiz_results, "CONNECT_RETRIES", 2)
+    (tmp_path / "not-a-dir").write_text("")
+    writer = ResultWriter(tmp_path / "not-a-dir" / "results.sqlite3")
+    writer.submit(_submission(1))
+    writer.start()
+    writer._thread.join(5)
+    stats = writer.stats()
+    assert stats["broken"]
+    assert (stats["failed"], stats["queue_depth"]) == (1, 0)
+    assert not writer.submit(_submission(2))
+    assert writer.close() == 2
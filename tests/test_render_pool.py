@@ -0,0 +1,105 @@
+"""Backpressure and failure handling in the shared render pool (render_pool.py)."""
+
+from concurrent.futures import Future
+
+import pytest
+
+import render_pool
+from render_pool import RenderPool, pooled_frame
+
+
+class FakeExecutor:
+    """Hands out futures the test finishes by hand, instead of running workers."""
+
+    def __init__(self):
+        self.work = []
+        self.broken = False
+
+    def submit(self, fn, *args):
+        if self.broken:
+            raise RuntimeError("cannot schedule new futures after shutdown")
+        future = Future()
+        self.work.append((args, future))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+@pytest.fixture
+def pool():
+    pool = RenderPool(workers=2, per_session=1, max_queue=3)
+    pool._executor.shutdown()
+    pool._executor = FakeExecutor()
+    return pool
+
+
+def _request(pool, session, n):
+    return pool.request(session, ("key", session, n), (session, n))
+
+
+def test_one_frame_in_flight_per_session(pool):
+    _request(pool, "a", 1)
+    _request(pool, "a", 2)
+    stats = pool.stats()
+    assert (stats["in_flight"], stats["queue_depth"]) == (1, 1)
+    assert len(pool._executor.work) == 1
+
+
+def test_newer_frame_replaces_the_waiting_one(pool):
+    _request(pool, "a", 1)
+    waiting = _request(pool, "a", 2)
+    newest = _request(pool, "a", 3)
+    assert waiting.result(timeout=0) is None
+    assert pool.stats()["dropped"] == 1
+
+    pool._executor.work[0][1].set_result(b"frame 1")
+    assert pool.latest("a") == b"frame 1"
+    # the newest frame is now running
+    assert pool._executor.work[1][0] == ("a", 3)
+    pool._executor.work[1][1].set_result(b"frame 3")
+    assert newest.result(timeout=0) == b"frame 3"
+    assert pool.stats()["in_flight"] == 0
+
+
+def test_queue_is_capped(pool):
+    for session in "abcdef":
+        _request(pool, session, 1)
+    stats = pool.stats()
+    # two workers busy, three waiting, the oldest waiting one dropped
+    assert (stats["in_flight"], stats["queue_depth"], stats["dropped"]) == (2, 3, 1)
+
+
+def test_failed_submit_gives_the_slot_back(pool):
+    pool._executor.broken = True
+    future = _request(pool, "a", 1)
+    assert future.result(timeout=0) is None
+    assert pool.stats()["in_flight"] == 0
+    assert "a" not in pool._in_flight
+
+
+def test_failed_frame_is_counted_and_frees_the_slot(pool):
+    future = _request(pool, "a", 1)
+    pool._executor.work[0][1].set_exception(ValueError("bad frame"))
+    with pytest.raises(ValueError):
+        future.result(timeout=0)
+    stats = pool.stats()
+    assert (stats["failed"], stats["in_flight"]) == (1, 0)
+
+
+def test_pooled_frame_draws_here_when_the_pool_fails(pool):
+    pool._executor.broken = True
+    assert pooled_frame(pool, "a", ("key",), ("a", 1), lambda: b"drawn here") == b"drawn here"
+
+
+def test_pooled_frame_does_not_wait_forever(pool, monkeypatch):
+    monkeypatch.setattr(render_pool, "RESULT_TIMEOUT", 0.01)
+    # the worker never answers
+    assert pooled_frame(pool, "a", ("key",), ("a", 1), lambda: b"drawn here") == b"drawn here"
+
+
+def test_pooled_frame_shows_the_latest_frame_while_waiting(pool):
+    _request(pool, "a", 1)
+    pool._executor.work[0][1].set_result(b"frame 1")
+    data = pooled_frame(pool, "a", ("key",), ("a", 2), lambda: b"drawn here", wait=0.01)
+    assert data == b"frame 1"
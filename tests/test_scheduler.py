@@ -0,0 +1,47 @@
+"""Quality levels of the frame scheduler (scheduler.py) and the frame cache key."""
+
+import pytest
+
+from frame_cache import frame_key
+from scheduler import FPS_LEVELS, LEVELS, OVERRUNS_TO_DEGRADE, FrameScheduler
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def overloaded(scheduler, clock, frames):
+    """Run ``frames`` frames that each arrive far later than planned."""
+    for _ in range(frames):
+        scheduler.tick(True)
+        clock.now += 3 * scheduler.interval
+
+
+@pytest.mark.parametrize("scales_dpi, levels", [(True, LEVELS), (False, FPS_LEVELS)])
+def test_overload_steps_down_to_the_last_level(scales_dpi, levels):
+    clock = Clock()
+    scheduler = FrameScheduler("ring", clock=clock, frame_delay=0.05, scales_dpi=scales_dpi)
+    overloaded(scheduler, clock, (len(levels) + 1) * OVERRUNS_TO_DEGRADE)
+    assert scheduler.level == len(levels) - 1
+    assert scheduler.fps == pytest.approx(20 * levels[-1][0])
+
+
+def test_dpi_independent_loops_only_lose_frame_rate():
+    clock = Clock()
+    scheduler = FrameScheduler("ring", clock=clock, frame_delay=0.05, scales_dpi=False)
+    seen = set()
+    for _ in range(len(FPS_LEVELS) * OVERRUNS_TO_DEGRADE + 1):
+        overloaded(scheduler, clock, 1)
+        seen.add((scheduler.fps, scheduler.dpi_scale))
+    assert {dpi for _, dpi in seen} == {1.0}
+    # every step down is a real drop in frame rate
+    assert len({fps for fps, _ in seen}) == len(seen) == len(FPS_LEVELS)
+
+
+def test_vector_frames_share_one_key_across_dpis():
+    assert frame_key("a", (0.1,), False, "svg", 100) == frame_key("a", (0.1,), False, "svg", 200)
+    assert frame_key("a", (0.1,), False, "raster", 100) != frame_key("a", (0.1,), False, "raster", 200)
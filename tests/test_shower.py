@@ -0,0 +1,42 @@
+"""The shower's neighbour search (shower.close_pairs)."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from shower import close_pairs  # noqa: E402
+
+
+def _pairs(a, b):
+    return sorted(tuple(sorted(pair)) for pair in zip(a.tolist(), b.tolist()))
+
+
+def _brute_force(pos, radius):
+    d = pos[:, None, :] - pos[None, :, :]
+    near = (d * d).sum(axis=2) < radius * radius
+    i, j = np.nonzero(np.triu(near, k=1))
+    return _pairs(i, j)
+
+
+@pytest.mark.parametrize("n, radius", [(300, 0.05), (2000, 0.01), (500, 0.2)])
+def test_matches_brute_force(n, radius):
+    pos = np.random.default_rng(n).random((n, 2))
+    assert _pairs(*close_pairs(pos, radius)) == _brute_force(pos, radius)
+
+
+def test_points_on_the_edges_and_in_one_cell():
+    pos = np.array([[0.0, 0.0], [0.0, 0.001], [1.0, 1.0], [0.999, 1.0], [0.5, 0.5], [0.5, 0.5]])
+    assert _pairs(*close_pairs(pos, 0.01)) == [(0, 1), (2, 3), (4, 5)]
+
+
+def test_each_pair_once():
+    pos = np.full((20, 2), 0.3)
+    a, b = close_pairs(pos, 0.05)
+    assert len(a) == 20 * 19 // 2
+    assert len(set(_pairs(a, b))) == len(a)
+
+
+@pytest.mark.parametrize("n", [0, 1])
+def test_too_few_points(n):
+    a, b = close_pairs(np.zeros((n, 2)), 0.1)
+    assert len(a) == len(b) == 0
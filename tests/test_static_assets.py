@@ -0,0 +1,102 @@
+"""Static image URLs in serve.py mode (static_assets.py and the pages using them)."""
+
+import pytest
+
+import static_assets
+from static_assets import PUBLIC_URL_ENV, STATIC_ROUTE, STATIC_URL_ENV, static_base_url, static_url
+
+
+VARIANT = "assets/build/lhs1-960w-0123456789abcdef.webp"
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    monkeypatch.delenv(STATIC_URL_ENV, raising=False)
+    monkeypatch.delenv(PUBLIC_URL_ENV, raising=False)
+
+
+def test_off_without_env():
+    assert static_base_url() is None
+    assert static_url(VARIANT) is None
+
+
+def test_absolute_base_is_used_as_is(monkeypatch):
+    monkeypatch.setenv(STATIC_URL_ENV, "https://cdn.example/assets-immutable/")
+    assert static_url(VARIANT) == "https://cdn.example/assets-immutable/lhs1-960w-0123456789abcdef.webp"
+
+
+def test_relative_base_joins_public_url(monkeypatch):
+    monkeypatch.setenv(STATIC_URL_ENV, STATIC_ROUTE)
+    monkeypatch.setenv(PUBLIC_URL_ENV, "https://collider.example/")
+    assert static_url(VARIANT) == "https://collider.example/assets-immutable/lhs1-960w-0123456789abcdef.webp"
+
+
+def test_relative_base_joins_browser_origin(monkeypatch):
+    monkeypatch.setenv(STATIC_URL_ENV, STATIC_ROUTE)
+    monkeypatch.setattr(static_assets, "_browser_origin", lambda: "http://localhost:8501")
+    assert static_url(VARIANT).startswith("http://localhost:8501/assets-immutable/")
+
+
+def test_relative_base_without_origin_sends_bytes(monkeypatch):
+    # never hand st.image a site-relative path, it would try to open it as a file
+    monkeypatch.setenv(STATIC_URL_ENV, STATIC_ROUTE)
+    monkeypatch.setattr(static_assets, "_browser_origin", lambda: None)
+    assert static_url(VARIANT) is None
+
+
+def test_source_images_have_no_url(monkeypatch):
+    monkeypatch.setenv(STATIC_URL_ENV, "https://cdn.example/assets-immutable")
+    assert static_url("assets/lhs1.png") is None
+
+
+@pytest.fixture
+def app_test(monkeypatch):
+    """app.py under AppTest, with the background warm-ups turned off and
+    every image resolving to a (pretend) built WebP variant."""
+    testing = pytest.importorskip("streamlit.testing.v1")
+    import asset_pipeline
+    import asset_registry
+    import clips
+    import prewarm
+
+    monkeypatch.setattr(prewarm, "start_prewarm", lambda: None)
+    monkeypatch.setattr(clips, "start_warmup", lambda: None)
+    monkeypatch.setattr(asset_pipeline, "start_build", lambda: None)
+    monkeypatch.setattr(
+        asset_registry,
+        "best_variant",
+        lambda path_str, width, formats=None: f"assets/build/{path_str.split('/')[-1].split('.')[0]}-{width}w-test.webp",
+    )
+    monkeypatch.setattr(asset_registry.registry, "_resolved", {})
+
+    def run(page):
+        at = testing.AppTest.from_file("../app.py", default_timeout=30)
+        at.run()
+        at.sidebar.radio[0].set_value(page).run()
+        return at
+
+    return run
+
+
+def _image_urls(at):
+    return [img.url for element in at.get("imgs") for img in element.proto.imgs]
+
+
+@pytest.mark.parametrize("base", ["https://collider.example/assets-immutable", STATIC_ROUTE])
+def test_lhc_page_renders_in_static_mode(app_test, monkeypatch, base):
+    monkeypatch.setenv(STATIC_URL_ENV, base)
+    monkeypatch.setenv(PUBLIC_URL_ENV, "https://collider.example")
+    at = app_test("About the LHC")
+    assert not at.exception
+    urls = _image_urls(at)
+    assert len(urls) == 4
+    assert all(url.startswith("https://collider.example/assets-immutable/") for url in urls)
+
+
+def test_server_side_explorer_renders_in_static_mode(app_test, monkeypatch):
+    monkeypatch.setenv(STATIC_URL_ENV, STATIC_ROUTE)
+    monkeypatch.setenv(PUBLIC_URL_ENV, "https://collider.example")
+    at = app_test("Energy Explorer")
+    at.toggle(key="explorer_instant").set_value(False).run()
+    assert not at.exception
+    assert _image_urls(at)[0].startswith("https://collider.example/assets-immutable/")